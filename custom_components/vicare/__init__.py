@@ -1,17 +1,34 @@
 """The ViCare integration."""
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
 from contextlib import suppress
-from dataclasses import dataclass
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import json
 import logging
 import os
+import re
+import threading
+import time
+from typing import Any, NamedTuple
 
 from PyViCare.PyViCare import PyViCare
 from PyViCare.PyViCareDevice import Device
+from PyViCare.PyViCareDeviceConfig import PyViCareDeviceConfig
+from PyViCare.PyViCareOAuthManager import ViCareOAuthManager
+from PyViCare.PyViCareService import (
+    ViCareDeviceAccessor,
+    buildSetPropertyUrl,
+    hasRoles,
+)
 from PyViCare.PyViCareUtils import (
     PyViCareInternalServerError,
     PyViCareInvalidCredentialsError,
+    PyViCareInvalidDataError,
+    PyViCareNotSupportedFeatureError,
     PyViCareRateLimitError,
 )
 import requests
@@ -21,25 +38,86 @@ from homeassistant.const import CONF_CLIENT_ID, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+from homeassistant.util import dt as dt_util
 
+from .api import (
+    CONNECTION_ERRORS,
+    ViCareApiClient,
+    ViCareTokenExpiredError,
+    build_features_url,
+)
+from .budget import (
+    CALL_COMMAND,
+    CALL_FETCH,
+    CALL_INSTALLATIONS,
+    CALL_LOGIN,
+    ViCareApiBudget,
+)
+from .commands import (
+    CommandSpec,
+    ViCareCommandQueue,
+    index_commands,
+    validate_command,
+)
 from .const import (
+    API_CALLS_PER_DAY,
+    API_CALLS_PER_DAY_PREMIUM,
+    CONF_PARALLEL_FETCHES,
     CONF_PREMIUM,
-    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_PARALLEL_FETCHES,
     DOMAIN,
     PLATFORMS,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+    VICARE_API,
     VICARE_DEVICE_CONFIG,
+    VICARE_DEVICES,
 )
-from .helpers import get_unique_device_id
+from .diagnostics import SERVICE_WRITE_DIAGNOSTICS, async_register_services
+from .engine import (
+    ViCareFetchBackoff,
+    ViCareFetchEngine,
+    ViCareFetchSuspendedError,
+)
+from .helpers import (
+    get_burners,
+    get_circuits,
+    get_compressors,
+    get_device_name,
+    get_unique_device_id,
+)
+from .state import ViCareDeviceState
 
 _LOGGER = logging.getLogger(__name__)
 _TOKEN_FILENAME = "vicare_token.save"
+_COMPONENT_FEATURE = re.compile(r"heating\.(circuits|burners|compressors)(\.\d+)?$")
+# Requests of the PyViCare command currently run by capture_requests
+_CAPTURED_REQUESTS: ContextVar[list[tuple[str, str, Any]] | None] = ContextVar(
+    "vicare_captured_requests", default=None
+)
+# Errors of the login that leave the stored devices usable
+_LOGIN_UNAVAILABLE_ERRORS = (
+    PyViCareRateLimitError,
+    PyViCareInternalServerError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ReadTimeout,
+)
 
 @dataclass()
 class ViCareRequiredKeysMixin:
     """Mixin for required keys."""
 
     value_getter: Callable[[Device], bool]
+    required_features: tuple[str, ...]
 
 @dataclass()
 class ViCareToggleKeysMixin:
@@ -55,6 +133,526 @@ class ViCareRequiredKeysMixinWithSet:
 
     value_getter: Callable[[Device], bool]
     value_setter: Callable[[Device], bool]
+    required_features: tuple[str, ...]
+
+
+class _FeaturePayload(NamedTuple):
+    """Fetched payload of a device together with its lookup tables."""
+
+    features: dict[str, Any]
+    index: dict[str, dict[str, Any]]
+    enabled: frozenset[str]
+    components: frozenset[str]
+    changed: frozenset[str]
+    commands: dict[tuple[str, str], CommandSpec]
+
+
+def _feature_changed(
+    previous: dict[str, Any] | None, feature: dict[str, Any] | None
+) -> bool:
+    """Return true if a feature was added, removed or updated."""
+    if previous is None or feature is None:
+        return previous is not feature
+    if "timestamp" not in feature:
+        return previous != feature
+    return previous.get("timestamp") != feature["timestamp"] or previous.get(
+        "isEnabled"
+    ) != feature.get("isEnabled")
+
+
+class ViCareDeviceService:
+    """PyViCare service that serves reads from the last fetched feature payload.
+
+    Every getter of a PyViCare device ends up in getProperty, so reading from the
+    payload held here turns entity updates into pure in-memory lookups. The
+    payload itself is only ever fetched by the device coordinator and indexed by
+    feature name once, instead of scanning the feature list on every read.
+    """
+
+    def __init__(
+        self,
+        service,
+        budget: ViCareApiBudget,
+        client: ViCareApiClient | None = None,
+        device_id: str | None = None,
+    ) -> None:
+        """Wrap the service created by PyViCare for a single device."""
+        self._service = service
+        self._budget = budget
+        self.client = client
+        self.device_id = device_id
+        self.accessor = service.accessor
+        self.roles = service.roles
+        self._payload = _FeaturePayload(
+            {"data": []}, {}, frozenset(), frozenset(), frozenset(), {}
+        )
+
+    @property
+    def features(self) -> dict[str, Any]:
+        """Return the last fetched payload."""
+        return self._payload.features
+
+    @property
+    def enabled_features(self) -> frozenset[str]:
+        """Return the names of all enabled features."""
+        return self._payload.enabled
+
+    @property
+    def component_features(self) -> frozenset[str]:
+        """Return the enabled features listing circuits, burners or compressors."""
+        return self._payload.components
+
+    @property
+    def changed_features(self) -> frozenset[str]:
+        """Return the features that changed with the last fetched payload."""
+        return self._payload.changed
+
+    def update_features(self, data: dict[str, Any]) -> None:
+        """Replace the payload and rebuild the feature index.
+
+        The payload is swapped in one assignment, so readers in worker threads
+        never see the index of one fetch with the enabled features of another.
+        Features are compared with the previous payload by their timestamp, so
+        entities only re-read the features that were actually updated. The
+        command constraints are only indexed again when a feature changed.
+        """
+        previous = self._payload.index
+        index = {feature["feature"]: feature for feature in data["data"]}
+        enabled = frozenset(
+            name for name, feature in index.items() if feature.get("isEnabled")
+        )
+        components = frozenset(filter(_COMPONENT_FEATURE.match, enabled))
+        changed = frozenset(
+            name
+            for name in index.keys() | previous.keys()
+            if _feature_changed(previous.get(name), index.get(name))
+        )
+        commands = index_commands(index) if changed else self._payload.commands
+        self._payload = _FeaturePayload(
+            data, index, enabled, components, changed, commands
+        )
+
+    def get_feature(self, name: str) -> dict[str, Any] | None:
+        """Return a feature of the last fetched payload, if present."""
+        return self._payload.index.get(name)
+
+    def get_command(self, feature: str, command: str) -> CommandSpec | None:
+        """Return the constraints of a command of a feature, if offered."""
+        return self._payload.commands.get((feature, command))
+
+    def validate_command(
+        self, feature: str, command: str, params: dict[str, Any]
+    ) -> None:
+        """Raise ValueError unless the feature accepts the command with the params."""
+        validate_command(self.get_command(feature, command), command, params)
+
+    def feature_timestamp(self, name: str) -> datetime | None:
+        """Return when the server last updated a feature, if known."""
+        feature = self.get_feature(name)
+        if feature is None or "timestamp" not in feature:
+            return None
+        return dt_util.parse_datetime(feature["timestamp"])
+
+    def has_features(self, feature_names: list[str]) -> bool:
+        """Return true if all given features are enabled on the device."""
+        return self.enabled_features.issuperset(feature_names)
+
+    @staticmethod
+    def _validate(data: dict[str, Any]) -> dict[str, Any]:
+        """Return a fetched payload if it contains features."""
+        if "data" not in data:
+            raise PyViCareInvalidDataError(data)
+        return data
+
+    async def async_fetch_all_features(self) -> dict[str, Any]:
+        """Fetch all features of the device on the event loop."""
+        return self._validate(
+            await self.client.async_get(
+                build_features_url(self.accessor), self.device_id
+            )
+        )
+
+    def fetch_all_features(self) -> dict[str, Any]:
+        """Fetch all features of the device with a single API call."""
+        if self.client is not None:
+            with suppress(ViCareTokenExpiredError):
+                return self.client.run_threadsafe(self.async_fetch_all_features())
+        # PyViCare renews an expired token on its blocking transport
+        self._budget.record_call(CALL_FETCH, self.device_id)
+        return self._validate(self._service.fetch_all_features())
+
+    def getProperty(self, property_name: str) -> Any:
+        """Read a feature from the last fetched payload."""
+        if (feature := self._payload.index.get(property_name)) is None:
+            raise PyViCareNotSupportedFeatureError(property_name)
+        return feature
+
+    def capture_requests(
+        self, command: Callable[[], Any]
+    ) -> list[tuple[str, str, Any]]:
+        """Run a PyViCare command and return its requests instead of sending them.
+
+        PyViCare builds commands from the fetched payload and hands them to
+        setProperty, so running one on the event loop does no I/O. Requests made
+        in other threads meanwhile are sent as usual.
+        """
+        captured: list[tuple[str, str, Any]] = []
+        token = _CAPTURED_REQUESTS.set(captured)
+        try:
+            command()
+        finally:
+            _CAPTURED_REQUESTS.reset(token)
+        return captured
+
+    async def async_set_property(
+        self, property_name: str, action: str, data: Any
+    ) -> Any:
+        """Execute a command on the device on the event loop."""
+        return await self.client.async_post(
+            buildSetPropertyUrl(self.accessor, property_name, action),
+            data if isinstance(data, str) else json.dumps(data),
+            self.device_id,
+        )
+
+    def setProperty(self, property_name: str, action: str, data: Any) -> Any:
+        """Execute a command on the device."""
+        if (captured := _CAPTURED_REQUESTS.get()) is not None:
+            captured.append((property_name, action, data))
+            return None
+        # PyViCare renews an expired token on its blocking transport
+        self._budget.record_call(CALL_COMMAND, self.device_id)
+        return self._service.setProperty(property_name, action, data)
+
+    def hasRoles(self, requested_roles: list[str]) -> bool:
+        """Return true if requested roles are supported."""
+        return self._service.hasRoles(requested_roles)
+
+
+class _SnapshotStorage(Store[dict[str, Any]]):
+    """Storage of the snapshots, migrating the layout of older versions."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Nest the snapshots of version 1 under their own key."""
+        if old_major_version == 1:
+            return {"devices": old_data, "resume_at": None}
+        return old_data
+
+
+class ViCareSnapshotStore:
+    """Persist the last fetched payload of every device under .storage.
+
+    The end of a rate limit suspension is kept along with them, so polling
+    stays suspended across a restart or a retried setup.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot store of a config entry."""
+        self._store = _SnapshotStorage(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._snapshots: dict[str, dict[str, Any]] = {}
+        self._resume_at: str | None = None
+
+    async def async_load(self) -> None:
+        """Load the snapshots written before the last shutdown."""
+        data = await self._store.async_load() or {}
+        self._snapshots = data.get("devices", {})
+        self._resume_at = data.get("resume_at")
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshots and the end of the suspension to persist."""
+        return {"devices": self._snapshots, "resume_at": self._resume_at}
+
+    @property
+    def resume_at(self) -> datetime | None:
+        """Return when the stored rate limit suspension ends, if any."""
+        if self._resume_at is None:
+            return None
+        return dt_util.parse_datetime(self._resume_at)
+
+    async def async_save_resume_at(self, resume_at: datetime | None) -> None:
+        """Write the end of a rate limit suspension to disk right away."""
+        self._resume_at = resume_at.isoformat() if resume_at is not None else None
+        await self._store.async_save(self._data_to_save())
+
+    def devices(self) -> list[dict[str, Any]]:
+        """Return the stored accessors of all devices with a snapshot."""
+        return [
+            snapshot["device"]
+            for snapshot in self._snapshots.values()
+            if "device" in snapshot
+        ]
+
+    def get(self, device_id: str) -> tuple[dict[str, Any], datetime] | None:
+        """Return the payload and fetch time of a device if it is recent enough."""
+        if (snapshot := self._snapshots.get(device_id)) is None:
+            return None
+        timestamp = dt_util.parse_datetime(snapshot["timestamp"])
+        if timestamp is None or dt_util.utcnow() - timestamp > timedelta(
+            seconds=SNAPSHOT_MAX_AGE
+        ):
+            return None
+        return snapshot["data"], timestamp
+
+    @callback
+    def async_update(
+        self, device_config: PyViCareDeviceConfig, data: dict[str, Any]
+    ) -> None:
+        """Remember a freshly fetched payload and schedule writing it to disk.
+
+        The accessor of the device is stored along with it, so the device can
+        be set up from its snapshot while the login is unavailable.
+        """
+        accessor = device_config.getConfig()
+        self._snapshots[get_unique_device_id(device_config)] = {
+            "timestamp": dt_util.utcnow().isoformat(),
+            "data": data,
+            "device": {
+                "installation_id": accessor.id,
+                "serial": accessor.serial,
+                "device_id": accessor.device_id,
+                "model": device_config.getModel(),
+                "status": device_config.status,
+                "roles": list(device_config.service.roles),
+            },
+        }
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove all snapshots of the config entry."""
+        await self._store.async_remove()
+
+
+class ViCareDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Fetch the feature payload of a single device once per scan interval."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device_config: PyViCareDeviceConfig,
+        engine: ViCareFetchEngine,
+        snapshots: ViCareSnapshotStore,
+    ) -> None:
+        """Initialize the coordinator and route reads of the device through it."""
+        self.device_id = get_unique_device_id(device_config)
+        self.backoff = ViCareFetchBackoff()
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}-{self.device_id}",
+            update_interval=timedelta(seconds=engine.scan_interval(self.backoff)),
+        )
+        if not isinstance(device_config.service, ViCareDeviceService):
+            device_config.service = ViCareDeviceService(
+                device_config.service, engine.budget, engine.client, self.device_id
+            )
+        self.device_config = device_config
+        self.service: ViCareDeviceService = device_config.service
+        self.engine = engine
+        self.snapshots = snapshots
+        self.last_fetch: datetime | None = None
+        self.last_fetch_duration: float | None = None
+        self.last_payload_bytes: int | None = None
+        self.commands = ViCareCommandQueue(
+            hass, self.async_update_listeners, self.async_execute
+        )
+        # Built once and shared by all entities of the device
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.device_id)},
+            name=get_device_name(device_config),
+            manufacturer="Viessmann",
+            model=device_config.getModel(),
+            configuration_url="https://developer.viessmann.com/",
+        )
+        # Shared state of the entities, available once the device was discovered
+        self.state: ViCareDeviceState | None = None
+
+    @callback
+    def async_restore_snapshot(self) -> bool:
+        """Serve the payload persisted before the last restart, if any."""
+        if (snapshot := self.snapshots.get(self.device_id)) is None:
+            return False
+        data, timestamp = snapshot
+        _LOGGER.debug(
+            "Restoring state of %s fetched at %s", self.device_id, timestamp
+        )
+        self.service.update_features(data)
+        self.last_fetch = timestamp
+        self.async_set_updated_data(data)
+        return True
+
+    async def async_execute(self, command: Callable[[], Any]) -> None:
+        """Send the requests of a PyViCare command from the event loop."""
+        for property_name, action, data in self.service.capture_requests(command):
+            await self.engine.async_send(self.service, property_name, action, data)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Read the shared state of the device once, then update the entities."""
+        if self.state is not None:
+            self.state.update()
+        super().async_update_listeners()
+
+    def _serve_cached(self, message: str, err: Exception) -> dict[str, Any]:
+        """Serve the last payload while the API is unavailable, if recent enough."""
+        if (
+            self.data is None
+            or self.last_fetch is None
+            or dt_util.utcnow() - self.last_fetch > timedelta(seconds=SNAPSHOT_MAX_AGE)
+        ):
+            raise UpdateFailed(message) from err
+        _LOGGER.debug("Serving cached state of %s: %s", self.device_id, message)
+        return self.data
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch the full feature payload of the device."""
+        start = time.monotonic()
+        try:
+            data = await self.engine.async_fetch(self.service, self.backoff)
+        except ViCareFetchSuspendedError as err:
+            return self._serve_cached(str(err), err)
+        except CONNECTION_ERRORS as err:
+            return self._serve_cached(
+                "Unable to retrieve data from ViCare server", err
+            )
+        except ValueError as err:
+            raise UpdateFailed("Unable to decode data from ViCare server") from err
+        except PyViCareRateLimitError as err:
+            await self.snapshots.async_save_resume_at(self.engine.resume_at)
+            return self._serve_cached(f"Vicare API rate limit exceeded: {err}", err)
+        except PyViCareInternalServerError as err:
+            return self._serve_cached(f"Vicare server error: {err}", err)
+        except PyViCareInvalidDataError as err:
+            raise UpdateFailed(f"Invalid data from Vicare server: {err}") from err
+        finally:
+            # Failed calls count against the quota as well
+            self.update_interval = timedelta(
+                seconds=self.engine.scan_interval(self.backoff)
+            )
+
+        self.last_fetch = dt_util.utcnow()
+        self.last_fetch_duration = time.monotonic() - start
+        self.last_payload_bytes = len(json_bytes(data))
+        self.service.update_features(data)
+        self.commands.async_reconcile(self.service.feature_timestamp)
+        self.snapshots.async_update(self.device_config, data)
+        return data
+
+
+@dataclass
+class ViCareDevice:
+    """Device discovered once at setup and shared by all platforms."""
+
+    coordinator: ViCareDataUpdateCoordinator
+    api: Device
+    _components: dict[str, tuple[frozenset[str], list[Any]]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def _get_components(
+        self, kind: str, getter: Callable[[Device], list[Any]]
+    ) -> list[Any]:
+        """Return the circuits, burners or compressors of the device.
+
+        The lists are memoized and only rebuilt when the enabled component
+        features of the fetched payload change.
+        """
+        key = self.coordinator.service.component_features
+        if (cached := self._components.get(kind)) is not None and cached[0] == key:
+            return cached[1]
+        components = getter(self.api)
+        self._components[kind] = (key, components)
+        return components
+
+    @property
+    def config(self) -> PyViCareDeviceConfig:
+        """Return the PyViCare configuration of the device."""
+        return self.coordinator.device_config
+
+    @property
+    def features(self) -> frozenset[str]:
+        """Return the enabled features of the device."""
+        return self.coordinator.service.enabled_features
+
+    @property
+    def circuits(self) -> list[Any]:
+        """Return the heating circuits of the device."""
+        return self._get_components("circuits", get_circuits)
+
+    @property
+    def burners(self) -> list[Any]:
+        """Return the burners of the device."""
+        return self._get_components("burners", get_burners)
+
+    @property
+    def compressors(self) -> list[Any]:
+        """Return the compressors of the device."""
+        return self._get_components("compressors", get_compressors)
+
+
+class ViCareEntity(CoordinatorEntity[ViCareDataUpdateCoordinator]):
+    """Coordinator entity that only writes its state when it changed.
+
+    Subclasses read the payload in _update_state. Entities that know the
+    features they read set _features and are only updated when one of them
+    changed. After every refresh the published state and attributes are
+    compared with the last written ones, so unchanged entities skip the state
+    machine and the event bus entirely.
+    """
+
+    _features: frozenset[str] | None = None
+    _published: tuple[Any, ...] | None = None
+
+    def __init__(self, coordinator: ViCareDataUpdateCoordinator) -> None:
+        """Initialize the entity with the device info of its coordinator."""
+        super().__init__(coordinator)
+        self._attr_device_info = coordinator.device_info
+
+    def _published_state(self) -> tuple[Any, ...]:
+        """Return everything the entity writes to the state machine."""
+        return tuple(
+            dict(value) if isinstance(value, dict) else value
+            for value in (
+                self.available,
+                self.state,
+                self.unit_of_measurement,
+                self.capability_attributes,
+                self.state_attributes,
+                self.extra_state_attributes,
+            )
+        )
+
+    def _update_state(self) -> None:
+        """Update the state from the last fetched payload."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._features is None or not self._features.isdisjoint(
+            self.coordinator.service.changed_features
+        ):
+            self._update_state()
+        elif self._published is not None and self.available == self._published[0]:
+            return
+        if self._published_state() != self._published:
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember what was published."""
+        self._published = self._published_state()
+        super().async_write_ha_state()
+
+
+def discover_device(coordinator: ViCareDataUpdateCoordinator) -> ViCareDevice:
+    """Detect the device type and its components from the fetched payload."""
+    device = ViCareDevice(coordinator, coordinator.device_config.asAutoDetectDevice())
+    state = ViCareDeviceState(device)
+    state.update()
+    coordinator.state = state
+    return device
 
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
@@ -119,11 +717,92 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN][entry.entry_id] = {}
 
     try:
-        await hass.async_add_executor_job(setup_vicare_api, hass, entry)
+        snapshots = ViCareSnapshotStore(hass, entry.entry_id)
+        await snapshots.async_load()
+        stored_devices = snapshots.devices()
+
+        # Loaded first to record the requests of the login
+        budget = ViCareApiBudget(
+            hass,
+            entry.entry_id,
+            API_CALLS_PER_DAY_PREMIUM
+            if entry.data.get(CONF_PREMIUM)
+            else API_CALLS_PER_DAY,
+            len(stored_devices),
+        )
+        await budget.async_load()
+
+        login_error = None
+        try:
+            await hass.async_add_executor_job(setup_vicare_api, hass, entry, budget)
+        except _LOGIN_UNAVAILABLE_ERRORS as err:
+            # Start from the stored devices instead of waiting for the API
+            if not stored_devices:
+                raise
+            _LOGGER.warning(
+                "Unable to log in to the ViCare API, setting up %i stored devices: %s",
+                len(stored_devices),
+                err,
+            )
+            restore_vicare_api(hass, entry, budget, stored_devices)
+            login_error = err
+        devices = hass.data[DOMAIN][entry.entry_id][VICARE_DEVICE_CONFIG]
+        budget.device_count = max(len(devices), 1)
+        vicare_api = hass.data[DOMAIN][entry.entry_id][VICARE_API]
+        client = None
+        if (oauth_manager := getattr(vicare_api, "oauth_manager", None)) is not None:
+            client = ViCareApiClient(hass, oauth_manager, budget)
+        engine = ViCareFetchEngine(
+            hass,
+            budget,
+            client,
+            entry.data.get(CONF_PARALLEL_FETCHES, DEFAULT_PARALLEL_FETCHES),
+        )
+        # Stay suspended if the rate limit was hit before the restart
+        engine.resume_at = snapshots.resume_at
+        if isinstance(login_error, PyViCareRateLimitError):
+            engine.suspend(login_error)
+            await snapshots.async_save_resume_at(engine.resume_at)
+        if engine.resume_in > 0:
+            _LOGGER.warning(
+                "Vicare API rate limit exceeded, polling suspended until %s",
+                engine.resume_at,
+            )
+        _LOGGER.info(
+            "Setting up API with scan interval %i seconds.", engine.scan_interval()
+        )
+
+        coordinators = []
+        first_refreshes = []
+        for device in devices:
+            coordinator = ViCareDataUpdateCoordinator(
+                hass, device, engine, snapshots
+            )
+            entry.async_on_unload(coordinator.commands.async_shutdown)
+            # Serve the last known state right away and refresh it in the
+            # background instead of blocking the startup on the API.
+            if coordinator.async_restore_snapshot():
+                entry.async_create_background_task(
+                    hass,
+                    coordinator.async_refresh(),
+                    f"{coordinator.name} refresh",
+                )
+            else:
+                first_refreshes.append(coordinator.async_config_entry_first_refresh())
+            coordinators.append(coordinator)
+        # Devices without a snapshot are fetched in parallel, bounded by the engine
+        for result in await asyncio.gather(*first_refreshes, return_exceptions=True):
+            if isinstance(result, BaseException):
+                raise result
+        hass.data[DOMAIN][entry.entry_id][VICARE_DEVICES] = [
+            await hass.async_add_executor_job(discover_device, coordinator)
+            for coordinator in coordinators
+        ]
 
         await _async_migrate_entries(hass, entry)
 
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        async_register_services(hass)
 
         return True
     except PyViCareInvalidCredentialsError as err:
@@ -135,52 +814,168 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout) as err:
         raise ConfigEntryNotReady from err
 
-def vicare_login(hass, entry_data, scan_interval = DEFAULT_SCAN_INTERVAL):
-    """Login via PyVicare API."""
+class ViCareLoginOAuthManager(ViCareOAuthManager):
+    """OAuth manager of PyViCare recording every token request."""
+
+    def __init__(
+        self,
+        record_call: Callable[[str], None],
+        username: str,
+        password: str,
+        client_id: str,
+        token_file: str,
+    ) -> None:
+        """Log in, reusing the stored token if there is one."""
+        self._record_call = record_call
+        super().__init__(username, password, client_id, token_file)
+
+    def _ViCareOAuthManager__create_new_session(self, *args: Any) -> Any:
+        """Request a new token, at login as well as on renewal."""
+        self._record_call(CALL_LOGIN)
+        return super()._ViCareOAuthManager__create_new_session(*args)
+
+
+def vicare_login(hass, entry_data, record_call: Callable[[str], None]):
+    """Login via PyVicare API and record its requests."""
     vicare_api = PyViCare()
-    vicare_api.setCacheDuration(scan_interval)
-    vicare_api.initWithCredentials(
+    # Devices are read from the payload fetched by their coordinator, the
+    # cache of PyViCare would only hold a stale copy of it
+    vicare_api.setCacheDuration(0)
+    oauth_manager = ViCareLoginOAuthManager(
+        record_call,
         entry_data[CONF_USERNAME],
         entry_data[CONF_PASSWORD],
         entry_data[CONF_CLIENT_ID],
         hass.config.path(STORAGE_DIR, _TOKEN_FILENAME),
     )
+    # The installations and their devices are listed with a single request
+    record_call(CALL_INSTALLATIONS)
+    vicare_api.initWithExternalOAuth(oauth_manager)
     return vicare_api
 
 
-def setup_vicare_api(hass, entry):
+def setup_vicare_api(hass, entry, budget: ViCareApiBudget):
     """Set up PyVicare API."""
-    vicare_api = vicare_login(hass, entry.data)
-    scan_interval = max(DEFAULT_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL * len(vicare_api.devices))
-
-    # Premium subscription allows 3000 vs 1450 API calls per day
-    if CONF_PREMIUM in entry.data and entry.data[CONF_PREMIUM]:
-        scan_interval = scan_interval/2
-    
-    _LOGGER.info(
-         "Setting up API with scan interval %i seconds.", scan_interval
-    )
-   
-    vicare_api = vicare_login(hass, entry.data, scan_interval)
+    vicare_api = vicare_login(hass, entry.data, budget.record_call)
 
     for device in vicare_api.devices:
         _LOGGER.info(
             "Found device: %s (online: %s)", device.getModel(), str(device.isOnline())
         )
-        device.service._PyViCareCachedService__cacheDuration = DEFAULT_SCAN_INTERVAL * len(vicare_api.devices)
-
 
+    hass.data[DOMAIN][entry.entry_id][VICARE_API] = vicare_api
     hass.data[DOMAIN][entry.entry_id][VICARE_DEVICE_CONFIG] = vicare_api.devices
 
 
+class ViCareDeferredLogin:
+    """PyViCare login postponed until the first request of a stored device.
+
+    Devices set up from their snapshots share it, so the account logs in and
+    lists its installations once, as soon as one of them is fetched.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_data: dict[str, Any], budget: ViCareApiBudget
+    ) -> None:
+        """Initialize the login of a config entry."""
+        self._hass = hass
+        self._entry_data = entry_data
+        self._budget = budget
+        self._lock = threading.Lock()
+        self._vicare_api: PyViCare | None = None
+
+    def get_service(self, accessor: ViCareDeviceAccessor) -> Any:
+        """Log in if needed and return the PyViCare service of a device."""
+        with self._lock:
+            if self._vicare_api is None:
+                self._vicare_api = vicare_login(
+                    self._hass, self._entry_data, self._budget.record_call
+                )
+                _LOGGER.info("Logged in to the ViCare API")
+        for device in self._vicare_api.devices:
+            config = device.getConfig()
+            if (config.id, config.serial, config.device_id) == (
+                accessor.id,
+                accessor.serial,
+                accessor.device_id,
+            ):
+                return device.service
+        raise PyViCareInvalidDataError(
+            {"error": f"Device {accessor.device_id} is no longer available"}
+        )
+
+
+class ViCareDeferredService:
+    """Service of a device set up from its snapshot without a login."""
+
+    def __init__(
+        self,
+        login: ViCareDeferredLogin,
+        accessor: ViCareDeviceAccessor,
+        roles: list[str],
+    ) -> None:
+        """Initialize the service of a stored device."""
+        self._login = login
+        self.accessor = accessor
+        self.roles = roles
+
+    def hasRoles(self, requested_roles: list[str]) -> bool:
+        """Return true if requested roles are supported."""
+        return hasRoles(requested_roles, self.roles)
+
+    def fetch_all_features(self) -> Any:
+        """Fetch all features of the device, logging in first if needed."""
+        return self._login.get_service(self.accessor).fetch_all_features()
+
+    def setProperty(self, property_name: str, action: str, data: Any) -> Any:
+        """Execute a command on the device, logging in first if needed."""
+        return self._login.get_service(self.accessor).setProperty(
+            property_name, action, data
+        )
+
+
+def restore_vicare_api(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    budget: ViCareApiBudget,
+    stored_devices: list[dict[str, Any]],
+) -> None:
+    """Set up the devices stored with the snapshots, logging in later."""
+    login = ViCareDeferredLogin(hass, entry.data, budget)
+    hass.data[DOMAIN][entry.entry_id][VICARE_API] = login
+    hass.data[DOMAIN][entry.entry_id][VICARE_DEVICE_CONFIG] = [
+        PyViCareDeviceConfig(
+            ViCareDeferredService(
+                login,
+                ViCareDeviceAccessor(
+                    device["installation_id"], device["serial"], device["device_id"]
+                ),
+                device["roles"],
+            ),
+            device["device_id"],
+            device["model"],
+            device["status"],
+        )
+        for device in stored_devices
+    ]
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload ViCare config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_WRITE_DIAGNOSTICS)
     with suppress(FileNotFoundError):
         await hass.async_add_executor_job(
             os.remove, hass.config.path(STORAGE_DIR, _TOKEN_FILENAME)
         )
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted snapshots and API calls of a ViCare config entry."""
+    await ViCareSnapshotStore(hass, entry.entry_id).async_remove()
+    await ViCareApiBudget(hass, entry.entry_id, 0, 0).async_remove()
@@ -0,0 +1,132 @@
+"""Asyncio transport for the ViCare API."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+import logging
+from typing import Any
+
+from PyViCare.PyViCareAbstractOAuthManager import (
+    API_BASE_URL,
+    AbstractViCareOAuthManager,
+)
+from PyViCare.PyViCareService import ViCareDeviceAccessor
+from PyViCare.PyViCareUtils import (
+    PyViCareCommandError,
+    PyViCareInternalServerError,
+    PyViCareRateLimitError,
+)
+from aiohttp import ClientError, ClientTimeout
+import requests
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .budget import CALL_COMMAND, CALL_FETCH, ViCareApiBudget
+from .const import API_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+# Raised by the aiohttp transport as well as by the blocking one of PyViCare
+CONNECTION_ERRORS = (
+    ClientError,
+    asyncio.TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ReadTimeout,
+)
+
+
+class ViCareTokenExpiredError(Exception):
+    """The access token has to be renewed by PyViCare."""
+
+
+def build_features_url(accessor: ViCareDeviceAccessor) -> str:
+    """Return the URL of all features of a device."""
+    return (
+        f"/features/installations/{accessor.id}/gateways/{accessor.serial}"
+        f"/devices/{accessor.device_id}/features/"
+    )
+
+
+class ViCareApiClient:
+    """Send requests through the shared aiohttp session of Home Assistant.
+
+    Requests use the access token of the PyViCare login. Renewing an expired
+    token is left to PyViCare, fetches fall back to its blocking transport then
+    and commands are sent again once it renewed the token.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        oauth_manager: AbstractViCareOAuthManager,
+        budget: ViCareApiBudget,
+    ) -> None:
+        """Initialize the client of a config entry."""
+        self.hass = hass
+        self._oauth_manager = oauth_manager
+        self._budget = budget
+
+    def _authorization(self) -> dict[str, str]:
+        """Return the authorization header of the current access token."""
+        token = self._oauth_manager.oauth_session.token
+        if not token or "access_token" not in token or token.is_expired():
+            raise ViCareTokenExpiredError
+        return {"Authorization": f"Bearer {token['access_token']}"}
+
+    async def _async_request(
+        self,
+        method: str,
+        url: str,
+        data: str | None = None,
+        device_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Send a request and return the decoded response."""
+        headers = self._authorization()
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+            headers["Accept"] = "application/vnd.siren+json"
+        self._budget.record_call(
+            CALL_FETCH if data is None else CALL_COMMAND, device_id
+        )
+        async with async_get_clientsession(self.hass).request(
+            method,
+            f"{API_BASE_URL}{url}",
+            headers=headers,
+            data=data,
+            timeout=ClientTimeout(total=API_TIMEOUT),
+        ) as response:
+            result = await response.json(content_type=None)
+        _LOGGER.debug("Response to %s request: %s", method, result)
+
+        if result.get("error") == "EXPIRED TOKEN":
+            raise ViCareTokenExpiredError
+        if result.get("statusCode") == 429:
+            raise PyViCareRateLimitError(result)
+        return result
+
+    async def async_get(
+        self, url: str, device_id: str | None = None
+    ) -> dict[str, Any]:
+        """Read from the API, counting the call for the given device."""
+        result = await self._async_request("GET", url, device_id=device_id)
+        if result.get("statusCode", 0) >= 500:
+            raise PyViCareInternalServerError(result)
+        return result
+
+    async def async_post(
+        self, url: str, data: str, device_id: str | None = None
+    ) -> dict[str, Any]:
+        """Send a command to the API, counting the call for the given device."""
+        result = await self._async_request("POST", url, data, device_id)
+        if result.get("statusCode", 0) >= 400:
+            raise PyViCareCommandError(result)
+        return result
+
+    async def async_renew_token(self) -> None:
+        """Renew the access token with the blocking login of PyViCare."""
+        await self.hass.async_add_executor_job(self._oauth_manager.renewToken)
+
+    def run_threadsafe(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run a request on the event loop and wait for it in a worker thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.hass.loop).result()
@@ -1,17 +1,13 @@
 """Viessmann ViCare sensor device."""
 from __future__ import annotations
 
-from contextlib import suppress
 from dataclasses import dataclass
+from functools import partial
 import logging
 
 from PyViCare.PyViCareUtils import (
-    PyViCareInternalServerError,
-    PyViCareInvalidDataError,
     PyViCareNotSupportedFeatureError,
-    PyViCareRateLimitError,
 )
-import requests
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -20,19 +16,15 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import ViCareRequiredKeysMixin
-from .const import DOMAIN, VICARE_DEVICE_CONFIG, VICARE_NAME
-from .helpers import (
-    get_burners,
-    get_circuits,
-    get_compressors,
-    get_device_name,
-    get_unique_device_id,
-    get_unique_id,
+from . import (
+    ViCareDataUpdateCoordinator,
+    ViCareEntity,
+    ViCareRequiredKeysMixin,
 )
+from .const import DOMAIN, VICARE_DEVICES, VICARE_NAME
+from .helpers import get_required_features, get_unique_id, is_supported
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,12 +42,14 @@ CIRCUIT_SENSORS: tuple[ViCareBinarySensorEntityDescription, ...] = (
         name="Circulation pump active",
         device_class=BinarySensorDeviceClass.POWER,
         value_getter=lambda api: api.getCirculationPumpActive(),
+        required_features=("heating.circuits.{id}.circulation.pump",),
     ),
     ViCareBinarySensorEntityDescription(
         key="frost_protection_active",
         name="Frost protection active",
         device_class=BinarySensorDeviceClass.POWER,
         value_getter=lambda api: api.getFrostProtectionActive(),
+        required_features=("heating.circuits.{id}.frostprotection",),
     ),
 )
 
@@ -65,6 +59,7 @@ BURNER_SENSORS: tuple[ViCareBinarySensorEntityDescription, ...] = (
         name="Burner active",
         device_class=BinarySensorDeviceClass.POWER,
         value_getter=lambda api: api.getActive(),
+        required_features=("heating.burners.{id}",),
     ),
 )
 
@@ -74,6 +69,7 @@ COMPRESSOR_SENSORS: tuple[ViCareBinarySensorEntityDescription, ...] = (
         name="Compressor active",
         device_class=BinarySensorDeviceClass.POWER,
         value_getter=lambda api: api.getActive(),
+        required_features=("heating.compressors.{id}",),
     ),
 )
 
@@ -83,46 +79,39 @@ GLOBAL_SENSORS: tuple[ViCareBinarySensorEntityDescription, ...] = (
         name="Solar pump active",
         device_class=BinarySensorDeviceClass.POWER,
         value_getter=lambda api: api.getSolarPumpActive(),
+        required_features=("heating.solar.pumps.circuit",),
     ),
     ViCareBinarySensorEntityDescription(
         key="charging_active",
         name="DHW Charging active",
         device_class=BinarySensorDeviceClass.RUNNING,
         value_getter=lambda api: api.getDomesticHotWaterChargingActive(),
+        required_features=("heating.dhw.charging",),
     ),
     ViCareBinarySensorEntityDescription(
         key="dhw_circulationpump_active",
         name="DHW Circulation Pump Active",
         device_class=BinarySensorDeviceClass.POWER,
         value_getter=lambda api: api.getDomesticHotWaterCirculationPumpActive(),
+        required_features=("heating.dhw.pumps.circulation",),
     ),
     ViCareBinarySensorEntityDescription(
         key="dhw_pump_active",
         name="DHW Pump Active",
         device_class=BinarySensorDeviceClass.POWER,
         value_getter=lambda api: api.getDomesticHotWaterPumpActive(),
+        required_features=("heating.dhw.pumps.primary",),
     ),
 )
 
 
-def _build_entity(name, vicare_api, device_config, sensor):
+def _build_entity(coordinator, name, vicare_api, device_config, sensor):
     """Create a ViCare binary sensor entity."""
-    try:
-        sensor.value_getter(vicare_api)
-        _LOGGER.debug("Found entity %s", name)
-    except PyViCareInternalServerError as server_error:
-        _LOGGER.info(
-            "Server error ( %s): Not creating entity %s", server_error.message, name
-        )
-        return None
-    except PyViCareNotSupportedFeatureError:
-        _LOGGER.info("Feature not supported %s", name)
-        return None
-    except AttributeError:
-        _LOGGER.debug("Attribute Error %s", name)
+    if not is_supported(name, sensor, vicare_api, coordinator.service):
         return None
 
     return ViCareBinarySensor(
+        coordinator,
         name,
         vicare_api,
         device_config,
@@ -131,7 +120,7 @@ def _build_entity(name, vicare_api, device_config, sensor):
 
 
 def _entities_from_descriptions(
-    hass, name, entities, sensor_descriptions, iterables, config_entry, device
+    hass, name, entities, sensor_descriptions, iterables, config_entry, coordinator
 ):
     """Create entities from descriptions and list of burners/circuits."""
     for description in sensor_descriptions:
@@ -140,9 +129,10 @@ def _entities_from_descriptions(
             if len(iterables) > 1:
                 suffix = f" {current.id}"
             entity = _build_entity(
+                coordinator,
                 f"{name} {description.name}{suffix}",
                 current,
-                device,
+                coordinator.device_config,
                 description,
             )
             if entity is not None:
@@ -166,11 +156,12 @@ def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
     name = VICARE_NAME
     entities: list[ViCareBinarySensor] = []
 
-    for device in hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICE_CONFIG]:
-        api = device.asAutoDetectDevice()
+    for device in hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICES]:
+        coordinator = device.coordinator
+        api = device.api
 
         _entities_from_descriptions(
-            hass, name, entities, GLOBAL_SENSORS, [api], config_entry, device
+            hass, name, entities, GLOBAL_SENSORS, [api], config_entry, coordinator
         )
 
         try:
@@ -179,16 +170,22 @@ def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
                 name,
                 entities,
                 CIRCUIT_SENSORS,
-                get_circuits(api),
+                device.circuits,
                 config_entry,
-                device,
+                coordinator,
             )
         except PyViCareNotSupportedFeatureError:
             _LOGGER.info("No circuits found")
 
         try:
             _entities_from_descriptions(
-                hass, name, entities, BURNER_SENSORS, get_burners(api), config_entry, device
+                hass,
+                name,
+                entities,
+                BURNER_SENSORS,
+                device.burners,
+                config_entry,
+                coordinator,
             )
         except PyViCareNotSupportedFeatureError:
             _LOGGER.info("No burners found")
@@ -199,9 +196,9 @@ def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
                 name,
                 entities,
                 COMPRESSOR_SENSORS,
-                get_compressors(api),
+                device.compressors,
                 config_entry,
-                device,
+                coordinator,
             )
         except PyViCareNotSupportedFeatureError:
             _LOGGER.info("No compressors found")
@@ -209,65 +206,41 @@ def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
     return entities
 
 
-class ViCareBinarySensor(BinarySensorEntity):
+class ViCareBinarySensor(ViCareEntity, BinarySensorEntity):
     """Representation of a ViCare sensor."""
 
     entity_description: ViCareBinarySensorEntityDescription
 
     def __init__(
-        self, name, api, device_config, description: ViCareBinarySensorEntityDescription
+        self,
+        coordinator: ViCareDataUpdateCoordinator,
+        name,
+        api,
+        device_config,
+        description: ViCareBinarySensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
+        super().__init__(coordinator)
         self.entity_description = description
         self._attr_name = name
+        self._attr_unique_id = get_unique_id(
+            api, coordinator.device_id, description.key
+        )
         self._api = api
-        self.entity_description = description
         self._device_config = device_config
-        self.update()
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for this device."""
-        return DeviceInfo(
-            identifiers={
-                (
-                    DOMAIN,
-                    get_unique_device_id(self._device_config),
-                )
-            },
-            name=get_device_name(self._device_config),
-            manufacturer="Viessmann",
-            model=self._device_config.getModel(),
-            configuration_url="https://developer.viessmann.com/",
+        self._features = frozenset(
+            get_required_features(description.required_features, api)
+        )
+        self._view = coordinator.state.sensor(
+            partial(description.value_getter, api), None, self._features
         )
 
     @property
     def available(self):
         """Return True if entity is available."""
-        return self._state is not None
-
-    @property
-    def unique_id(self) -> str:
-        """Return unique ID for this device."""
-        return get_unique_id(
-            self._api, self._device_config, self.entity_description.key
-        )
+        return super().available and self._view.value is not None
 
     @property
     def is_on(self):
         """Return the state of the sensor."""
-        return self._state
-
-    def update(self):
-        """Update state of sensor."""
-        try:
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._state = self.entity_description.value_getter(self._api)
-        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
-            _LOGGER.error("Unable to retrieve data from ViCare server")
-        except ValueError:
-            _LOGGER.error("Unable to decode data from ViCare server")
-        except PyViCareRateLimitError as limit_exception:
-            _LOGGER.error("Vicare API rate limit exceeded: %s", limit_exception)
-        except PyViCareInvalidDataError as invalid_data_exception:
-            _LOGGER.error("Invalid data from Vicare server: %s", invalid_data_exception)
+        return self._view.value
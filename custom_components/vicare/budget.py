@@ -0,0 +1,149 @@
+"""API call budget of a ViCare account."""
+from __future__ import annotations
+
+from collections import deque
+import logging
+from operator import itemgetter
+import threading
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    API_CALL_RESERVE,
+    BUDGET_SAVE_DELAY,
+    BUDGET_STORAGE_VERSION,
+    DOMAIN,
+    MIN_SCAN_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+BUDGET_WINDOW = 86400
+
+CALL_FETCH = "fetch"
+CALL_COMMAND = "command"
+CALL_LOGIN = "login"
+CALL_INSTALLATIONS = "installations"
+
+# Calls made by the config flow before the config entry exists
+DATA_PENDING_CALLS = f"{DOMAIN}_pending_calls"
+
+
+@callback
+def async_record_pending_calls(
+    hass: HomeAssistant, calls: list[tuple[float, str]]
+) -> None:
+    """Keep calls made without a config entry for the budget loaded next."""
+    hass.data.setdefault(DATA_PENDING_CALLS, []).extend(calls)
+
+
+class ViCareApiBudget:
+    """Track the API calls of an account in a rolling 24h window.
+
+    Polling may spend the daily limit minus a reserve held back for user
+    commands. Commands and logins beyond that reserve stretch the scan interval
+    of every device, which shrinks again once those calls leave the window.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, daily_limit: int, device_count: int
+    ) -> None:
+        """Initialize the budget of a config entry."""
+        self._hass = hass
+        self._store: Store[dict[str, list[list]]] = Store(
+            hass, BUDGET_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.budget"
+        )
+        self._lock = threading.Lock()
+        self._calls: deque[tuple[float, str, str | None]] = deque()
+        self.daily_limit = daily_limit
+        self.device_count = max(device_count, 1)
+
+    async def async_load(self) -> None:
+        """Load the calls spent before the last restart or by the config flow."""
+        data = await self._store.async_load() or {}
+        pending = self._hass.data.pop(DATA_PENDING_CALLS, [])
+        with self._lock:
+            self._calls = deque(
+                sorted(
+                    [
+                        *(
+                            (timestamp, kind, device[0] if device else None)
+                            for timestamp, kind, *device in data.get("calls", [])
+                        ),
+                        *((timestamp, kind, None) for timestamp, kind in pending),
+                    ],
+                    key=itemgetter(0),
+                )
+            )
+            self._prune(time.time())
+        if pending:
+            self._async_schedule_save()
+
+    async def async_remove(self) -> None:
+        """Remove the persisted calls of the config entry."""
+        await self._store.async_remove()
+
+    def record_call(self, kind: str, device_id: str | None = None) -> None:
+        """Record an API call, may be called from any thread."""
+        with self._lock:
+            self._calls.append((time.time(), kind, device_id))
+        self._hass.loop.call_soon_threadsafe(self._async_schedule_save)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule writing the spent calls to disk."""
+        self._store.async_delay_save(self._data_to_save, BUDGET_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, list[list]]:
+        """Return the spent calls to persist."""
+        with self._lock:
+            return {
+                "calls": [
+                    [timestamp, kind, device_id] if device_id else [timestamp, kind]
+                    for timestamp, kind, device_id in self._calls
+                ]
+            }
+
+    def _prune(self, now: float) -> None:
+        """Drop calls that left the window, the lock must be held."""
+        while self._calls and self._calls[0][0] <= now - BUDGET_WINDOW:
+            self._calls.popleft()
+
+    @property
+    def calls_in_window(self) -> int:
+        """Return the number of calls spent in the last 24h."""
+        with self._lock:
+            self._prune(time.time())
+            return len(self._calls)
+
+    def device_calls_in_window(self, device_id: str) -> int:
+        """Return the number of calls spent for a device in the last 24h."""
+        with self._lock:
+            self._prune(time.time())
+            return sum(1 for call in self._calls if call[2] == device_id)
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of calls left in the current window."""
+        return max(self.daily_limit - self.calls_in_window, 0)
+
+    def scan_interval(self) -> float:
+        """Return the polling interval of each device in seconds."""
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            calls = len(self._calls)
+            others = sum(1 for _, kind, _ in self._calls if kind != CALL_FETCH)
+            poll_budget = self.daily_limit - max(API_CALL_RESERVE, others)
+            interval = self.device_count * BUDGET_WINDOW / max(poll_budget, 1)
+
+            # The window is already exhausted, e.g. after a restart or a burst of
+            # commands: wait until enough calls for every device left the window.
+            poll_limit = self.daily_limit - API_CALL_RESERVE
+            if calls and calls + self.device_count > poll_limit:
+                oldest = self._calls[min(self.device_count, calls) - 1][0]
+                interval = max(interval, oldest + BUDGET_WINDOW - now)
+
+        return max(interval, MIN_SCAN_INTERVAL)
@@ -1,18 +1,12 @@
 """Viessmann ViCare climate device."""
 from __future__ import annotations
 
-from contextlib import suppress
+import asyncio
+from functools import partial
 import logging
 from typing import Any
 
 from PyViCare.PyViCareRadiatorActuator import RadiatorActuator
-from PyViCare.PyViCareUtils import (
-    PyViCareCommandError,
-    PyViCareInvalidDataError,
-    PyViCareNotSupportedFeatureError,
-    PyViCareRateLimitError,
-)
-import requests
 import voluptuous as vol
 
 from homeassistant.components.climate import (
@@ -34,17 +28,11 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_platform
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, VICARE_DEVICE_CONFIG, VICARE_NAME
-from .helpers import (
-    get_burners,
-    get_circuits,
-    get_device_name,
-    get_unique_device_id,
-    get_unique_id,
-)
+from . import ViCareEntity
+from .const import DHW_TEMPERATURE_FEATURE, DOMAIN, VICARE_DEVICES, VICARE_NAME
+from .helpers import get_unique_id
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,6 +43,10 @@ SERVICE_SET_HEATING_CURVE = "set_heating_curve"
 SERVICE_SET_HEATING_CURVE_ATTR_SLOPE = "slope"
 SERVICE_SET_HEATING_CURVE_ATTR_SHIFT = "shift"
 
+SERVICE_APPLY_CIRCUIT_SETTINGS = "apply_circuit_settings"
+SERVICE_APPLY_CIRCUIT_SETTINGS_ATTR_PROGRAM_TEMPERATURES = "program_temperatures"
+SERVICE_APPLY_CIRCUIT_SETTINGS_ATTR_DHW_TEMPERATURE = "dhw_temperature"
+
 VICARE_MODE_DHW = "dhw"
 VICARE_MODE_HEATING = "heating"
 VICARE_MODE_DHWANDHEATING = "dhwAndHeating"
@@ -114,44 +106,14 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the ViCare climate platform."""
-    name = VICARE_NAME
-    entities = []
-
-    for device in hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICE_CONFIG]:
-        api = device.asAutoDetectDevice()
-
-        circuits = await hass.async_add_executor_job(get_circuits, api)
-        # Devices with circuits will get one climate entity per circuit
-        for circuit in circuits:
-            suffix = ""
-            if len(circuits) > 1:
-                suffix = f" {circuit.id}"
-
-            entity = ViCareClimate(
-                f"{name} Heating{suffix}",
-                api,
-                circuit,
-                device,
-            )
-            entities.append(entity)
-
-        # RadiatorActuator have no circuits but also create a climate entity
-        if isinstance(api, RadiatorActuator):
-            entity = ViCareThermostat(
-                f"{name} RadiatorActuator{suffix}",
-                api,
-                device,
-            )
-            entities.append(entity)
-
-            
+    entities = create_all_entities(hass, config_entry)
 
     platform = entity_platform.async_get_current_platform()
 
     platform.async_register_entity_service(
         SERVICE_SET_VICARE_MODE,
         {vol.Required(SERVICE_SET_VICARE_MODE_ATTR_MODE): cv.string},
-        "set_vicare_mode",
+        "async_set_vicare_mode",
     )
 
     platform.async_register_entity_service(
@@ -172,13 +134,82 @@ async def async_setup_entry(
                 ),
             ),
         },
-        "set_heating_curve",
+        "async_set_heating_curve",
+    )
+
+    platform.async_register_entity_service(
+        SERVICE_APPLY_CIRCUIT_SETTINGS,
+        vol.All(
+            cv.make_entity_service_schema(
+                {
+                    vol.Optional(SERVICE_SET_VICARE_MODE_ATTR_MODE): cv.string,
+                    vol.Optional(
+                        SERVICE_APPLY_CIRCUIT_SETTINGS_ATTR_PROGRAM_TEMPERATURES
+                    ): {cv.string: vol.Coerce(float)},
+                    vol.Inclusive(
+                        SERVICE_SET_HEATING_CURVE_ATTR_SHIFT, "heating_curve"
+                    ): vol.Coerce(int),
+                    vol.Inclusive(
+                        SERVICE_SET_HEATING_CURVE_ATTR_SLOPE, "heating_curve"
+                    ): vol.Coerce(float),
+                    vol.Optional(
+                        SERVICE_APPLY_CIRCUIT_SETTINGS_ATTR_DHW_TEMPERATURE
+                    ): vol.Coerce(int),
+                }
+            ),
+            cv.has_at_least_one_key(
+                SERVICE_SET_VICARE_MODE_ATTR_MODE,
+                SERVICE_APPLY_CIRCUIT_SETTINGS_ATTR_PROGRAM_TEMPERATURES,
+                SERVICE_SET_HEATING_CURVE_ATTR_SHIFT,
+                SERVICE_APPLY_CIRCUIT_SETTINGS_ATTR_DHW_TEMPERATURE,
+            ),
+        ),
+        "async_apply_circuit_settings",
     )
 
     async_add_entities(entities)
 
 
-class ViCareClimate(ClimateEntity):
+def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
+    """Create a climate entity for every circuit and radiator actuator."""
+    name = VICARE_NAME
+    entities = []
+
+    for vicare_device in hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICES]:
+        coordinator = vicare_device.coordinator
+        device = vicare_device.config
+        api = vicare_device.api
+
+        circuits = vicare_device.circuits
+        # Devices with circuits will get one climate entity per circuit
+        for circuit in circuits:
+            suffix = ""
+            if len(circuits) > 1:
+                suffix = f" {circuit.id}"
+
+            entity = ViCareClimate(
+                coordinator,
+                f"{name} Heating{suffix}",
+                api,
+                circuit,
+                device,
+            )
+            entities.append(entity)
+
+        # RadiatorActuator have no circuits but also create a climate entity
+        if isinstance(api, RadiatorActuator):
+            entity = ViCareThermostat(
+                coordinator,
+                f"{name} RadiatorActuator{suffix}",
+                api,
+                device,
+            )
+            entities.append(entity)
+
+    return entities
+
+
+class ViCareClimate(ViCareEntity, ClimateEntity):
     """Representation of the ViCare heating climate device."""
 
     _attr_precision = PRECISION_TENTHS
@@ -187,150 +218,76 @@ class ViCareClimate(ClimateEntity):
     )
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
 
-    def __init__(self, name, api, circuit, device_config):
+    def __init__(self, coordinator, name, api, circuit, device_config):
         """Initialize the climate device."""
-        self._name = name
-        self._state = None
+        super().__init__(coordinator)
+        self._attr_name = name
+        self._attr_unique_id = get_unique_id(api, coordinator.device_id, circuit.id)
         self._api = api
         self._circuit = circuit
         self._device_config = device_config
-        self._attributes = {}
-        self._target_temperature = None
-        self._current_mode = None
-        self._current_temperature = None
-        self._current_program = None
-        self._current_action = None
-        self._min_temp = None
-        self._max_temp = None
-        self._current_stepping = None
-        self.update()
+        self._view = coordinator.state.circuit(circuit.id)
 
     @property
-    def unique_id(self) -> str:
-        """Return unique ID for this device."""
-        return get_unique_id(self._api, self._device_config, self._circuit.id)
+    def _program_feature(self) -> str:
+        """Return the feature reporting the active program."""
+        return f"heating.circuits.{self._circuit.id}.operating.programs.active"
 
     @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for this device."""
-        return DeviceInfo(
-            identifiers={
-                (
-                    DOMAIN,
-                    get_unique_device_id(self._device_config),
-                )
-            },
-            name=get_device_name(self._device_config),
-            manufacturer="Viessmann",
-            model=self._device_config.getModel(),
-            configuration_url="https://developer.viessmann.com/",
+    def _current_program(self) -> str | None:
+        """Return the active program, written ones until they are confirmed."""
+        return self.coordinator.commands.pending_value(
+            self._program_feature, self._view.program
         )
 
-    def update(self) -> None:
-        """Let HA know there has been an update from the ViCare API."""
-        try:
-            _room_temperature = None
-            with suppress(PyViCareNotSupportedFeatureError):
-                _room_temperature = self._circuit.getRoomTemperature()
-
-            _supply_temperature = None
-            with suppress(PyViCareNotSupportedFeatureError):
-                _supply_temperature = self._circuit.getSupplyTemperature()
-
-            if _room_temperature is not None:
-                self._current_temperature = _room_temperature
-            elif _supply_temperature is not None:
-                self._current_temperature = _supply_temperature
-            else:
-                self._current_temperature = None
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._min_temp = self._circuit.getActiveProgramMinTemperature()
-            if not self._min_temp:
-                self._min_temp = VICARE_TEMP_HEATING_MIN
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._max_temp = self._circuit.getActiveProgramMaxTemperature()
-            if not self._max_temp:
-                self._max_temp = VICARE_TEMP_HEATING_MAX
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._current_stepping = self._circuit.getActiveProgramStepping()
-            if not self._current_stepping:
-                self._current_stepping = PRECISION_HALVES
-            
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._current_program = self._circuit.getActiveProgram()
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._target_temperature = self._circuit.getCurrentDesiredTemperature()
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._current_mode = self._circuit.getActiveMode()
-
-            # Update the generic device attributes
-            self._attributes = {}
-
-            self._attributes["room_temperature"] = _room_temperature
-            self._attributes["active_vicare_program"] = self._current_program
-            self._attributes["active_vicare_mode"] = self._current_mode
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._attributes[
-                    "heating_curve_slope"
-                ] = self._circuit.getHeatingCurveSlope()
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._attributes[
-                    "heating_curve_shift"
-                ] = self._circuit.getHeatingCurveShift()
-
-            self._attributes["vicare_modes"] = self._circuit.getModes()
-
-            self._current_action = False
-            # Update the specific device attributes
-            with suppress(PyViCareNotSupportedFeatureError):
-                for burner in get_burners(self._api):
-                    self._current_action = self._current_action or burner.getActive()
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                for compressor in self._api.compressors:
-                    self._current_action = (
-                        self._current_action or compressor.getActive()
-                    )
-
-        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
-            _LOGGER.error("Unable to retrieve data from ViCare server")
-        except PyViCareRateLimitError as limit_exception:
-            _LOGGER.error("Vicare API rate limit exceeded: %s", limit_exception)
-        except ValueError:
-            _LOGGER.error("Unable to decode data from ViCare server")
-        except PyViCareInvalidDataError as invalid_data_exception:
-            _LOGGER.error("Invalid data from Vicare server: %s", invalid_data_exception)
+    @property
+    def _current_mode(self) -> str | None:
+        """Return the active mode, written ones until they are confirmed."""
+        return self.coordinator.commands.pending_value(
+            self._mode_feature, self._view.mode
+        )
+
+    @property
+    def _temperature_feature(self) -> str:
+        """Return the feature of the active program and its temperature."""
+        return self._program_settings_feature(self._current_program)
+
+    def _program_settings_feature(self, program: str) -> str:
+        """Return the feature of a program, its temperature and activation."""
+        return f"heating.circuits.{self._circuit.id}.operating.programs.{program}"
 
     @property
-    def name(self):
-        """Return the name of the climate device."""
-        return self._name
+    def _mode_feature(self) -> str:
+        """Return the feature of the operating mode."""
+        return f"heating.circuits.{self._circuit.id}.operating.modes.active"
+
+    @property
+    def _curve_feature(self) -> str:
+        """Return the feature of the heating curve."""
+        return f"heating.circuits.{self._circuit.id}.heating.curve"
 
     @property
     def current_temperature(self):
         """Return the current temperature."""
-        return self._current_temperature
+        if self._view.room_temperature is not None:
+            return self._view.room_temperature
+        return self._view.supply_temperature
 
     @property
     def target_temperature(self):
         """Return the temperature we try to reach."""
-        return self._target_temperature
+        return self.coordinator.commands.pending_value(
+            self._temperature_feature, self._view.target_temperature
+        )
 
     @property
     def hvac_mode(self) -> HVACMode | None:
         """Return current hvac mode."""
         return VICARE_TO_HA_HVAC_HEATING.get(self._current_mode)
 
-    def set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set a new hvac mode on the ViCare API."""
-        if "vicare_modes" not in self._attributes:
+        if self._view.modes is None:
             raise ValueError("Cannot set hvac mode when vicare_modes are not known")
 
         vicare_mode = self.vicare_mode_from_hvac_mode(hvac_mode)
@@ -338,14 +295,22 @@ class ViCareClimate(ClimateEntity):
             raise ValueError(f"Cannot set invalid hvac mode: {hvac_mode}")
 
         _LOGGER.debug("Setting hvac mode to %s / %s", hvac_mode, vicare_mode)
-        self._circuit.setMode(vicare_mode)
+        await self._async_set_mode(vicare_mode)
+
+    async def _async_set_mode(self, vicare_mode: str) -> None:
+        """Show the mode right away and send only the last of rapid changes."""
+        self.coordinator.service.validate_command(
+            self._mode_feature, "setMode", {"mode": vicare_mode}
+        )
+        await self.coordinator.commands.async_enqueue(
+            self._mode_feature, vicare_mode, partial(self._circuit.setMode, vicare_mode)
+        )
 
     def vicare_mode_from_hvac_mode(self, hvac_mode):
         """Return the corresponding vicare mode for an hvac_mode."""
-        if "vicare_modes" not in self._attributes:
+        if (supported_modes := self._view.modes) is None:
             return None
 
-        supported_modes = self._attributes["vicare_modes"]
         for key, value in VICARE_TO_HA_HVAC_HEATING.items():
             if key in supported_modes and value == hvac_mode:
                 return key
@@ -354,10 +319,9 @@ class ViCareClimate(ClimateEntity):
     @property
     def hvac_modes(self) -> list[HVACMode]:
         """Return the list of available hvac modes."""
-        if "vicare_modes" not in self._attributes:
+        if (supported_modes := self._view.modes) is None:
             return []
 
-        supported_modes = self._attributes["vicare_modes"]
         hvac_modes = []
         for key, value in VICARE_TO_HA_HVAC_HEATING.items():
             if value in hvac_modes:
@@ -369,30 +333,40 @@ class ViCareClimate(ClimateEntity):
     @property
     def hvac_action(self) -> HVACAction:
         """Return the current hvac action."""
-        if self._current_action:
+        if self.coordinator.state.heating:
             return HVACAction.HEATING
         return HVACAction.IDLE
 
     @property
     def min_temp(self):
         """Return the minimum temperature."""
-        return self._min_temp
+        return self._view.min_temp or VICARE_TEMP_HEATING_MIN
 
     @property
     def max_temp(self):
         """Return the maximum temperature."""
-        return self._max_temp
+        return self._view.max_temp or VICARE_TEMP_HEATING_MAX
 
     @property
     def target_temperature_step(self) -> float:
         """Get current stepping."""
-        return self._current_stepping
+        return self._view.stepping or PRECISION_HALVES
 
-    def set_temperature(self, **kwargs: Any) -> None:
+    async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperatures."""
         if (temp := kwargs.get(ATTR_TEMPERATURE)) is not None:
-            self._circuit.setProgramTemperature(self._current_program, temp)
-            self._target_temperature = temp
+            self.coordinator.service.validate_command(
+                self._temperature_feature,
+                "setTemperature",
+                {"targetTemperature": float(temp)},
+            )
+            await self.coordinator.commands.async_enqueue(
+                self._temperature_feature,
+                temp,
+                partial(
+                    self._circuit.setProgramTemperature, self._current_program, temp
+                ),
+            )
 
     @property
     def preset_mode(self):
@@ -404,7 +378,7 @@ class ViCareClimate(ClimateEntity):
         """Return the available preset mode."""
         return list(HA_TO_VICARE_PRESET_HEATING)
 
-    def set_preset_mode(self, preset_mode: str) -> None:
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode and deactivate any existing programs."""
         vicare_program = HA_TO_VICARE_PRESET_HEATING.get(preset_mode)
         if vicare_program is None:
@@ -413,12 +387,30 @@ class ViCareClimate(ClimateEntity):
             )
 
         _LOGGER.debug("Setting preset to %s / %s", preset_mode, vicare_program)
-        if self._current_program != VICARE_PROGRAM_NORMAL:
+        service = self.coordinator.service
+        if vicare_program != VICARE_PROGRAM_NORMAL:
+            service.validate_command(
+                self._program_settings_feature(vicare_program), "activate", {}
+            )
+        current_program = self._current_program
+        if current_program != VICARE_PROGRAM_NORMAL:
+            # Only deactivate programs that offer it, the others reject it anyway
+            command = service.get_command(
+                self._program_settings_feature(current_program), "deactivate"
+            )
+            if command is None or not command.executable:
+                current_program = None
+        await self.coordinator.commands.async_write(
+            self._program_feature,
+            vicare_program,
+            partial(self._activate_program, current_program, vicare_program),
+        )
+
+    def _activate_program(self, current_program, vicare_program) -> None:
+        """Deactivate the current program and activate another one."""
+        if current_program not in (None, VICARE_PROGRAM_NORMAL):
             # We can't deactivate "normal"
-            try:
-                self._circuit.deactivateProgram(self._current_program)
-            except PyViCareCommandError:
-                _LOGGER.debug("Unable to deactivate program %s", self._current_program)
+            self._circuit.deactivateProgram(current_program)
         if vicare_program != VICARE_PROGRAM_NORMAL:
             # And we can't explicitly activate normal, either
             self._circuit.activateProgram(vicare_program)
@@ -426,21 +418,120 @@ class ViCareClimate(ClimateEntity):
     @property
     def extra_state_attributes(self):
         """Show Device Attributes."""
-        return self._attributes
-
-    def set_vicare_mode(self, vicare_mode):
+        attributes = {
+            "room_temperature": self._view.room_temperature,
+            "active_vicare_program": self._current_program,
+            "active_vicare_mode": self._current_mode,
+        }
+        shift, slope = self.coordinator.commands.pending_value(
+            self._curve_feature, (self._view.curve_shift, self._view.curve_slope)
+        )
+        if slope is not None:
+            attributes["heating_curve_slope"] = slope
+        if shift is not None:
+            attributes["heating_curve_shift"] = shift
+        attributes["vicare_modes"] = self._view.modes
+        return attributes
+
+    async def async_set_vicare_mode(self, vicare_mode):
         """Service function to set vicare modes directly."""
-        if vicare_mode not in self._attributes["vicare_modes"]:
+        if vicare_mode not in (self._view.modes or ()):
             raise ValueError(f"Cannot set invalid vicare mode: {vicare_mode}.")
 
-        self._circuit.setMode(vicare_mode)
+        await self._async_set_mode(vicare_mode)
 
-    def set_heating_curve(self, shift, slope):
+    async def async_set_heating_curve(self, shift, slope):
         """Service function to set vicare heating curve directly."""
-        self._circuit.setHeatingCurve(int(shift), round(float(slope), 1))
+        shift, slope = int(shift), round(float(slope), 1)
+        self.coordinator.service.validate_command(
+            self._curve_feature, "setCurve", {"shift": shift, "slope": slope}
+        )
+        await self.coordinator.commands.async_write(
+            self._curve_feature,
+            (shift, slope),
+            partial(self._circuit.setHeatingCurve, shift, slope),
+        )
 
+    async def async_apply_circuit_settings(
+        self,
+        vicare_mode=None,
+        program_temperatures=None,
+        shift=None,
+        slope=None,
+        dhw_temperature=None,
+    ):
+        """Service function to write several settings of the circuit at once.
+
+        All settings are validated against the commands of the last fetched
+        payload before any is sent. The commands are then sent concurrently
+        and followed by a single refresh.
+        """
+        service = self.coordinator.service
+        # Feature, command, parameters and the PyViCare write of every setting
+        writes = []
+        if vicare_mode is not None:
+            writes.append(
+                (
+                    self._mode_feature,
+                    "setMode",
+                    {"mode": vicare_mode},
+                    vicare_mode,
+                    partial(self._circuit.setMode, vicare_mode),
+                )
+            )
+        for program, temperature in (program_temperatures or {}).items():
+            writes.append(
+                (
+                    self._program_settings_feature(program),
+                    "setTemperature",
+                    {"targetTemperature": temperature},
+                    temperature,
+                    partial(self._circuit.setProgramTemperature, program, temperature),
+                )
+            )
+        if shift is not None:
+            shift, slope = int(shift), round(float(slope), 1)
+            writes.append(
+                (
+                    self._curve_feature,
+                    "setCurve",
+                    {"shift": shift, "slope": slope},
+                    (shift, slope),
+                    partial(self._circuit.setHeatingCurve, shift, slope),
+                )
+            )
+        if dhw_temperature is not None:
+            writes.append(
+                (
+                    DHW_TEMPERATURE_FEATURE,
+                    "setTargetTemperature",
+                    {"temperature": dhw_temperature},
+                    dhw_temperature,
+                    partial(self._api.setDomesticHotWaterTemperature, dhw_temperature),
+                )
+            )
+
+        if not writes:
+            # Nothing to write, don't spend a refresh on it
+            return
+        for feature, command, params, _, _ in writes:
+            service.validate_command(feature, command, params)
+
+        commands = self.coordinator.commands
+        results = await asyncio.gather(
+            *(
+                commands.async_write(feature, value, write)
+                for feature, _, _, value, write in writes
+            ),
+            return_exceptions=True,
+        )
+        await self.coordinator.async_request_refresh()
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
 
-class ViCareThermostat(ClimateEntity):
+
+class ViCareThermostat(ViCareEntity, ClimateEntity):
     """Representation of the ViCare heating climate device."""
 
     _attr_precision = PRECISION_TENTHS
@@ -449,77 +540,26 @@ class ViCareThermostat(ClimateEntity):
     )
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
 
-    def __init__(self, name, api, device_config):
+    def __init__(self, coordinator, name, api, device_config):
         """Initialize the climate device."""
-        self._name = name
-        self._state = None
+        super().__init__(coordinator)
+        self._attr_name = name
+        self._attr_unique_id = get_unique_id(api, coordinator.device_id, 0)
         self._api = api
         self._device_config = device_config
-        self._attributes = {}
-        self._target_temperature = None
-        self._current_mode = None
-        self._current_temperature = None
-        self.update()
-
-    @property
-    def unique_id(self) -> str:
-        """Return unique ID for this device."""
-        return get_unique_id(self._api, self._device_config, 0)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for this device."""
-        return DeviceInfo(
-            identifiers={
-                (
-                    DOMAIN,
-                    get_unique_device_id(self._device_config),
-                )
-            },
-            name=get_device_name(self._device_config),
-            manufacturer="Viessmann",
-            model=self._device_config.getModel(),
-            configuration_url="https://developer.viessmann.com/",
-        )
-
-    def update(self) -> None:
-        """Let HA know there has been an update from the ViCare API."""
-        try:
-            _room_temperature = None
-            with suppress(PyViCareNotSupportedFeatureError):
-                _room_temperature = self._api.getTemperature()
-            self._current_temperature = _room_temperature
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._target_temperature = self._api.getTargetTemperature()
-
-            # Update the generic device attributes
-            self._attributes = {}
-            self._attributes["room_temperature"] = _room_temperature
-
-        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
-            _LOGGER.error("Unable to retrieve data from ViCare server")
-        except PyViCareRateLimitError as limit_exception:
-            _LOGGER.error("Vicare API rate limit exceeded: %s", limit_exception)
-        except ValueError:
-            _LOGGER.error("Unable to decode data from ViCare server")
-        except PyViCareInvalidDataError as invalid_data_exception:
-            _LOGGER.error("Invalid data from Vicare server: %s", invalid_data_exception)
-
-    @property
-    def name(self):
-        """Return the name of the climate device."""
-        return self._name
+        self._view = coordinator.state.thermostat
 
     @property
     def current_temperature(self):
         """Return the current temperature."""
-        return self._current_temperature
+        return self._view.room_temperature
 
     @property
     def target_temperature(self):
         """Return the temperature we try to reach."""
-        return self._target_temperature
+        return self.coordinator.commands.pending_value(
+            "trv.temperature", self._view.target_temperature
+        )
 
     @property
     def hvac_mode(self) -> HVACMode | None:
@@ -536,13 +576,17 @@ class ViCareThermostat(ClimateEntity):
         """Set target temperature step to halves."""
         return PRECISION_HALVES
 
-    def set_temperature(self, **kwargs: Any) -> None:
+    async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperatures."""
         if (temp := kwargs.get(ATTR_TEMPERATURE)) is not None:
-            self._api.setTargetTemperature(temp)
-            self._target_temperature = temp
+            self.coordinator.service.validate_command(
+                "trv.temperature", "setTargetTemperature", {"temperature": int(temp)}
+            )
+            await self.coordinator.commands.async_enqueue(
+                "trv.temperature", temp, partial(self._api.setTargetTemperature, temp)
+            )
 
     @property
     def extra_state_attributes(self):
         """Show Device Attributes."""
-        return self._attributes
+        return {"room_temperature": self._view.room_temperature}
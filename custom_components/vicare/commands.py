@@ -0,0 +1,213 @@
+"""Coalesce and track commands sent to a ViCare device."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+from typing import Any, NamedTuple
+
+from PyViCare.PyViCareUtils import (
+    PyViCareCommandError,
+    PyViCareInvalidDataError,
+    PyViCareRateLimitError,
+)
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.util import dt as dt_util
+
+from .api import CONNECTION_ERRORS
+from .const import COMMAND_CONFIRM_TIMEOUT, COMMAND_DEBOUNCE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandSpec(NamedTuple):
+    """Whether a feature command can be sent and its parameter constraints."""
+
+    executable: bool
+    constraints: dict[str, dict[str, Any]]
+
+
+def index_commands(
+    features: dict[str, dict[str, Any]]
+) -> dict[tuple[str, str], CommandSpec]:
+    """Index the commands of all features by feature and command name."""
+    return {
+        (name, command): CommandSpec(
+            spec.get("isExecutable", True),
+            {
+                param: schema.get("constraints", {})
+                for param, schema in spec.get("params", {}).items()
+            },
+        )
+        for name, feature in features.items()
+        for command, spec in feature.get("commands", {}).items()
+    }
+
+
+def validate_command(
+    spec: CommandSpec | None, command: str, params: dict[str, Any]
+) -> None:
+    """Raise ValueError unless a command accepts the params.
+
+    Checks the constraints the server lists for every command parameter in the
+    feature payload, so invalid writes never cost an API call.
+    """
+    if spec is None:
+        raise ValueError(f"Command {command} is not supported")
+    if not spec.executable:
+        raise ValueError(f"Command {command} is not executable right now")
+    for name, value in params.items():
+        if (constraints := spec.constraints.get(name)) is None:
+            raise ValueError(f"Unknown parameter {name} of command {command}")
+        if "enum" in constraints and value not in constraints["enum"]:
+            raise ValueError(f"Invalid {name} {value}, allowed: {constraints['enum']}")
+        if "min" in constraints and value < constraints["min"]:
+            raise ValueError(f"{name} {value} is below {constraints['min']}")
+        if "max" in constraints and value > constraints["max"]:
+            raise ValueError(f"{name} {value} is above {constraints['max']}")
+        if stepping := constraints.get("stepping"):
+            steps = (value - constraints.get("min", 0)) / stepping
+            if abs(steps - round(steps)) > 1e-6:
+                raise ValueError(f"{name} {value} is not a multiple of {stepping}")
+
+
+class _Write(NamedTuple):
+    """Value commanded to a feature and the command writing it."""
+
+    value: Any
+    command: Callable[[], Any]
+    queued: bool
+    sent: datetime | None = None
+
+
+class ViCareCommandQueue:
+    """Write-through layer for the settings of a device.
+
+    Writes are keyed by the feature the server reflects them in. Listeners are
+    updated on every write, so entities show a written value from the moment
+    it is commanded until a fetched payload carries that feature with a newer
+    timestamp. The regular polls confirm writes and stale payloads fetched in
+    between do not flip the state back.
+
+    Queued writes wait for the debounce delay and replace each other, so
+    dragging a slider costs a single API call. Commands are PyViCare calls,
+    sent from the event loop by the execute function of the device.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        update_listeners: Callable[[], None],
+        execute: Callable[[Callable[[], Any]], Awaitable[None]],
+        delay: float = COMMAND_DEBOUNCE_DELAY,
+    ) -> None:
+        """Initialize the queue of a device."""
+        self.hass = hass
+        self._update_listeners = update_listeners
+        self._execute = execute
+        self._delay = delay
+        self._writes: dict[str, _Write] = {}
+        self._debouncers: dict[str, Debouncer] = {}
+
+    def is_pending(self, feature: str) -> bool:
+        """Return true if a write to the feature was not confirmed yet."""
+        return feature in self._writes
+
+    def pending_value(self, feature: str, default: Any = None) -> Any:
+        """Return the value of the unconfirmed write to the feature, if any."""
+        if (write := self._writes.get(feature)) is None:
+            return default
+        return write.value
+
+    async def async_enqueue(
+        self, feature: str, value: Any, command: Callable[[], Any]
+    ) -> None:
+        """Schedule a command, replacing a pending one to the feature."""
+        self._writes[feature] = _Write(value, command, queued=True)
+        self._update_listeners()
+        if (debouncer := self._debouncers.get(feature)) is None:
+            debouncer = self._debouncers[feature] = Debouncer(
+                self.hass,
+                _LOGGER,
+                cooldown=self._delay,
+                immediate=False,
+                function=partial(self._async_send, feature),
+            )
+        await debouncer.async_call()
+
+    async def async_write(
+        self, feature: str, value: Any, command: Callable[[], Any]
+    ) -> None:
+        """Send a command right away and track the value it writes.
+
+        Errors are raised to the caller once the value was dropped.
+        """
+        if (debouncer := self._debouncers.get(feature)) is not None:
+            debouncer.async_cancel()
+        write = self._writes[feature] = _Write(value, command, queued=False)
+        self._update_listeners()
+        try:
+            await self._execute(command)
+        except Exception:
+            if self._writes.get(feature) is write:
+                self._async_drop(feature)
+            raise
+        if self._writes.get(feature) is write:
+            self._writes[feature] = write._replace(sent=dt_util.utcnow())
+
+    async def _async_send(self, feature: str) -> None:
+        """Send the last queued write to the feature."""
+        write = self._writes.get(feature)
+        if write is None or not write.queued or write.sent is not None:
+            return
+        sent = False
+        try:
+            await self._execute(write.command)
+            sent = True
+        except CONNECTION_ERRORS:
+            _LOGGER.error("Unable to send command to ViCare server")
+        except PyViCareRateLimitError as limit_exception:
+            _LOGGER.error("Vicare API rate limit exceeded: %s", limit_exception)
+        except (PyViCareCommandError, PyViCareInvalidDataError) as command_exception:
+            _LOGGER.error("Command rejected by Vicare server: %s", command_exception)
+        if self._writes.get(feature) is not write:
+            # Replaced while it was sent, the debouncer ignores calls
+            # until it finished this one
+            self.hass.loop.call_soon(self._debouncers[feature].async_schedule_call)
+        elif sent:
+            self._writes[feature] = write._replace(sent=dt_util.utcnow())
+        else:
+            self._async_drop(feature)
+
+    @callback
+    def _async_drop(self, feature: str) -> None:
+        """Forget a failed write and show the last fetched value again."""
+        del self._writes[feature]
+        self._update_listeners()
+
+    @callback
+    def async_reconcile(
+        self, feature_timestamp: Callable[[str], datetime | None]
+    ) -> None:
+        """Drop the writes confirmed by a fetched payload.
+
+        A write is confirmed once the server updated its feature after the
+        command was sent. Writes the server never reflects expire eventually.
+        """
+        expired = dt_util.utcnow() - timedelta(seconds=COMMAND_CONFIRM_TIMEOUT)
+        for feature, write in list(self._writes.items()):
+            if write.sent is None:
+                continue
+            updated = feature_timestamp(feature)
+            if write.sent < expired or (updated is not None and updated >= write.sent):
+                del self._writes[feature]
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop all pending writes."""
+        for debouncer in self._debouncers.values():
+            debouncer.async_shutdown()
+        self._writes.clear()
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 from PyViCare.PyViCareUtils import (
@@ -20,7 +21,8 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.device_registry import format_mac
 
 from . import vicare_login
-from .const import CONF_PREMIUM, DOMAIN, VICARE_NAME
+from .budget import async_record_pending_calls
+from .const import CONF_PARALLEL_FETCHES, CONF_PREMIUM, DOMAIN, VICARE_NAME
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,14 +44,21 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Required(CONF_PASSWORD): cv.string,
             vol.Required(CONF_CLIENT_ID): cv.string,
             vol.Optional(CONF_PREMIUM): cv.boolean,
+            vol.Optional(CONF_PARALLEL_FETCHES): vol.All(
+                cv.positive_int, vol.Range(min=1, max=10)
+            ),
         }
         errors: dict[str, str] = {}
         description_placeholders: dict[str, str] = {}
 
         if user_input is not None:
+            calls: list[tuple[float, str]] = []
             try:
                 await self.hass.async_add_executor_job(
-                    vicare_login, self.hass, user_input
+                    vicare_login,
+                    self.hass,
+                    user_input,
+                    lambda kind: calls.append((time.time(), kind)),
                 )
             except PyViCareInvalidCredentialsError:
                 errors["base"] = "invalid_auth"
@@ -64,6 +73,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 description_placeholders = {"error": str(err)}
             else:
                 return self.async_create_entry(title=VICARE_NAME, data=user_input)
+            finally:
+                # Spent on the quota of the account even if the login failed
+                async_record_pending_calls(self.hass, calls)
 
         return self.async_show_form(
             step_id="user",
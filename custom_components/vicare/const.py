@@ -15,6 +15,7 @@ PLATFORMS = [
 ]
 
 VICARE_DEVICE_CONFIG = "device_conf"
+VICARE_DEVICES = "devices"
 VICARE_API = "api"
 VICARE_NAME = "ViCare"
 
@@ -22,6 +23,35 @@ CONF_CIRCUIT = "circuit"
 
 DEFAULT_SCAN_INTERVAL = 60
 CONF_PREMIUM = "subscription_premium"
+CONF_PARALLEL_FETCHES = "parallel_fetches"
+DEFAULT_PARALLEL_FETCHES = 4
+
+# Premium subscription allows 3000 vs 1450 API calls per day
+API_CALLS_PER_DAY = 1450
+API_CALLS_PER_DAY_PREMIUM = 3000
+# Calls per day held back from polling for user commands
+API_CALL_RESERVE = 100
+MIN_SCAN_INTERVAL = 30
+API_TIMEOUT = 31
+BUDGET_STORAGE_VERSION = 1
+BUDGET_SAVE_DELAY = 60
+# Delays after server and connection errors, doubled on every failure
+BACKOFF_INITIAL_DELAY = 60
+BACKOFF_MAX_DELAY = 3600
+
+# Writes to the same setting within this delay are sent as one command
+COMMAND_DEBOUNCE_DELAY = 2
+# Commanded values are shown until the server reports the feature updated,
+# or at most for this many seconds
+COMMAND_CONFIRM_TIMEOUT = 600
+
+# The hot water temperature is shared by all circuits of a device
+DHW_TEMPERATURE_FEATURE = "heating.dhw.temperature.main"
+
+# Last fetched payload of every device, served at startup before the first refresh
+SNAPSHOT_STORAGE_VERSION = 2
+SNAPSHOT_SAVE_DELAY = 300
+SNAPSHOT_MAX_AGE = 86400
 
 VICARE_CUBIC_METER = "cubicMeter"
 VICARE_KWH = "kilowattHour"
@@ -1,19 +1,47 @@
 """Diagnostics support for ViCare."""
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Any
+import re
+from typing import IO, Any
+
+import voluptuous as vol
 
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_CLIENT_ID, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, VICARE_DEVICE_CONFIG
-from .helpers import get_unique_device_id
+from .const import DOMAIN, VICARE_DEVICES
 
 TO_REDACT = {CONF_CLIENT_ID, CONF_PASSWORD, CONF_USERNAME}
 
+DIAGNOSTICS_FILENAME = "vicare_diagnostics.json"
+SERVICE_WRITE_DIAGNOSTICS = "write_diagnostics"
+SERVICE_WRITE_DIAGNOSTICS_ATTR_TIMINGS = "include_timings"
+SERVICE_WRITE_DIAGNOSTICS_ATTR_CACHE_STATS = "include_cache_stats"
+SERVICE_WRITE_DIAGNOSTICS_ATTR_REFRESH = "refresh"
+
+# Same masking of serial numbers and ids as PyViCare's dump_secure
+_SERIAL = re.compile(r'(["\/])(\d{6,})(["\/])')
+
+
+def redact_serials(text: str) -> str:
+    """Mask all serial numbers and ids in a JSON document."""
+    return _SERIAL.sub(
+        lambda match: match.group(1) + "#" * len(match.group(2)) + match.group(3),
+        text,
+    )
+
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
@@ -28,9 +56,132 @@ async def async_get_config_entry_diagnostics(
 
 
 def dump_device_state(hass: HomeAssistant, entry: ConfigEntry):
-    """Dump devices state to dict."""
-    devices = hass.data[DOMAIN][entry.entry_id][VICARE_DEVICE_CONFIG]
+    """Dump the last fetched payload of every device and its age to dict.
+
+    Diagnostics never fetch from the API, the write_diagnostics service can
+    refresh the devices first.
+    """
+    devices = hass.data[DOMAIN][entry.entry_id][VICARE_DEVICES]
     device_dumps = dict[str, Any]()
     for device in devices:
-        device_dumps[get_unique_device_id(device)] = json.loads(device.dump_secure())
+        coordinator = device.coordinator
+        device_dumps[coordinator.device_id] = {
+            **json.loads(redact_serials(json.dumps(coordinator.service.features))),
+            "last_fetch": coordinator.last_fetch,
+            "age": _payload_age(coordinator),
+        }
     return device_dumps
+
+
+def _payload_age(coordinator: Any) -> float | None:
+    """Return the seconds since the payload of a device was fetched."""
+    if coordinator.last_fetch is None:
+        return None
+    return (dt_util.utcnow() - coordinator.last_fetch).total_seconds()
+
+
+def _device_stats(
+    device: Any, include_timings: bool, include_cache_stats: bool
+) -> dict[str, Any]:
+    """Return the fetch timings and cache statistics of a device."""
+    coordinator = device.coordinator
+    stats: dict[str, Any] = {}
+    if include_timings:
+        stats["timings"] = {
+            "last_fetch": coordinator.last_fetch,
+            "last_fetch_duration": coordinator.last_fetch_duration,
+            "update_interval": coordinator.update_interval.total_seconds(),
+        }
+    if include_cache_stats:
+        service = coordinator.service
+        stats["cache"] = {
+            "features": len(service.features["data"]),
+            "enabled_features": len(service.enabled_features),
+            "changed_features": len(service.changed_features),
+            "age": _payload_age(coordinator),
+        }
+    return stats
+
+
+def write_device_states(
+    fp: IO[str], devices: list[tuple[str, list[dict[str, Any]], dict[str, Any]]]
+) -> None:
+    """Write redacted device payloads to a JSON document one feature at a time.
+
+    Only a single feature is serialized at once, so dumping a large
+    installation does not hold a copy of every payload in memory.
+    """
+    fp.write("{")
+    for device_index, (device_id, features, stats) in enumerate(devices):
+        if device_index:
+            fp.write(",")
+        fp.write(f'\n{redact_serials(json.dumps(device_id))}: {{"data": [')
+        for feature_index, feature in enumerate(features):
+            if feature_index:
+                fp.write(",")
+            fp.write("\n")
+            fp.write(redact_serials(json.dumps(feature, sort_keys=True)))
+        fp.write("\n]")
+        for key, value in stats.items():
+            fp.write(f", {json.dumps(key)}: {json.dumps(value, default=str)}")
+        fp.write("}")
+    fp.write("\n}\n")
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the service writing diagnostics of all devices to a file."""
+    if hass.services.has_service(DOMAIN, SERVICE_WRITE_DIAGNOSTICS):
+        return
+
+    async def async_write_diagnostics(call: ServiceCall) -> ServiceResponse:
+        """Write the last fetched payload of every device to a file."""
+        include_timings = call.data[SERVICE_WRITE_DIAGNOSTICS_ATTR_TIMINGS]
+        include_cache_stats = call.data[SERVICE_WRITE_DIAGNOSTICS_ATTR_CACHE_STATS]
+        devices = [
+            device
+            for entry_data in hass.data[DOMAIN].values()
+            for device in entry_data.get(VICARE_DEVICES, ())
+        ]
+        if call.data[SERVICE_WRITE_DIAGNOSTICS_ATTR_REFRESH]:
+            # Spends an API call per device
+            await asyncio.gather(
+                *(device.coordinator.async_refresh() for device in devices)
+            )
+        # Take the payloads on the event loop, refreshes swap them atomically
+        dumps = [
+            (
+                device.coordinator.device_id,
+                device.coordinator.service.features["data"],
+                _device_stats(device, include_timings, include_cache_stats),
+            )
+            for device in devices
+        ]
+        path = hass.config.path(DIAGNOSTICS_FILENAME)
+
+        def write() -> None:
+            with open(path, "w", encoding="utf-8") as fp:
+                write_device_states(fp, dumps)
+
+        await hass.async_add_executor_job(write)
+        return {"path": path, "devices": len(dumps)}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WRITE_DIAGNOSTICS,
+        async_write_diagnostics,
+        vol.Schema(
+            {
+                vol.Optional(
+                    SERVICE_WRITE_DIAGNOSTICS_ATTR_TIMINGS, default=False
+                ): cv.boolean,
+                vol.Optional(
+                    SERVICE_WRITE_DIAGNOSTICS_ATTR_CACHE_STATS, default=False
+                ): cv.boolean,
+                vol.Optional(
+                    SERVICE_WRITE_DIAGNOSTICS_ATTR_REFRESH, default=False
+                ): cv.boolean,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
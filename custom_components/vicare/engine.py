@@ -0,0 +1,174 @@
+"""Fetch engine shared by all devices of a ViCare account."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from datetime import datetime, timedelta
+import logging
+import random
+from typing import Any
+
+from PyViCare.PyViCareUtils import PyViCareInternalServerError, PyViCareRateLimitError
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .api import CONNECTION_ERRORS, ViCareApiClient, ViCareTokenExpiredError
+from .budget import ViCareApiBudget
+from .const import (
+    BACKOFF_INITIAL_DELAY,
+    BACKOFF_MAX_DELAY,
+    DEFAULT_PARALLEL_FETCHES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ViCareFetchSuspendedError(Exception):
+    """Polling of the account or the device is suspended."""
+
+    def __init__(self, resume_at: datetime) -> None:
+        """Initialize the error with the time polling resumes."""
+        super().__init__(f"Polling suspended until {resume_at.isoformat()}")
+        self.resume_at = resume_at
+
+
+class ViCareFetchBackoff:
+    """Failed fetches of a single device and when to retry it."""
+
+    def __init__(self) -> None:
+        """Initialize the backoff of a device."""
+        self.resume_at: datetime | None = None
+        self.consecutive_failures = 0
+
+    @property
+    def resume_in(self) -> float:
+        """Return the seconds until the device is polled again."""
+        if self.resume_at is None:
+            return 0
+        return max((self.resume_at - dt_util.utcnow()).total_seconds(), 0)
+
+    def failed(self) -> datetime:
+        """Count a failed fetch and back off for a jittered, growing delay."""
+        self.consecutive_failures += 1
+        delay = min(
+            BACKOFF_INITIAL_DELAY * 2 ** (self.consecutive_failures - 1),
+            BACKOFF_MAX_DELAY,
+        )
+        delay = random.uniform(delay / 2, delay)
+        _LOGGER.debug("Backing off for %i seconds", delay)
+        self.resume_at = dt_util.utcnow() + timedelta(seconds=delay)
+        return self.resume_at
+
+    def succeeded(self) -> None:
+        """Reset the backoff after a successful fetch."""
+        self.resume_at = None
+        self.consecutive_failures = 0
+
+
+class ViCareFetchEngine:
+    """Fetch device payloads and suspend polling on errors.
+
+    A rate limit error suspends every device of the account until the limit
+    resets. Server and connection errors only back off the failing device,
+    exponentially with jitter. Polls during a suspension fail fast without
+    spending an API call.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        budget: ViCareApiBudget,
+        client: ViCareApiClient | None = None,
+        parallel_fetches: int = DEFAULT_PARALLEL_FETCHES,
+    ) -> None:
+        """Initialize the engine of a config entry."""
+        self.hass = hass
+        self.budget = budget
+        self.client = client
+        self._fetch_slots = asyncio.Semaphore(parallel_fetches)
+        self.resume_at: datetime | None = None
+
+    @property
+    def resume_in(self) -> float:
+        """Return the seconds until polling of the account resumes."""
+        if self.resume_at is None:
+            return 0
+        return max((self.resume_at - dt_util.utcnow()).total_seconds(), 0)
+
+    def scan_interval(self, backoff: ViCareFetchBackoff | None = None) -> float:
+        """Return the polling interval of a device in seconds."""
+        return max(
+            self.budget.scan_interval(),
+            self.resume_in,
+            backoff.resume_in if backoff is not None else 0,
+        )
+
+    def _suspend(self, resume_at: datetime) -> None:
+        """Suspend polling of all devices until the given time."""
+        if self.resume_at is None or resume_at > self.resume_at:
+            self.resume_at = resume_at
+
+    def suspend(
+        self, err: PyViCareRateLimitError, backoff: ViCareFetchBackoff | None = None
+    ) -> None:
+        """Suspend polling of all devices until the rate limit resets.
+
+        Without a reset time in the error, polling resumes after the backoff of
+        the failed device.
+        """
+        resume_at = backoff.failed() if backoff is not None else None
+        if (reset := getattr(err, "limitResetDate", None)) is not None:
+            resume_at = reset.replace(tzinfo=dt_util.UTC)
+        if resume_at is not None:
+            self._suspend(resume_at)
+
+    async def _async_fetch(self, service: Any) -> dict[str, Any]:
+        """Fetch on the event loop, or in the executor if the token is expired."""
+        if service.client is not None:
+            with suppress(ViCareTokenExpiredError):
+                return await service.async_fetch_all_features()
+        return await self.hass.async_add_executor_job(service.fetch_all_features)
+
+    async def async_send(
+        self, service: Any, property_name: str, action: str, data: Any
+    ) -> Any:
+        """Send a command on the event loop, or in the executor without a client."""
+        if service.client is not None:
+            with suppress(ViCareTokenExpiredError):
+                return await service.async_set_property(property_name, action, data)
+            # PyViCare retries a command as a GET after renewing the token
+            await service.client.async_renew_token()
+            return await service.async_set_property(property_name, action, data)
+        return await self.hass.async_add_executor_job(
+            service.setProperty, property_name, action, data
+        )
+
+    async def async_fetch(
+        self, service: Any, backoff: ViCareFetchBackoff
+    ) -> dict[str, Any]:
+        """Fetch the feature payload of a device unless polling is suspended.
+
+        At most the configured number of fetches run at once. Queued fetches
+        check for a suspension once they get a slot, so a rate limit hit by
+        another device spares their call.
+        """
+        async with self._fetch_slots:
+            if self.resume_in > 0:
+                raise ViCareFetchSuspendedError(self.resume_at)
+            if backoff.resume_in > 0:
+                raise ViCareFetchSuspendedError(backoff.resume_at)
+            try:
+                data = await self._async_fetch(service)
+            except PyViCareRateLimitError as err:
+                self.suspend(err, backoff)
+                _LOGGER.warning(
+                    "Vicare API rate limit exceeded, suspending polling until %s",
+                    self.resume_at,
+                )
+                raise
+            except (*CONNECTION_ERRORS, PyViCareInternalServerError):
+                backoff.failed()
+                raise
+            backoff.succeeded()
+            return data
@@ -1,11 +1,15 @@
 """Helpers for ViCare."""
+import logging
+
 from PyViCare.PyViCareHeatingDevice import HeatingDevice
 from PyViCare.PyViCareUtils import PyViCareNotSupportedFeatureError
 
+_LOGGER = logging.getLogger(__name__)
+
 
-def get_unique_id(api, device_config, entity_id) -> str:
-    """Return unique ID for this entity."""
-    tmp_id = f"{get_unique_device_id(device_config)}-{entity_id}"
+def get_unique_id(api, device_id: str, entity_id) -> str:
+    """Return unique ID for an entity of the device with the given unique ID."""
+    tmp_id = f"{device_id}-{entity_id}"
     if hasattr(api, "id"):
         return f"{tmp_id}-{api.id}"
     return tmp_id
@@ -16,6 +20,36 @@ def get_unique_device_id(device_config) -> str:
     return f"{device_config.getConfig().id}-{device_config.getConfig().serial}-{device_config.getConfig().device_id}"
 
 
+def get_required_features(required_features, vicare_api) -> list[str]:
+    """Return the features a description requires for this device or component."""
+    component_id = vicare_api.id if hasattr(vicare_api, "id") else None
+    return [feature.format(id=component_id) for feature in required_features]
+
+
+def is_supported(name, entity_description, vicare_api, service) -> bool:
+    """Return true if the device offers the features and the getter of an entity.
+
+    All required features must be enabled. Reading the value then only
+    validates the shape of the payload and that the detected device type has
+    this getter.
+    """
+    if not service.has_features(
+        get_required_features(entity_description.required_features, vicare_api)
+    ):
+        _LOGGER.debug("Feature not supported %s", name)
+        return False
+    try:
+        entity_description.value_getter(vicare_api)
+    except PyViCareNotSupportedFeatureError:
+        _LOGGER.info("Feature not supported %s", name)
+        return False
+    except AttributeError:
+        _LOGGER.debug("Attribute Error %s", name)
+        return False
+    _LOGGER.debug("Found entity %s", name)
+    return True
+
+
 def get_device_name(device_config) -> str:
     """Return name for this device."""
     return f"{device_config.getModel()}-{device_config.getConfig().id}-{device_config.getConfig().device_id}"
@@ -45,4 +79,4 @@ def get_compressors(vicare_api):
     try:
         return vicare_api.compressors
     except PyViCareNotSupportedFeatureError:
-        return []
\ No newline at end of file
+        return []
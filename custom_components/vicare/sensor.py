@@ -2,18 +2,15 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from contextlib import suppress
 from dataclasses import dataclass
+from functools import partial
 import logging
+from typing import Any
 
 from PyViCare.PyViCareDevice import Device
 from PyViCare.PyViCareUtils import (
-    PyViCareInternalServerError,
-    PyViCareInvalidDataError,
     PyViCareNotSupportedFeatureError,
-    PyViCareRateLimitError,
 )
-import requests
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -24,33 +21,35 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
     UnitOfEnergy,
+    UnitOfInformation,
     UnitOfPower,
     UnitOfTemperature,
     UnitOfTime,
     UnitOfVolume,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 
-from . import ViCareRequiredKeysMixin
+from . import (
+    ViCareDataUpdateCoordinator,
+    ViCareEntity,
+    ViCareRequiredKeysMixin,
+)
 from .const import (
     DOMAIN,
     VICARE_CUBIC_METER,
-    VICARE_DEVICE_CONFIG,
+    VICARE_DEVICES,
     VICARE_KWH,
     VICARE_NAME,
     VICARE_UNIT_TO_UNIT_OF_MEASUREMENT,
 )
-from .helpers import (
-    get_burners,
-    get_circuits,
-    get_compressors,
-    get_device_name,
-    get_unique_device_id,
-    get_unique_id,
-)
+from .engine import ViCareFetchEngine
+from .helpers import get_required_features, get_unique_id, is_supported
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,12 +66,87 @@ class ViCareSensorEntityDescription(SensorEntityDescription, ViCareRequiredKeysM
     unit_getter: Callable[[Device], str | None] | None = None
 
 
+@dataclass
+class ViCareMetricKeysMixin:
+    """Mixin for the value of a metric of the integration itself."""
+
+    value_fn: Callable[[Any], StateType]
+
+
+@dataclass
+class ViCareMetricSensorEntityDescription(
+    SensorEntityDescription, ViCareMetricKeysMixin
+):
+    """Describes ViCare metric sensor entity."""
+
+
+DEVICE_METRIC_SENSORS: tuple[ViCareMetricSensorEntityDescription, ...] = (
+    ViCareMetricSensorEntityDescription(
+        key="last_fetch_duration",
+        name="Last fetch duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.last_fetch_duration,
+    ),
+    ViCareMetricSensorEntityDescription(
+        key="payload_size",
+        name="Payload size",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.last_payload_bytes,
+    ),
+    ViCareMetricSensorEntityDescription(
+        key="device_api_calls",
+        name="Device API calls in the last 24 hours",
+        icon="mdi:api",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.engine.budget.device_calls_in_window(
+            coordinator.device_id
+        ),
+    ),
+    ViCareMetricSensorEntityDescription(
+        key="consecutive_failures",
+        name="Consecutive failures",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.backoff.consecutive_failures,
+    ),
+)
+
+ACCOUNT_METRIC_SENSORS: tuple[ViCareMetricSensorEntityDescription, ...] = (
+    ViCareMetricSensorEntityDescription(
+        key="api_calls",
+        name="API calls in the last 24 hours",
+        icon="mdi:api",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda engine: engine.budget.calls_in_window,
+    ),
+    ViCareMetricSensorEntityDescription(
+        key="api_calls_remaining",
+        name="Remaining API calls",
+        icon="mdi:api",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda engine: engine.budget.remaining,
+    ),
+)
+
+
 GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
     ViCareSensorEntityDescription(
         key="outside_temperature",
         name="Outside Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getOutsideTemperature(),
+        required_features=("heating.sensors.temperature.outside",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -81,6 +155,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Return Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getReturnTemperature(),
+        required_features=("heating.sensors.temperature.return",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -89,6 +164,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Boiler Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getBoilerTemperature(),
+        required_features=("heating.boiler.sensors.temperature.main",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -97,6 +173,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Boiler Supply Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getBoilerCommonSupplyTemperature(),
+        required_features=("heating.boiler.sensors.temperature.commonSupply",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -105,6 +182,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Primary Circuit Supply Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getSupplyTemperaturePrimaryCircuit(),
+        required_features=("heating.primaryCircuit.sensors.temperature.supply",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -113,6 +191,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Primary Circuit  Return Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getReturnTemperaturePrimaryCircuit(),
+        required_features=("heating.primaryCircuit.sensors.temperature.return",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -121,6 +200,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Secondary Circuit Supply Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getSupplyTemperatureSecondaryCircuit(),
+        required_features=("heating.secondaryCircuit.sensors.temperature.supply",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -129,6 +209,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Secondary Circuit Return Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getReturnTemperatureSecondaryCircuit(),
+        required_features=("heating.secondaryCircuit.sensors.temperature.return",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -137,6 +218,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Hot Water Out Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getDomesticHotWaterOutletTemperature(),
+        required_features=("heating.dhw.sensors.temperature.outlet",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -145,6 +227,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Hot Water Max Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getDomesticHotWaterMaxTemperature(),
+        required_features=("heating.dhw.temperature.main",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -153,6 +236,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Hot Water Min Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getDomesticHotWaterMinTemperature(),
+        required_features=("heating.dhw.temperature.main",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -160,6 +244,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         key="hotwater_gas_consumption_today",
         name="Hot water gas consumption today",
         value_getter=lambda api: api.getGasConsumptionDomesticHotWaterToday(),
+        required_features=("heating.gas.consumption.dhw",),
         unit_getter=lambda api: api.getGasConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -167,6 +252,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         key="hotwater_gas_consumption_heating_this_week",
         name="Hot water gas consumption this week",
         value_getter=lambda api: api.getGasConsumptionDomesticHotWaterThisWeek(),
+        required_features=("heating.gas.consumption.dhw",),
         unit_getter=lambda api: api.getGasConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -174,6 +260,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         key="hotwater_gas_consumption_heating_this_month",
         name="Hot water gas consumption this month",
         value_getter=lambda api: api.getGasConsumptionDomesticHotWaterThisMonth(),
+        required_features=("heating.gas.consumption.dhw",),
         unit_getter=lambda api: api.getGasConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -181,6 +268,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         key="hotwater_gas_consumption_heating_this_year",
         name="Hot water gas consumption this year",
         value_getter=lambda api: api.getGasConsumptionDomesticHotWaterThisYear(),
+        required_features=("heating.gas.consumption.dhw",),
         unit_getter=lambda api: api.getGasConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -188,6 +276,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         key="gas_consumption_heating_today",
         name="Heating gas consumption today",
         value_getter=lambda api: api.getGasConsumptionHeatingToday(),
+        required_features=("heating.gas.consumption.heating",),
         unit_getter=lambda api: api.getGasConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -195,6 +284,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         key="gas_consumption_heating_this_week",
         name="Heating gas consumption this week",
         value_getter=lambda api: api.getGasConsumptionHeatingThisWeek(),
+        required_features=("heating.gas.consumption.heating",),
         unit_getter=lambda api: api.getGasConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -202,6 +292,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         key="gas_consumption_heating_this_month",
         name="Heating gas consumption this month",
         value_getter=lambda api: api.getGasConsumptionHeatingThisMonth(),
+        required_features=("heating.gas.consumption.heating",),
         unit_getter=lambda api: api.getGasConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -209,6 +300,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         key="gas_consumption_heating_this_year",
         name="Heating gas consumption this year",
         value_getter=lambda api: api.getGasConsumptionHeatingThisYear(),
+        required_features=("heating.gas.consumption.heating",),
         unit_getter=lambda api: api.getGasConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -217,6 +309,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Heating gas consumption current day",
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         value_getter=lambda api: api.getGasSummaryConsumptionHeatingCurrentDay(),
+        required_features=("heating.gas.consumption.summary.heating",),
         unit_getter=lambda api: api.getGasSummaryConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -225,6 +318,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Heating gas consumption current month",
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         value_getter=lambda api: api.getGasSummaryConsumptionHeatingCurrentMonth(),
+        required_features=("heating.gas.consumption.summary.heating",),
         unit_getter=lambda api: api.getGasSummaryConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -233,6 +327,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Heating gas consumption current year",
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         value_getter=lambda api: api.getGasSummaryConsumptionHeatingCurrentYear(),
+        required_features=("heating.gas.consumption.summary.heating",),
         unit_getter=lambda api: api.getGasSummaryConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -241,6 +336,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Hot water gas consumption current day",
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         value_getter=lambda api: api.getGasSummaryConsumptionDomesticHotWaterCurrentDay(),
+        required_features=("heating.gas.consumption.summary.dhw",),
         unit_getter=lambda api: api.getGasSummaryConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -249,6 +345,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Hot water gas consumption current month",
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         value_getter=lambda api: api.getGasSummaryConsumptionDomesticHotWaterCurrentMonth(),
+        required_features=("heating.gas.consumption.summary.dhw",),
         unit_getter=lambda api: api.getGasSummaryConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -257,6 +354,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Hot water gas consumption current year",
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         value_getter=lambda api: api.getGasSummaryConsumptionDomesticHotWaterCurrentYear(),
+        required_features=("heating.gas.consumption.summary.dhw",),
         unit_getter=lambda api: api.getGasSummaryConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -265,6 +363,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Hot water gas consumption last seven days",
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         value_getter=lambda api: api.getGasSummaryConsumptionDomesticHotWaterLastSevenDays(),
+        required_features=("heating.gas.consumption.summary.dhw",),
         unit_getter=lambda api: api.getGasSummaryConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -273,6 +372,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption of gas heating current day",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerSummaryConsumptionHeatingCurrentDay(),
+        required_features=("heating.power.consumption.summary.heating",),
         unit_getter=lambda api: api.getPowerSummaryConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -281,6 +381,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption of gas heating current month",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerSummaryConsumptionHeatingCurrentMonth(),
+        required_features=("heating.power.consumption.summary.heating",),
         unit_getter=lambda api: api.getPowerSummaryConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -289,6 +390,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption of gas heating current year",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerSummaryConsumptionHeatingCurrentYear(),
+        required_features=("heating.power.consumption.summary.heating",),
         unit_getter=lambda api: api.getPowerSummaryConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -297,6 +399,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption of gas heating last seven days",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerSummaryConsumptionHeatingLastSevenDays(),
+        required_features=("heating.power.consumption.summary.heating",),
         unit_getter=lambda api: api.getPowerSummaryConsumptionHeatingUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -305,6 +408,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption of hot water gas heating current day",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerSummaryConsumptionDomesticHotWaterCurrentDay(),
+        required_features=("heating.power.consumption.summary.dhw",),
         unit_getter=lambda api: api.getPowerSummaryConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -313,6 +417,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption of hot water gas heating current month",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerSummaryConsumptionDomesticHotWaterCurrentMonth(),
+        required_features=("heating.power.consumption.summary.dhw",),
         unit_getter=lambda api: api.getPowerSummaryConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -321,6 +426,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption of hot water gas heating current year",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerSummaryConsumptionDomesticHotWaterCurrentYear(),
+        required_features=("heating.power.consumption.summary.dhw",),
         unit_getter=lambda api: api.getPowerSummaryConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -329,6 +435,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption of hot water gas heating last seven days",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerSummaryConsumptionDomesticHotWaterLastSevenDays(),
+        required_features=("heating.power.consumption.summary.dhw",),
         unit_getter=lambda api: api.getPowerSummaryConsumptionDomesticHotWaterUnit(),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -337,6 +444,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Power production current",
         native_unit_of_measurement=UnitOfPower.WATT,
         value_getter=lambda api: api.getPowerProductionCurrent(),
+        required_features=("heating.power.production.current",),
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -345,6 +453,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy production today",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerProductionToday(),
+        required_features=("heating.power.production.cumulative",),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -353,6 +462,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy production this week",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerProductionThisWeek(),
+        required_features=("heating.power.production.cumulative",),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -361,6 +471,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy production this month",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerProductionThisMonth(),
+        required_features=("heating.power.production.cumulative",),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -369,6 +480,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy production this year",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerProductionThisYear(),
+        required_features=("heating.power.production.cumulative",),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
@@ -377,6 +489,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Solar Storage Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getSolarStorageTemperature(),
+        required_features=("heating.solar.sensors.temperature.dhw",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -385,6 +498,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Solar Collector Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getSolarCollectorTemperature(),
+        required_features=("heating.solar.sensors.temperature.collector",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -393,6 +507,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Solar energy production today",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getSolarPowerProductionToday(),
+        required_features=("heating.solar.power.production",),
         unit_getter=lambda api: api.getSolarPowerProductionUnit(),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -402,6 +517,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Solar energy production this week",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getSolarPowerProductionThisWeek(),
+        required_features=("heating.solar.power.production",),
         unit_getter=lambda api: api.getSolarPowerProductionUnit(),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -411,6 +527,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Solar energy production this month",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getSolarPowerProductionThisMonth(),
+        required_features=("heating.solar.power.production",),
         unit_getter=lambda api: api.getSolarPowerProductionUnit(),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -420,6 +537,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Solar energy production this year",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getSolarPowerProductionThisYear(),
+        required_features=("heating.solar.power.production",),
         unit_getter=lambda api: api.getSolarPowerProductionUnit(),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -429,6 +547,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption today",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerConsumptionToday(),
+        required_features=("heating.power.consumption.total",),
         unit_getter=lambda api: api.getPowerConsumptionUnit(),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -438,6 +557,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Power consumption this week",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerConsumptionThisWeek(),
+        required_features=("heating.power.consumption.total",),
         unit_getter=lambda api: api.getPowerConsumptionUnit(),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -447,6 +567,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption this month",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerConsumptionThisMonth(),
+        required_features=("heating.power.consumption.total",),
         unit_getter=lambda api: api.getPowerConsumptionUnit(),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -456,6 +577,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption this year",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerConsumptionThisYear(),
+        required_features=("heating.power.consumption.total",),
         unit_getter=lambda api: api.getPowerConsumptionUnit(),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -465,6 +587,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Energy consumption of hot water heating today",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         value_getter=lambda api: api.getPowerConsumptionDomesticHotWaterToday(),
+        required_features=("heating.power.consumption.dhw",),
         unit_getter=lambda api: api.getPowerConsumptionUnit(),
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -474,6 +597,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Buffer Main Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getBufferMainTemperature(),
+        required_features=("heating.buffer.sensors.temperature.main",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -482,6 +606,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Buffer Top Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getBufferTopTemperature(),
+        required_features=("heating.buffer.sensors.temperature.top",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -490,6 +615,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Room Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getTemperature(),
+        required_features=("device.sensors.temperature",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -499,6 +625,7 @@ GLOBAL_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         icon="mdi:percent",
         native_unit_of_measurement=PERCENTAGE,
         value_getter=lambda api: api.getHumidity(),
+        required_features=("device.sensors.humidity",),
         state_class=SensorStateClass.MEASUREMENT,
     ),
 )
@@ -509,6 +636,7 @@ CIRCUIT_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Supply Temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_getter=lambda api: api.getSupplyTemperature(),
+        required_features=("heating.circuits.{id}.sensors.temperature.supply",),
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -520,6 +648,7 @@ BURNER_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Burner Starts",
         icon="mdi:counter",
         value_getter=lambda api: api.getStarts(),
+        required_features=("heating.burners.{id}.statistics",),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     ViCareSensorEntityDescription(
@@ -528,6 +657,7 @@ BURNER_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfTime.HOURS,
         value_getter=lambda api: api.getHours(),
+        required_features=("heating.burners.{id}.statistics",),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     ViCareSensorEntityDescription(
@@ -536,6 +666,7 @@ BURNER_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         icon="mdi:percent",
         native_unit_of_measurement=PERCENTAGE,
         value_getter=lambda api: api.getModulation(),
+        required_features=("heating.burners.{id}.modulation",),
         state_class=SensorStateClass.MEASUREMENT,
     ),
 )
@@ -546,6 +677,7 @@ COMPRESSOR_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         name="Compressor Starts",
         icon="mdi:counter",
         value_getter=lambda api: api.getStarts(),
+        required_features=("heating.compressors.{id}.statistics",),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     ViCareSensorEntityDescription(
@@ -554,6 +686,7 @@ COMPRESSOR_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfTime.HOURS,
         value_getter=lambda api: api.getHours(),
+        required_features=("heating.compressors.{id}.statistics",),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     ViCareSensorEntityDescription(
@@ -562,6 +695,7 @@ COMPRESSOR_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfTime.HOURS,
         value_getter=lambda api: api.getHoursLoadClass1(),
+        required_features=("heating.compressors.{id}.statistics",),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     ViCareSensorEntityDescription(
@@ -570,6 +704,7 @@ COMPRESSOR_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfTime.HOURS,
         value_getter=lambda api: api.getHoursLoadClass2(),
+        required_features=("heating.compressors.{id}.statistics",),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     ViCareSensorEntityDescription(
@@ -578,6 +713,7 @@ COMPRESSOR_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfTime.HOURS,
         value_getter=lambda api: api.getHoursLoadClass3(),
+        required_features=("heating.compressors.{id}.statistics",),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     ViCareSensorEntityDescription(
@@ -586,6 +722,7 @@ COMPRESSOR_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfTime.HOURS,
         value_getter=lambda api: api.getHoursLoadClass4(),
+        required_features=("heating.compressors.{id}.statistics",),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     ViCareSensorEntityDescription(
@@ -594,29 +731,19 @@ COMPRESSOR_SENSORS: tuple[ViCareSensorEntityDescription, ...] = (
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfTime.HOURS,
         value_getter=lambda api: api.getHoursLoadClass5(),
+        required_features=("heating.compressors.{id}.statistics",),
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
 )
 
 
-def _build_entity(name, vicare_api, device_config, sensor):
+def _build_entity(coordinator, name, vicare_api, device_config, sensor):
     """Create a ViCare sensor entity."""
-    try:
-        sensor.value_getter(vicare_api)
-        _LOGGER.debug("Found entity %s", name)
-    except PyViCareInternalServerError as server_error:
-        _LOGGER.info(
-            "Server error ( %s): Not creating entity %s", server_error.message, name
-        )
-        return None
-    except PyViCareNotSupportedFeatureError:
-        _LOGGER.info("Feature not supported %s", name)
-        return None
-    except AttributeError:
-        _LOGGER.debug("Attribute Error %s", name)
+    if not is_supported(name, sensor, vicare_api, coordinator.service):
         return None
 
     return ViCareSensor(
+        coordinator,
         name,
         vicare_api,
         device_config,
@@ -625,7 +752,7 @@ def _build_entity(name, vicare_api, device_config, sensor):
 
 
 def _entities_from_descriptions(
-    hass, name, entities, sensor_descriptions, iterables, config_entry, device
+    hass, name, entities, sensor_descriptions, iterables, config_entry, coordinator
 ):
     """Create entities from descriptions and list of burners/circuits."""
     for description in sensor_descriptions:
@@ -634,9 +761,10 @@ def _entities_from_descriptions(
             if len(iterables) > 1:
                 suffix = f" {current.id}"
             entity = _build_entity(
+                coordinator,
                 f"{name} {description.name}{suffix}",
                 current,
-                device,
+                coordinator.device_config,
                 description,
             )
             if entity is not None:
@@ -658,13 +786,31 @@ async def async_setup_entry(
 def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
     """Create entities for all devices and their circuits, burners or compressors if applicable."""
     name = VICARE_NAME
-    entities: list[ViCareSensor] = []
+    entities: list[SensorEntity] = []
+    devices = hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICES]
+
+    if devices:
+        coordinators = [device.coordinator for device in devices]
+        entities.extend(
+            ViCareAccountMetricSensor(
+                coordinators, f"{name} {description.name}", config_entry, description
+            )
+            for description in ACCOUNT_METRIC_SENSORS
+        )
+
+    for device in devices:
+        coordinator = device.coordinator
+        api = device.api
 
-    for device in hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICE_CONFIG]:
-        api = device.asAutoDetectDevice()
+        entities.extend(
+            ViCareMetricSensor(
+                coordinator, f"{name} {description.name}", api, description
+            )
+            for description in DEVICE_METRIC_SENSORS
+        )
 
         _entities_from_descriptions(
-            hass, name, entities, GLOBAL_SENSORS, [api], config_entry, device
+            hass, name, entities, GLOBAL_SENSORS, [api], config_entry, coordinator
         )
 
         try:
@@ -673,16 +819,22 @@ def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
                 name,
                 entities,
                 CIRCUIT_SENSORS,
-                get_circuits(api),
+                device.circuits,
                 config_entry,
-                device,
+                coordinator,
             )
         except PyViCareNotSupportedFeatureError:
             _LOGGER.info("No circuits found")
 
         try:
             _entities_from_descriptions(
-                hass, name, entities, BURNER_SENSORS, get_burners(api), config_entry, device
+                hass,
+                name,
+                entities,
+                BURNER_SENSORS,
+                device.burners,
+                config_entry,
+                coordinator,
             )
         except PyViCareNotSupportedFeatureError:
             _LOGGER.info("No burners found")
@@ -693,9 +845,9 @@ def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
                 name,
                 entities,
                 COMPRESSOR_SENSORS,
-                get_compressors(api),
+                device.compressors,
                 config_entry,
-                device,
+                coordinator,
             )
         except PyViCareNotSupportedFeatureError:
             _LOGGER.info("No compressors found")
@@ -703,74 +855,139 @@ def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
     return entities
 
 
-class ViCareSensor(SensorEntity):
+class ViCareSensor(ViCareEntity, SensorEntity):
     """Representation of a ViCare sensor."""
 
     entity_description: ViCareSensorEntityDescription
 
     def __init__(
-        self, name, api, device_config, description: ViCareSensorEntityDescription
+        self,
+        coordinator: ViCareDataUpdateCoordinator,
+        name,
+        api,
+        device_config,
+        description: ViCareSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
+        super().__init__(coordinator)
         self.entity_description = description
         self._attr_name = name
+        self._attr_unique_id = get_unique_id(
+            api, coordinator.device_id, description.key
+        )
         self._api = api
         self._device_config = device_config
-        self.update()
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for this device."""
-        return DeviceInfo(
-            identifiers={
-                (
-                    DOMAIN,
-                    get_unique_device_id(self._device_config),
-                )
-            },
-            name=get_device_name(self._device_config),
-            manufacturer="Viessmann",
-            model=self._device_config.getModel(),
-            configuration_url="https://developer.viessmann.com/",
+        self._features = frozenset(
+            get_required_features(description.required_features, api)
+        )
+        self._view = coordinator.state.sensor(
+            partial(description.value_getter, api),
+            partial(description.unit_getter, api) if description.unit_getter else None,
+            self._features,
         )
 
     @property
     def available(self):
         """Return True if entity is available."""
-        return self._state is not None
+        return super().available and self._view.value is not None
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self._view.value
 
     @property
-    def unique_id(self) -> str:
-        """Return unique ID for this device."""
-        return get_unique_id(
-            self._api, self._device_config, self.entity_description.key
+    def device_class(self) -> SensorDeviceClass | None:
+        """Return the device class of the unit reported by the device, if any."""
+        if self._view.unit is not None:
+            return VICARE_UNIT_TO_DEVICE_CLASS.get(self._view.unit)
+        return super().device_class
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return the unit reported by the device, if any."""
+        if self._view.unit is not None:
+            return VICARE_UNIT_TO_UNIT_OF_MEASUREMENT.get(self._view.unit)
+        return super().native_unit_of_measurement
+
+
+class ViCareMetricSensor(ViCareEntity, SensorEntity):
+    """Representation of a fetch metric of a ViCare device."""
+
+    entity_description: ViCareMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ViCareDataUpdateCoordinator,
+        name,
+        api,
+        description: ViCareMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = name
+        self._attr_unique_id = get_unique_id(
+            api, coordinator.device_id, description.key
         )
+        self._api = api
 
     @property
-    def native_value(self):
+    def available(self) -> bool:
+        """Return True, the metrics are most useful while fetches fail."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
         """Return the state of the sensor."""
-        return self._state
+        return self.entity_description.value_fn(self.coordinator)
 
-    def update(self):
-        """Update state of sensor."""
-        try:
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._state = self.entity_description.value_getter(self._api)
-
-                if self.entity_description.unit_getter:
-                    vicare_unit = self.entity_description.unit_getter(self._api)
-                    if vicare_unit is not None:
-                        self._attr_device_class = VICARE_UNIT_TO_DEVICE_CLASS.get(
-                            vicare_unit
-                        )
-                        self._attr_native_unit_of_measurement = (
-                            VICARE_UNIT_TO_UNIT_OF_MEASUREMENT.get(vicare_unit)
-                        )
-        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
-            _LOGGER.error("Unable to retrieve data from ViCare server")
-        except ValueError:
-            _LOGGER.error("Unable to decode data from ViCare server")
-        except PyViCareRateLimitError as limit_exception:
-            _LOGGER.error("Vicare API rate limit exceeded: %s", limit_exception)
-        except PyViCareInvalidDataError as invalid_data_exception:
-            _LOGGER.error("Invalid data from Vicare server: %s", invalid_data_exception)
+
+class ViCareAccountMetricSensor(ViCareEntity, SensorEntity):
+    """Representation of an API metric of a ViCare account.
+
+    The metrics change with the fetch of every device, so the sensor listens to
+    the coordinators of all devices of the account.
+    """
+
+    entity_description: ViCareMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinators: list[ViCareDataUpdateCoordinator],
+        name,
+        config_entry: ConfigEntry,
+        description: ViCareMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinators[0])
+        self.entity_description = description
+        self._attr_name = name
+        self._attr_unique_id = f"{config_entry.entry_id}-{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=f"{VICARE_NAME} API",
+            manufacturer="Viessmann",
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url="https://developer.viessmann.com/",
+        )
+        self._coordinators = coordinators
+        self._engine: ViCareFetchEngine = coordinators[0].engine
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to the refreshes of all devices of the account."""
+        await super().async_added_to_hass()
+        for coordinator in self._coordinators[1:]:
+            self.async_on_remove(
+                coordinator.async_add_listener(self._handle_coordinator_update)
+            )
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are most useful while fetches fail."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._engine)
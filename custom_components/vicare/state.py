@@ -0,0 +1,220 @@
+"""Per-device state of the ViCare entities."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from contextlib import suppress
+import threading
+from typing import TYPE_CHECKING, Any
+
+from PyViCare.PyViCareDevice import Device
+from PyViCare.PyViCareRadiatorActuator import RadiatorActuator
+from PyViCare.PyViCareUtils import PyViCareNotSupportedFeatureError
+
+from .const import DHW_TEMPERATURE_FEATURE
+
+if TYPE_CHECKING:
+    from . import ViCareDevice
+
+
+def _read(getter: Callable[[], Any]) -> Any:
+    """Return the value of a PyViCare getter, None if it is not supported."""
+    with suppress(PyViCareNotSupportedFeatureError):
+        return getter()
+    return None
+
+
+def _constraints(service: Any, feature: str, command: str, param: str) -> dict:
+    """Return the indexed constraints of a command parameter."""
+    if (spec := service.get_command(feature, command)) is None:
+        return {}
+    return spec.constraints.get(param, {})
+
+
+class ViCareCircuitState:
+    """Last fetched settings and readings of a heating circuit."""
+
+    __slots__ = (
+        "room_temperature",
+        "supply_temperature",
+        "program",
+        "target_temperature",
+        "min_temp",
+        "max_temp",
+        "stepping",
+        "mode",
+        "modes",
+        "curve_shift",
+        "curve_slope",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty circuit state."""
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+    def update(self, circuit: Any, service: Any) -> None:
+        """Read the circuit from the last fetched payload."""
+        self.room_temperature = _read(circuit.getRoomTemperature)
+        self.supply_temperature = _read(circuit.getSupplyTemperature)
+        self.program = _read(circuit.getActiveProgram)
+        self.target_temperature = _read(circuit.getCurrentDesiredTemperature)
+        constraints = _constraints(
+            service,
+            f"heating.circuits.{circuit.id}.operating.programs.{self.program}",
+            "setTemperature",
+            "targetTemperature",
+        )
+        self.min_temp = constraints.get("min")
+        self.max_temp = constraints.get("max")
+        self.stepping = constraints.get("stepping")
+        self.mode = _read(circuit.getActiveMode)
+        self.modes = _read(circuit.getModes)
+        self.curve_shift = _read(circuit.getHeatingCurveShift)
+        self.curve_slope = _read(circuit.getHeatingCurveSlope)
+
+
+class ViCareDhwState:
+    """Last fetched domestic hot water readings, shared by all circuits."""
+
+    __slots__ = ("storage_temperature", "target_temperature", "min_temp", "max_temp")
+
+    def __init__(self) -> None:
+        """Initialize an empty hot water state."""
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+    def update(self, api: Device, service: Any) -> None:
+        """Read the hot water from the last fetched payload."""
+        self.storage_temperature = _read(api.getDomesticHotWaterStorageTemperature)
+        self.target_temperature = _read(api.getDomesticHotWaterDesiredTemperature)
+        constraints = _constraints(
+            service, DHW_TEMPERATURE_FEATURE, "setTargetTemperature", "temperature"
+        )
+        self.min_temp = constraints.get("min")
+        self.max_temp = constraints.get("max")
+
+
+class ViCareThermostatState:
+    """Last fetched readings of a radiator actuator."""
+
+    __slots__ = ("room_temperature", "target_temperature")
+
+    def __init__(self) -> None:
+        """Initialize an empty thermostat state."""
+        self.room_temperature = None
+        self.target_temperature = None
+
+    def update(self, api: RadiatorActuator) -> None:
+        """Read the actuator from the last fetched payload."""
+        self.room_temperature = _read(api.getTemperature)
+        self.target_temperature = _read(api.getTargetTemperature)
+
+
+class ViCareSensorState:
+    """Last fetched value and unit of a sensor or binary sensor."""
+
+    __slots__ = ("_value_getter", "_unit_getter", "features", "value", "unit")
+
+    def __init__(
+        self,
+        value_getter: Callable[[], Any],
+        unit_getter: Callable[[], Any] | None,
+        features: frozenset[str],
+    ) -> None:
+        """Initialize the state of a sensor reading the given features."""
+        self._value_getter = value_getter
+        self._unit_getter = unit_getter
+        self.features = features
+        self.value = None
+        self.unit = None
+
+    def update(self) -> None:
+        """Read the sensor, keeping the last value if it is not supported."""
+        with suppress(PyViCareNotSupportedFeatureError):
+            self.value = self._value_getter()
+            if self._unit_getter is not None:
+                self.unit = self._unit_getter()
+
+
+class ViCareDeviceState:
+    """State of a device read once per refresh and shared by its entities.
+
+    Entities keep no copies of their readings, they hold the slotted state of
+    their circuit, the hot water, the actuator or the sensor and read it in
+    their properties. The objects are updated in place, so the views stay
+    valid across refreshes. Each payload is only read once, before the
+    entities are updated, and sensors only when their features changed.
+    """
+
+    __slots__ = (
+        "_device",
+        "_payload",
+        "_lock",
+        "circuits",
+        "dhw",
+        "thermostat",
+        "sensors",
+        "heating",
+    )
+
+    def __init__(self, device: ViCareDevice) -> None:
+        """Initialize the state of a device."""
+        self._device = device
+        self._payload: dict[str, Any] | None = None
+        self._lock = threading.Lock()
+        self.circuits: dict[Any, ViCareCircuitState] = {}
+        self.dhw = ViCareDhwState()
+        self.thermostat = ViCareThermostatState()
+        self.sensors: tuple[ViCareSensorState, ...] = ()
+        self.heating = False
+
+    def sensor(
+        self,
+        value_getter: Callable[[], Any],
+        unit_getter: Callable[[], Any] | None,
+        features: frozenset[str],
+    ) -> ViCareSensorState:
+        """Return the state of a new sensor, read from the last payload.
+
+        Sensors are created by the platforms in worker threads while the
+        device may be updated, the tuple is replaced and never changed.
+        """
+        state = ViCareSensorState(value_getter, unit_getter, features)
+        state.update()
+        with self._lock:
+            self.sensors = (*self.sensors, state)
+        return state
+
+    def circuit(self, circuit_id: Any) -> ViCareCircuitState:
+        """Return the state of a circuit."""
+        if (state := self.circuits.get(circuit_id)) is None:
+            state = self.circuits[circuit_id] = ViCareCircuitState()
+        return state
+
+    def update(self) -> None:
+        """Read the device, unless the last fetched payload was already read."""
+        device = self._device
+        service = device.coordinator.service
+        if service.features is self._payload:
+            return
+        self._payload = service.features
+        circuits = device.circuits
+        for circuit in circuits:
+            self.circuit(circuit.id).update(circuit, service)
+        if circuits:
+            self.dhw.update(device.api, service)
+        if isinstance(device.api, RadiatorActuator):
+            self.thermostat.update(device.api)
+        changed = service.changed_features
+        for sensor in self.sensors:
+            if not sensor.features.isdisjoint(changed):
+                sensor.update()
+
+        heating = False
+        with suppress(PyViCareNotSupportedFeatureError):
+            for burner in device.burners:
+                heating = heating or burner.getActive()
+        with suppress(PyViCareNotSupportedFeatureError):
+            for compressor in device.compressors:
+                heating = heating or compressor.getActive()
+        self.heating = heating
@@ -3,38 +3,44 @@ from __future__ import annotations
 
 from contextlib import suppress
 from dataclasses import dataclass
-import datetime
+from functools import partial
 import logging
+from typing import Any
 
 from PyViCare.PyViCareUtils import (
-    PyViCareInternalServerError,
     PyViCareInvalidDataError,
     PyViCareNotSupportedFeatureError,
     PyViCareRateLimitError,
 )
-import requests
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import ViCareRequiredKeysMixin, ViCareToggleKeysMixin
-from .const import DOMAIN, VICARE_DEVICE_CONFIG, VICARE_NAME
-from .helpers import get_device_name, get_unique_device_id, get_unique_id
+from . import (
+    ViCareDataUpdateCoordinator,
+    ViCareEntity,
+    ViCareRequiredKeysMixin,
+    ViCareToggleKeysMixin,
+)
+from .api import CONNECTION_ERRORS
+from .const import DOMAIN, VICARE_DEVICES, VICARE_NAME
+from .helpers import get_required_features, get_unique_id, is_supported
 
 _LOGGER = logging.getLogger(__name__)
 
 SWITCH_DHW_ONETIME_CHARGE = "dhw_onetimecharge"
-TIMEDELTA_UPDATE = datetime.timedelta(seconds=5)
 
 
 @dataclass
 class ViCareSwitchEntityDescription(SwitchEntityDescription, ViCareRequiredKeysMixin, ViCareToggleKeysMixin):
     """Describes ViCare switch entity."""
 
+    enable_command: str = "activate"
+    disable_command: str = "deactivate"
+
 
 SWITCH_DESCRIPTIONS: tuple[ViCareSwitchEntityDescription, ...] = (
     ViCareSwitchEntityDescription(
@@ -43,31 +49,21 @@ SWITCH_DESCRIPTIONS: tuple[ViCareSwitchEntityDescription, ...] = (
         icon="mdi:shower-head",
         entity_category=EntityCategory.CONFIG,
         value_getter=lambda api: api.getOneTimeCharge(),
+        required_features=("heating.dhw.oneTimeCharge",),
         enabler=lambda api: api.activateOneTimeCharge(),
         disabler=lambda api: api.deactivateOneTimeCharge(),
     ),
 )
 
 
-def _build_entity(name, vicare_api, device_config, description):
+def _build_entity(coordinator, name, vicare_api, device_config, description):
     """Create a ViCare switch entity."""
     _LOGGER.debug("Found device %s", name)
-    try:
-        description.value_getter(vicare_api)
-        _LOGGER.debug("Found entity %s", name)
-    except PyViCareInternalServerError as server_error:
-        _LOGGER.info(
-            "Server error ( %s): Not creating entity %s", server_error.message, name
-        )
-        return None
-    except PyViCareNotSupportedFeatureError:
-        _LOGGER.info("Feature not supported %s", name)
-        return None
-    except AttributeError:
-        _LOGGER.debug("Attribute Error %s", name)
+    if not is_supported(name, description, vicare_api, coordinator.service):
         return None
 
     return ViCareSwitch(
+        coordinator,
         name,
         vicare_api,
         device_config,
@@ -92,14 +88,16 @@ def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
     name = VICARE_NAME
     entities = []
 
-    for device in hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICE_CONFIG]:
-        api = device.asAutoDetectDevice()
+    for device in hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICES]:
+        coordinator = device.coordinator
+        api = device.api
 
         for description in SWITCH_DESCRIPTIONS:
             entity = _build_entity(
+                coordinator,
                 f"{name} {description.name}",
                 api,
-                device,
+                coordinator.device_config,
                 description,
             )
             if entity is not None:
@@ -108,60 +106,67 @@ def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
     return entities
 
 
-class ViCareSwitch(SwitchEntity):
+class ViCareSwitch(ViCareEntity, SwitchEntity):
     """Representation of a ViCare switch."""
 
     entity_description: ViCareSwitchEntityDescription
 
     def __init__(
-            self, name, api, device_config, description: ViCareSwitchEntityDescription
+            self,
+            coordinator: ViCareDataUpdateCoordinator,
+            name,
+            api,
+            device_config,
+            description: ViCareSwitchEntityDescription,
     ) -> None:
         """Initialize the switch."""
+        super().__init__(coordinator)
         self.entity_description = description
+        self._attr_unique_id = get_unique_id(
+            api, coordinator.device_id, description.key
+        )
         self._device_config = device_config
         self._api = api
-        self._ignore_update_until = datetime.datetime.utcnow()
-        self.update()
+        self._state = None
+        # The API reflects a toggle with a delay, the written state is shown
+        # until the feature is updated
+        self._feature = get_required_features(description.required_features, api)[0]
+        self._update_state()
 
     @property
     def is_on(self) -> bool:
         """Return true if device is on."""
         return self._state
 
-    def update(self):
+    def _update_state(self):
         """update internal state"""
-        now = datetime.datetime.utcnow()
-        """we have identified that the API does not directly sync the represented state, therefore we want to keep
-        an assumed state for a couple of seconds - so lets ignore an update
-        """
-        if now < self._ignore_update_until:
-            _LOGGER.debug("Ignoring Update Request for OneTime Charging for some seconds")
-            return
+        with suppress(PyViCareNotSupportedFeatureError):
+            _LOGGER.debug("Fetching DHW One Time Charging Status")
+            self._state = self.entity_description.value_getter(self._api)
+        self._state = self.coordinator.commands.pending_value(
+            self._feature, self._state
+        )
 
-        try:
-            with suppress(PyViCareNotSupportedFeatureError):
-                _LOGGER.debug("Fetching DHW One Time Charging Status")
-                self._state = self.entity_description.value_getter(self._api)
-        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
-            _LOGGER.error("Unable to retrieve data from ViCare server")
-        except ValueError:
-            _LOGGER.error("Unable to decode data from ViCare server")
-        except PyViCareRateLimitError as limit_exception:
-            _LOGGER.error("Vicare API rate limit exceeded: %s", limit_exception)
-        except PyViCareInvalidDataError as invalid_data_exception:
-            _LOGGER.error("Invalid data from Vicare server: %s", invalid_data_exception)
+    async def _async_toggle(self, state: bool, command) -> None:
+        """Show the new state right away and send the command."""
+        self._state = state
+        self.async_write_ha_state()
+        await self.coordinator.commands.async_write(
+            self._feature, state, partial(command, self._api)
+        )
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Handle the button press."""
+        self.coordinator.service.validate_command(
+            self._feature, self.entity_description.enable_command, {}
+        )
         try:
             with suppress(PyViCareNotSupportedFeatureError):
                 """Turn the switch on."""
                 _LOGGER.debug("Enabling DHW One-Time-Charging")
-                await self.hass.async_add_executor_job(self.entity_description.enabler, self._api)
-                self._ignore_update_until = datetime.datetime.utcnow() + TIMEDELTA_UPDATE
-                self._state = True
+                await self._async_toggle(True, self.entity_description.enabler)
 
-        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
+        except CONNECTION_ERRORS:
             _LOGGER.error("Unable to retrieve data from ViCare server")
         except ValueError:
             _LOGGER.error("Unable to decode data from ViCare server")
@@ -172,14 +177,15 @@ class ViCareSwitch(SwitchEntity):
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Handle the button press."""
+        self.coordinator.service.validate_command(
+            self._feature, self.entity_description.disable_command, {}
+        )
         try:
             with suppress(PyViCareNotSupportedFeatureError):
                 _LOGGER.debug("Disabling DHW One-Time-Charging")
-                await self.hass.async_add_executor_job(self.entity_description.disabler, self._api)
-                self._ignore_update_until = datetime.datetime.utcnow() + TIMEDELTA_UPDATE
-                self._state = False
+                await self._async_toggle(False, self.entity_description.disabler)
 
-        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
+        except CONNECTION_ERRORS:
             _LOGGER.error("Unable to retrieve data from ViCare server")
         except ValueError:
             _LOGGER.error("Unable to decode data from ViCare server")
@@ -187,26 +193,3 @@ class ViCareSwitch(SwitchEntity):
             _LOGGER.error("Vicare API rate limit exceeded: %s", limit_exception)
         except PyViCareInvalidDataError as invalid_data_exception:
             _LOGGER.error("Invalid data from Vicare server: %s", invalid_data_exception)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for this device."""
-        return DeviceInfo(
-            identifiers={
-                (
-                    DOMAIN,
-                    get_unique_device_id(self._device_config),
-                )
-            },
-            name=get_device_name(self._device_config),
-            manufacturer="Viessmann",
-            model=self._device_config.getModel(),
-            configuration_url="https://developer.viessmann.com/",
-        )
-
-    @property
-    def unique_id(self) -> str:
-        """Return unique ID for this device."""
-        return get_unique_id(
-            self._api, self._device_config, self.entity_description.key
-        )
@@ -1,15 +1,8 @@
 """Viessmann ViCare water_heater device."""
-from contextlib import suppress
+from functools import partial
 import logging
 from typing import Any
 
-from PyViCare.PyViCareUtils import (
-    PyViCareInvalidDataError,
-    PyViCareNotSupportedFeatureError,
-    PyViCareRateLimitError,
-)
-import requests
-
 from homeassistant.components.water_heater import (
     WaterHeaterEntity,
     WaterHeaterEntityFeature,
@@ -17,11 +10,11 @@ from homeassistant.components.water_heater import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, PRECISION_WHOLE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, VICARE_DEVICE_CONFIG, VICARE_NAME
-from .helpers import get_circuits, get_device_name, get_unique_device_id, get_unique_id
+from . import ViCareEntity
+from .const import DHW_TEMPERATURE_FEATURE, DOMAIN, VICARE_DEVICES, VICARE_NAME
+from .helpers import get_unique_id
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -61,104 +54,48 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the ViCare climate platform."""
+    async_add_entities(create_all_entities(hass, config_entry))
+
+
+def create_all_entities(hass: HomeAssistant, config_entry: ConfigEntry):
+    """Create a water heater entity for every circuit."""
     name = VICARE_NAME
     entities = []
 
-    for device in hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICE_CONFIG]:
-        api = device.asAutoDetectDevice()
+    for vicare_device in hass.data[DOMAIN][config_entry.entry_id][VICARE_DEVICES]:
+        coordinator = vicare_device.coordinator
+        device = vicare_device.config
+        api = vicare_device.api
 
-        circuits = await hass.async_add_executor_job(get_circuits, api)
+        circuits = vicare_device.circuits
         for circuit in circuits:
             suffix = ""
             if len(circuits) > 1:
                 suffix = f" {circuit.id}"
-            entity = ViCareWater(f"{name} Water{suffix}", api, circuit, device)
+            entity = ViCareWater(
+                coordinator, f"{name} Water{suffix}", api, circuit, device
+            )
             entities.append(entity)
 
-    async_add_entities(entities)
+    return entities
 
 
-class ViCareWater(WaterHeaterEntity):
+class ViCareWater(ViCareEntity, WaterHeaterEntity):
     """Representation of the ViCare domestic hot water device."""
 
     _attr_precision = PRECISION_WHOLE
     _attr_supported_features = WaterHeaterEntityFeature.TARGET_TEMPERATURE
 
-    def __init__(self, name, api, circuit, device_config):
+    def __init__(self, coordinator, name, api, circuit, device_config):
         """Initialize the DHW water_heater device."""
-        self._name = name
-        self._state = None
+        super().__init__(coordinator)
+        self._attr_name = name
+        self._attr_unique_id = get_unique_id(api, coordinator.device_id, circuit.id)
         self._api = api
         self._circuit = circuit
         self._device_config = device_config
-        self._attributes = {}
-        self._target_temperature = None
-        self._current_temperature = None
-        self._current_mode = None
-        self._min_temp = None
-        self._max_temp = None
-        self.update()
-
-    def update(self) -> None:
-        """Let HA know there has been an update from the ViCare API."""
-        try:
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._current_temperature = (
-                    self._api.getDomesticHotWaterStorageTemperature()
-                )
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._target_temperature = (
-                    self._api.getDomesticHotWaterDesiredTemperature()
-                )
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._current_mode = self._circuit.getActiveMode()
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._min_temp = self._api.getDomesticHotWaterMinTemperature()
-            if not self._min_temp:
-                self._min_temp = VICARE_TEMP_WATER_MIN
-
-            with suppress(PyViCareNotSupportedFeatureError):
-                self._max_temp = self._api.getDomesticHotWaterMaxTemperature()
-            if not self._max_temp:
-                self._max_temp = VICARE_TEMP_WATER_MAX
-    
-        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
-            _LOGGER.error("Unable to retrieve data from ViCare server")
-        except PyViCareRateLimitError as limit_exception:
-            _LOGGER.error("Vicare API rate limit exceeded: %s", limit_exception)
-        except ValueError:
-            _LOGGER.error("Unable to decode data from ViCare server")
-        except PyViCareInvalidDataError as invalid_data_exception:
-            _LOGGER.error("Invalid data from Vicare server: %s", invalid_data_exception)
-
-    @property
-    def unique_id(self) -> str:
-        """Return unique ID for this device."""
-        return get_unique_id(self._api, self._device_config, self._circuit.id)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for this device."""
-        return DeviceInfo(
-            identifiers={
-                (
-                    DOMAIN,
-                    get_unique_device_id(self._device_config),
-                )
-            },
-            name=get_device_name(self._device_config),
-            manufacturer="Viessmann",
-            model=self._device_config.getModel(),
-            configuration_url="https://developer.viessmann.com/",
-        )
-
-    @property
-    def name(self):
-        """Return the name of the water_heater device."""
-        return self._name
+        self._dhw = coordinator.state.dhw
+        self._circuit_state = coordinator.state.circuit(circuit.id)
 
     @property
     def temperature_unit(self):
@@ -168,28 +105,39 @@ class ViCareWater(WaterHeaterEntity):
     @property
     def current_temperature(self):
         """Return the current temperature."""
-        return self._current_temperature
+        return self._dhw.storage_temperature
 
     @property
     def target_temperature(self):
         """Return the temperature we try to reach."""
-        return self._target_temperature
+        # Written values are shown until the server confirmed them
+        return self.coordinator.commands.pending_value(
+            DHW_TEMPERATURE_FEATURE, self._dhw.target_temperature
+        )
 
-    def set_temperature(self, **kwargs: Any) -> None:
+    async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperatures."""
         if (temp := kwargs.get(ATTR_TEMPERATURE)) is not None:
-            self._api.setDomesticHotWaterTemperature(temp)
-            self._target_temperature = temp
+            self.coordinator.service.validate_command(
+                DHW_TEMPERATURE_FEATURE,
+                "setTargetTemperature",
+                {"temperature": int(temp)},
+            )
+            await self.coordinator.commands.async_enqueue(
+                DHW_TEMPERATURE_FEATURE,
+                temp,
+                partial(self._api.setDomesticHotWaterTemperature, temp),
+            )
 
     @property
     def min_temp(self):
         """Return the minimum temperature."""
-        return self._min_temp
+        return self._dhw.min_temp or VICARE_TEMP_WATER_MIN
 
     @property
     def max_temp(self):
         """Return the maximum temperature."""
-        return self._max_temp
+        return self._dhw.max_temp or VICARE_TEMP_WATER_MAX
 
     @property
     def target_temperature_step(self) -> float:
@@ -199,7 +147,7 @@ class ViCareWater(WaterHeaterEntity):
     @property
     def current_operation(self):
         """Return current operation ie. heat, cool, idle."""
-        return VICARE_TO_HA_HVAC_DHW.get(self._current_mode)
+        return VICARE_TO_HA_HVAC_DHW.get(self._circuit_state.mode)
 
     @property
     def operation_list(self):
@@ -1,7 +1,8 @@
 """Fixtures for ViCare integration tests."""
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from datetime import timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -11,15 +12,19 @@ from PyViCare.PyViCareService import (
     buildSetPropertyUrl,
     readFeature,
 )
+from PyViCare.PyViCareUtils import PyViCareRateLimitError
 import pytest
 from syrupy.extensions.amber import AmberSnapshotExtension
 from syrupy.location import PyTestLocation
 
+from custom_components.vicare.const import API_CALLS_PER_DAY
 from homeassistant.components.vicare.const import DOMAIN
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 from homeassistant.util.json import json_loads_object
 
 from . import ENTRY_CONFIG, MODULE
+from .fake_api import FakeOAuthManager, FakeViCareApi
 
 from tests.common import MockConfigEntry, load_fixture
 
@@ -93,6 +98,7 @@ class ViCareServiceMock:
         self.accessor = ViCareDeviceAccessor(inst_id, serial, device_id)
         self.setPropertyData = []
         self.roles = roles
+        self.fetchCount = 0
         self.__cacheDuration = -1
 
     def getProperty(self, property_name: str):
@@ -120,9 +126,33 @@ class ViCareServiceMock:
 
     def fetch_all_features(self) -> str:
         """Return the full json dump."""
+        self.fetchCount += 1
         return self.__testData
 
 
+def rate_limit_error(reset_in: timedelta) -> PyViCareRateLimitError:
+    """Return a rate limit error as raised by PyViCare."""
+    return PyViCareRateLimitError(
+        {
+            "extendedPayload": {
+                "name": "ViCare day limit",
+                "requestCountLimit": API_CALLS_PER_DAY,
+                "limitReset": (dt_util.utcnow() + reset_in).timestamp() * 1000,
+            }
+        }
+    )
+
+
+async def async_setup_vicare(
+    hass: HomeAssistant, config_entry: MockConfigEntry, vicare_api: MockPyViCare
+) -> None:
+    """Set up the integration with the devices of a mocked ViCare API."""
+    with patch(f"{MODULE}.vicare_login", return_value=vicare_api):
+        config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+
 @pytest.fixture
 def mock_config_entry() -> MockConfigEntry:
     """Return the default mocked config entry."""
@@ -175,3 +205,36 @@ def mock_setup_entry() -> Generator[AsyncMock, None, None]:
     """Mock setting up a config entry."""
     with patch(f"{MODULE}.async_setup_entry", return_value=True) as mock_setup_entry:
         yield mock_setup_entry
+
+
+@pytest.fixture
+async def fake_vicare_api(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    socket_enabled: None,
+    request,
+) -> AsyncGenerator[FakeViCareApi, None]:
+    """Set up the integration against a local stand-in of the ViCare API.
+
+    Serves a gas boiler unless parametrized indirectly with other fixtures.
+    """
+    fake_api = FakeViCareApi(
+        getattr(request, "param", {"vicare/Vitodens300W.json": ["type:boiler"]})
+    )
+    await fake_api.start()
+
+    with patch(
+        "PyViCare.PyViCareAbstractOAuthManager.API_BASE_URL", fake_api.base_url
+    ), patch(f"{MODULE}.api.API_BASE_URL", fake_api.base_url), patch(
+        f"{MODULE}.ViCareLoginOAuthManager",
+        side_effect=lambda record_call, *args: FakeOAuthManager(fake_api),
+    ):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        yield fake_api
+
+        await hass.config_entries.async_unload(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    await fake_api.close()
@@ -0,0 +1,188 @@
+"""Local stand-in for the Viessmann IoT API serving the recorded fixtures."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import time
+from typing import Any
+
+from PyViCare.PyViCareAbstractOAuthManager import AbstractViCareOAuthManager
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from authlib.integrations.requests_client import OAuth2Session
+from authlib.oauth2.rfc6749 import OAuth2Token
+import requests
+
+from homeassistant.util.json import json_loads_object
+
+from tests.common import load_fixture
+
+CLIENT_ID = "5678"
+
+
+class FakeViCareApi:
+    """Serve installations, features and commands of fixture devices over HTTP.
+
+    Every request is counted by endpoint, together with the connections they
+    were sent on. Latency, rate limit responses and server errors can be
+    injected to exercise the transports of the integration end-to-end.
+    """
+
+    def __init__(self, fixtures: dict[str, list[str]]) -> None:
+        """Initialize the API with one device per fixture."""
+        self.devices = {
+            f"deviceId{idx}": (roles, json_loads_object(load_fixture(fixture)))
+            for idx, (fixture, roles) in enumerate(fixtures.items())
+        }
+        self.requests: Counter[str] = Counter()
+        self.connections: set[Any] = set()
+        self.commands: list[dict[str, Any]] = []
+        self.latency = 0.0
+        self.expires_in = 3600
+        self._errors: list[int] = []
+        self._tokens = 0
+        self._server: TestServer | None = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/iot/v1/equipment/installations", self._installations)
+        self.app.router.add_get(
+            "/iot/v1/features/installations/{installation}/gateways/{serial}"
+            "/devices/{device}/features/",
+            self._features,
+        )
+        self.app.router.add_post(
+            "/iot/v1/features/installations/{installation}/gateways/{serial}"
+            "/devices/{device}/features/{feature}/commands/{command}",
+            self._command,
+        )
+        self.app.router.add_post("/idp/v3/token", self._token)
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL the IoT API is served at."""
+        assert self._server is not None
+        return str(self._server.make_url("/iot/v1"))
+
+    @property
+    def token_url(self) -> str:
+        """Return the URL access tokens are issued at."""
+        assert self._server is not None
+        return str(self._server.make_url("/idp/v3/token"))
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        self._server = TestServer(self.app, host="127.0.0.1")
+        await self._server.start_server()
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            await self._server.close()
+
+    def fail_next(self, status: int, count: int = 1) -> None:
+        """Answer the next API requests with the given error status."""
+        self._errors.extend([status] * count)
+
+    def issue_token(self) -> OAuth2Token:
+        """Return a new access token."""
+        self._tokens += 1
+        return OAuth2Token(
+            {
+                "access_token": f"token{self._tokens}",
+                "token_type": "Bearer",
+                "expires_in": self.expires_in,
+            }
+        )
+
+    async def _respond(
+        self, request: web.Request, endpoint: str, body: dict[str, Any]
+    ) -> web.Response:
+        """Count the request and answer it, unless an error is injected."""
+        self.requests[endpoint] += 1
+        self.connections.add(request.transport)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if request.headers.get("Authorization") != f"Bearer token{self._tokens}":
+            return web.json_response({"error": "EXPIRED TOKEN"}, status=401)
+        if self._errors:
+            return self._error_response(self._errors.pop(0))
+        return web.json_response(body)
+
+    @staticmethod
+    def _error_response(status: int) -> web.Response:
+        """Return an error response as sent by the Viessmann API."""
+        body: dict[str, Any] = {
+            "viErrorId": "fake",
+            "statusCode": status,
+            "errorType": "INTERNAL_SERVER_ERROR",
+            "message": "Injected error",
+        }
+        if status == 429:
+            body["errorType"] = "RATE_LIMIT_EXCEEDED"
+            body["extendedPayload"] = {
+                "name": "ViCare day limit",
+                "requestCountLimit": 1450,
+                "limitReset": int((time.time() + 3600) * 1000),
+            }
+        return web.json_response(body, status=status)
+
+    async def _installations(self, request: web.Request) -> web.Response:
+        """List a gateway with all devices of the fixtures."""
+        devices = [
+            {
+                "id": device_id,
+                "deviceType": "heating",
+                "modelId": f"model{idx}",
+                "status": "online",
+                "roles": roles,
+            }
+            for idx, (device_id, (roles, _)) in enumerate(self.devices.items())
+        ]
+        return await self._respond(
+            request,
+            "installations",
+            {
+                "data": [
+                    {
+                        "id": "installationId0",
+                        "gateways": [{"serial": "serial0", "devices": devices}],
+                    }
+                ]
+            },
+        )
+
+    async def _features(self, request: web.Request) -> web.Response:
+        """Return all features of a device."""
+        _, features = self.devices[request.match_info["device"]]
+        return await self._respond(request, "features", features)
+
+    async def _command(self, request: web.Request) -> web.Response:
+        """Record a command sent to a feature."""
+        self.commands.append(
+            {
+                "device": request.match_info["device"],
+                "feature": request.match_info["feature"],
+                "command": request.match_info["command"],
+                "data": await request.json(),
+            }
+        )
+        return await self._respond(request, "commands", {"data": {"success": True}})
+
+    async def _token(self, request: web.Request) -> web.Response:
+        """Issue a new access token."""
+        self.requests["token"] += 1
+        return web.json_response(dict(self.issue_token()))
+
+
+class FakeOAuthManager(AbstractViCareOAuthManager):
+    """OAuth manager renewing its access token at the fake API."""
+
+    def __init__(self, api: FakeViCareApi) -> None:
+        """Initialize the manager with a valid access token."""
+        self._api = api
+        super().__init__(OAuth2Session(CLIENT_ID, token=api.issue_token()))
+
+    def renewToken(self) -> None:
+        """Fetch a new access token."""
+        token = requests.post(self._api.token_url, timeout=5).json()
+        self.replace_session(OAuth2Session(CLIENT_ID, token=token))
@@ -0,0 +1,140 @@
+"""Test the ViCare asyncio transport."""
+from unittest.mock import MagicMock, patch
+
+from PyViCare.PyViCareAbstractOAuthManager import API_BASE_URL
+from PyViCare.PyViCareUtils import PyViCareInternalServerError, PyViCareRateLimitError
+from authlib.oauth2.rfc6749 import OAuth2Token
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.vicare.api import ViCareApiClient
+from custom_components.vicare.budget import ViCareApiBudget
+from custom_components.vicare.const import API_CALLS_PER_DAY
+from homeassistant.core import HomeAssistant
+from homeassistant.util.json import json_loads_object
+
+from . import MODULE
+from .conftest import MockPyViCare, ViCareServiceMock
+
+from tests.common import MockConfigEntry, load_fixture
+
+FEATURES_URL = (
+    f"{API_BASE_URL}/features/installations/installationId{{idx}}"
+    "/gateways/serial{idx}/devices/deviceId{idx}/features/"
+)
+FIXTURES = {
+    "vicare/Vitodens300W.json": ["type:boiler"],
+    "vicare/zigbee_zk03839.json": ["type:climateSensor"],
+}
+
+
+def mock_oauth_manager(expires_in: int = 3600) -> MagicMock:
+    """Return an OAuth manager holding an access token."""
+    oauth_manager = MagicMock()
+    oauth_manager.oauth_session.token = OAuth2Token(
+        {"access_token": "token", "expires_in": expires_in}
+    )
+    return oauth_manager
+
+
+async def setup_with_token(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, expires_in: int
+) -> list[ViCareServiceMock]:
+    """Set up the integration with a PyViCare login holding an access token."""
+    vicare_api = MockPyViCare(FIXTURES)
+    vicare_api.oauth_manager = mock_oauth_manager(expires_in)
+    services = [device.service for device in vicare_api.devices]
+    with patch(f"{MODULE}.vicare_login", return_value=vicare_api):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    return services
+
+
+async def test_fetch_on_event_loop(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that devices are fetched through the shared aiohttp session."""
+    for idx, fixture in enumerate(FIXTURES):
+        aioclient_mock.get(
+            FEATURES_URL.format(idx=idx),
+            json=json_loads_object(load_fixture(fixture)),
+        )
+    services = await setup_with_token(hass, mock_config_entry, 3600)
+
+    assert aioclient_mock.call_count == 2
+    assert aioclient_mock.mock_calls[0][3] == {"Authorization": "Bearer token"}
+    assert [service.fetchCount for service in services] == [0, 0]
+    assert hass.states.get("sensor.vicare_outside_temperature").state == "20.8"
+
+
+async def test_expired_token_falls_back_to_pyvicare(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that PyViCare renews an expired token on its blocking transport."""
+    # expires within the leeway of authlib
+    services = await setup_with_token(hass, mock_config_entry, 30)
+
+    assert aioclient_mock.call_count == 0
+    assert [service.fetchCount for service in services] == [1, 1]
+
+
+async def test_command_from_worker_thread(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test that commands of PyViCare devices are sent on the event loop."""
+    client = ViCareApiClient(
+        hass,
+        mock_oauth_manager(),
+        ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1),
+    )
+    aioclient_mock.post(f"{API_BASE_URL}/command", json={"data": {"success": True}})
+
+    result = await hass.async_add_executor_job(
+        client.run_threadsafe, client.async_post("/command", '{"mode": "dhw"}')
+    )
+
+    assert result == {"data": {"success": True}}
+    assert aioclient_mock.mock_calls[0][2] == '{"mode": "dhw"}'
+
+
+@pytest.mark.parametrize(
+    ("response", "error"),
+    [
+        (
+            {
+                "statusCode": 429,
+                "extendedPayload": {
+                    "name": "ViCare day limit",
+                    "requestCountLimit": API_CALLS_PER_DAY,
+                    "limitReset": 1584462010106,
+                },
+            },
+            PyViCareRateLimitError,
+        ),
+        (
+            {"statusCode": 502, "message": "Bad Gateway", "viErrorId": "id"},
+            PyViCareInternalServerError,
+        ),
+    ],
+)
+async def test_error_responses(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    response: dict,
+    error: type[Exception],
+) -> None:
+    """Test that error responses raise the same errors as PyViCare."""
+    budget = ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1)
+    client = ViCareApiClient(hass, mock_oauth_manager(), budget)
+    aioclient_mock.get(f"{API_BASE_URL}/features", json=response)
+
+    with pytest.raises(error):
+        await client.async_get("/features")
+    assert budget.calls_in_window == 1
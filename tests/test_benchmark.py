@@ -0,0 +1,204 @@
+"""Benchmark entity creation, refreshes and diagnostics of large installations.
+
+Run with `pytest tests/test_benchmark.py`, pass `--benchmark-disable` to only
+check that the benchmarks still work.
+"""
+from copy import deepcopy
+import io
+from typing import Any
+from unittest.mock import patch
+
+from PyViCare.PyViCareDeviceConfig import PyViCareDeviceConfig
+import pytest
+
+from custom_components.vicare import (
+    binary_sensor,
+    button,
+    climate,
+    sensor,
+    switch,
+    water_heater,
+)
+from custom_components.vicare.const import VICARE_DEVICES
+from custom_components.vicare.diagnostics import (
+    dump_device_state,
+    write_device_states,
+)
+from homeassistant.components.vicare.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from . import MODULE
+from .conftest import MockPyViCare, ViCareServiceMock
+
+from tests.common import MockConfigEntry, mock_device_registry, mock_registry
+
+pytest.importorskip("pytest_benchmark")
+
+DEVICE_FIXTURES = (
+    ("vicare/Vitodens300W.json", ["type:boiler"]),
+    ("vicare/zigbee_zk03839.json", ["type:climateSensor"]),
+)
+PLATFORMS = (binary_sensor, button, climate, sensor, switch, water_heater)
+# Alternating boilers and climate sensors, 26 devices make 500 entities
+REGISTRATION_DEVICES = 26
+
+
+def _synthetic_installation(device_count: int) -> MockPyViCare:
+    """Return an installation alternating between the recorded devices."""
+    vicare_api = MockPyViCare({})
+    for idx in range(device_count):
+        fixture, roles = DEVICE_FIXTURES[idx % len(DEVICE_FIXTURES)]
+        vicare_api.devices.append(
+            PyViCareDeviceConfig(
+                ViCareServiceMock(
+                    fixture,
+                    f"installationId{idx}",
+                    f"serial{idx}",
+                    f"deviceId{idx}",
+                    roles,
+                ),
+                f"deviceId{idx}",
+                f"model{idx}",
+                f"online{idx}",
+            )
+        )
+    return vicare_api
+
+
+@pytest.fixture(params=[1, 10, 50], ids=lambda count: f"{count}_devices")
+async def installation(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, request
+) -> MockConfigEntry:
+    """Set up a synthetic installation with the given number of devices."""
+    with patch(
+        f"{MODULE}.vicare_login",
+        return_value=_synthetic_installation(request.param),
+    ):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    return mock_config_entry
+
+
+def _updated_payload(data: dict[str, Any]) -> dict[str, Any]:
+    """Return the payload with a new reading of a single feature."""
+    updated = deepcopy(data)
+    for feature in updated["data"]:
+        if feature["feature"] in (
+            "heating.sensors.temperature.outside",
+            "device.sensors.temperature",
+        ):
+            feature["properties"]["value"]["value"] += 0.5
+            feature["timestamp"] = "2021-08-25T15:00:00.000Z"
+    return updated
+
+
+@pytest.mark.parametrize(
+    "platform", PLATFORMS, ids=lambda module: module.__name__.rsplit(".", 1)[-1]
+)
+async def test_create_all_entities(
+    hass: HomeAssistant, installation: MockConfigEntry, benchmark, platform
+) -> None:
+    """Benchmark creating the entities of a platform."""
+    entities = benchmark(platform.create_all_entities, hass, installation)
+
+    assert entities is not None
+
+
+async def test_register_entities(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, benchmark
+) -> None:
+    """Benchmark registering the entities of a 500 entity installation.
+
+    Reads what the entity platform reads for every new entity: unique ID,
+    name and device info. Every round registers them in empty registries.
+    """
+    with patch(
+        f"{MODULE}.vicare_login",
+        return_value=_synthetic_installation(REGISTRATION_DEVICES),
+    ):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    entities = [
+        (platform.__name__.rsplit(".", 1)[-1], entity)
+        for platform in PLATFORMS
+        for entity in platform.create_all_entities(hass, mock_config_entry)
+    ]
+
+    def empty_registries() -> tuple[tuple[Any, ...], dict[str, Any]]:
+        return (mock_device_registry(hass), mock_registry(hass)), {}
+
+    def register(
+        device_registry: dr.DeviceRegistry, entity_registry: er.EntityRegistry
+    ) -> None:
+        for domain, entity in entities:
+            device = device_registry.async_get_or_create(
+                config_entry_id=mock_config_entry.entry_id, **entity.device_info
+            )
+            entity_registry.async_get_or_create(
+                domain,
+                DOMAIN,
+                entity.unique_id,
+                suggested_object_id=entity.name,
+                config_entry=mock_config_entry,
+                device_id=device.id,
+            )
+        assert len(entity_registry.entities) == len(entities)
+
+    benchmark.pedantic(register, setup=empty_registries, rounds=20)
+    await hass.async_block_till_done()
+
+    assert len(entities) >= 500
+
+
+async def test_refresh_cycle(
+    hass: HomeAssistant, installation: MockConfigEntry, benchmark
+) -> None:
+    """Benchmark serving a fetched payload to the entities of every device."""
+    coordinators = [
+        device.coordinator
+        for device in hass.data[DOMAIN][installation.entry_id][VICARE_DEVICES]
+    ]
+    payloads = [
+        (coordinator.data, _updated_payload(coordinator.data))
+        for coordinator in coordinators
+    ]
+    cycle = 0
+
+    def refresh() -> None:
+        nonlocal cycle
+        cycle += 1
+        for coordinator, payload in zip(coordinators, payloads):
+            data = payload[cycle % 2]
+            coordinator.service.update_features(data)
+            coordinator.async_set_updated_data(data)
+
+    benchmark(refresh)
+    await hass.async_block_till_done()
+
+
+async def test_diagnostics_dump(
+    hass: HomeAssistant, installation: MockConfigEntry, benchmark
+) -> None:
+    """Benchmark dumping the cached payloads of every device."""
+    dumps = benchmark(dump_device_state, hass, installation)
+
+    assert len(dumps) == len(hass.data[DOMAIN][installation.entry_id][VICARE_DEVICES])
+
+
+async def test_diagnostics_stream(
+    hass: HomeAssistant, installation: MockConfigEntry, benchmark
+) -> None:
+    """Benchmark streaming the cached payloads of every device."""
+    devices = [
+        (
+            device.coordinator.device_id,
+            device.coordinator.service.features["data"],
+            {},
+        )
+        for device in hass.data[DOMAIN][installation.entry_id][VICARE_DEVICES]
+    ]
+
+    benchmark(lambda: write_device_states(io.StringIO(), devices))
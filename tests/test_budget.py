@@ -0,0 +1,153 @@
+"""Test the ViCare API call budget."""
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from custom_components.vicare.budget import (
+    CALL_COMMAND,
+    CALL_FETCH,
+    CALL_LOGIN,
+    ViCareApiBudget,
+    async_record_pending_calls,
+)
+from custom_components.vicare.const import API_CALLS_PER_DAY, API_CALLS_PER_DAY_PREMIUM
+from homeassistant.components.vicare.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+@pytest.mark.parametrize(
+    ("daily_limit", "device_count", "expected"),
+    [
+        (API_CALLS_PER_DAY, 1, 64),
+        (API_CALLS_PER_DAY, 3, 192),
+        (API_CALLS_PER_DAY_PREMIUM, 1, 30),
+        (API_CALLS_PER_DAY_PREMIUM, 2, 59.58),
+    ],
+)
+async def test_nominal_scan_interval(
+    hass: HomeAssistant, daily_limit: int, device_count: int, expected: float
+) -> None:
+    """Test the scan interval of an idle account."""
+    budget = ViCareApiBudget(hass, "entry", daily_limit, device_count)
+
+    assert budget.scan_interval() == pytest.approx(expected, abs=0.01)
+
+
+async def test_commands_stretch_scan_interval(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that commands beyond the reserve stretch polling until they expire."""
+    budget = ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1)
+    for _ in range(100):
+        budget.record_call(CALL_COMMAND)
+    assert budget.scan_interval() == pytest.approx(64)
+
+    for _ in range(250):
+        budget.record_call(CALL_COMMAND)
+    assert budget.scan_interval() == pytest.approx(86400 / 1100)
+    assert budget.remaining == API_CALLS_PER_DAY - 350
+
+    freezer.tick(timedelta(hours=24))
+    assert budget.scan_interval() == pytest.approx(64)
+    assert budget.remaining == API_CALLS_PER_DAY
+
+
+async def test_exhausted_window(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that polling waits for calls to leave an exhausted window."""
+    budget = ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1)
+    budget.record_call(CALL_FETCH)
+    freezer.tick(timedelta(hours=1))
+    for _ in range(API_CALLS_PER_DAY - 100):
+        budget.record_call(CALL_FETCH)
+
+    assert budget.scan_interval() == pytest.approx(23 * 3600)
+
+
+async def test_device_calls(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that the calls of every device are counted in the window."""
+    budget = ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 2)
+    budget.record_call(CALL_FETCH, "device0")
+    budget.record_call(CALL_COMMAND, "device0")
+    budget.record_call(CALL_FETCH, "device1")
+    budget.record_call(CALL_FETCH)
+
+    assert budget.calls_in_window == 4
+    assert budget.device_calls_in_window("device0") == 2
+    assert budget.device_calls_in_window("device1") == 1
+
+    freezer.tick(timedelta(hours=24))
+    assert budget.device_calls_in_window("device0") == 0
+
+
+async def test_calls_persisted(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that spent calls are written to disk."""
+    budget = ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1)
+    budget.record_call(CALL_FETCH)
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+
+    calls = hass_storage[f"{DOMAIN}.entry.budget"]["data"]["calls"]
+    assert [kind for _, kind in calls] == [CALL_FETCH]
+
+
+async def test_calls_restored(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that calls spent before a restart count until they leave the window."""
+    now = dt_util.utcnow().timestamp()
+    hass_storage[f"{DOMAIN}.entry.budget"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.entry.budget",
+        "data": {
+            "calls": [
+                [now - 90000, CALL_FETCH],
+                [now - 60, CALL_COMMAND],
+                [now - 30, CALL_FETCH, "device0"],
+            ]
+        },
+    }
+    budget = ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1)
+    await budget.async_load()
+
+    assert budget.calls_in_window == 2
+    assert budget.device_calls_in_window("device0") == 1
+
+
+async def test_pending_calls_loaded(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that calls of the config flow count for the budget loaded next."""
+    now = dt_util.utcnow().timestamp()
+    hass_storage[f"{DOMAIN}.entry.budget"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.entry.budget",
+        "data": {"calls": [[now - 30, CALL_FETCH, "device0"]]},
+    }
+    async_record_pending_calls(hass, [(now - 60, CALL_LOGIN)])
+
+    budget = ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1)
+    await budget.async_load()
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+
+    assert budget.calls_in_window == 2
+    calls = hass_storage[f"{DOMAIN}.entry.budget"]["data"]["calls"]
+    assert [call[1] for call in calls] == [CALL_LOGIN, CALL_FETCH]
+
+    # Only the next budget gets them
+    other = ViCareApiBudget(hass, "other", API_CALLS_PER_DAY, 1)
+    await other.async_load()
+    assert other.calls_in_window == 0
@@ -0,0 +1,396 @@
+"""Test coalescing and write-through of ViCare commands."""
+from copy import deepcopy
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from PyViCare.PyViCareUtils import PyViCareCommandError
+import pytest
+import voluptuous as vol
+
+from custom_components.vicare.const import COMMAND_DEBOUNCE_DELAY, VICARE_DEVICES
+from homeassistant.components.climate import (
+    ATTR_PRESET_MODE,
+    DOMAIN as CLIMATE_DOMAIN,
+    PRESET_COMFORT,
+    PRESET_ECO,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_PRESET_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.components.vicare.const import DOMAIN
+from homeassistant.components.water_heater import DOMAIN as WATER_HEATER_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+def _sent_commands(hass: HomeAssistant, entry_id: str) -> list[dict]:
+    """Return the commands the mocked device received."""
+    device = hass.data[DOMAIN][entry_id][VICARE_DEVICES][0]
+    return device.config.service._service.setPropertyData
+
+
+async def _refresh(
+    hass: HomeAssistant, entry_id: str, updated: str | None = None
+) -> None:
+    """Fetch the payload again, with a feature updated by the server."""
+    device = hass.data[DOMAIN][entry_id][VICARE_DEVICES][0]
+    data: dict[str, Any] = deepcopy(device.coordinator.data)
+    for feature in data["data"]:
+        if feature["feature"] == updated:
+            feature["timestamp"] = (dt_util.utcnow() + timedelta(seconds=1)).isoformat()
+    with patch.object(
+        device.config.service._service, "fetch_all_features", return_value=data
+    ):
+        await device.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+
+async def _activate_normal_program(hass: HomeAssistant, entry_id: str) -> None:
+    """Serve a payload with the normal program active on all circuits."""
+    device = hass.data[DOMAIN][entry_id][VICARE_DEVICES][0]
+    data: dict[str, Any] = deepcopy(device.coordinator.data)
+    for feature in data["data"]:
+        if feature["feature"] in (
+            "heating.circuits.0.operating.programs.active",
+            "heating.circuits.1.operating.programs.active",
+        ):
+            feature["properties"]["value"]["value"] = "normal"
+    device.coordinator.service.update_features(data)
+    device.coordinator.async_set_updated_data(data)
+    await hass.async_block_till_done()
+
+
+async def _send_pending(hass: HomeAssistant) -> None:
+    """Let the debounce delay of pending commands pass."""
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=COMMAND_DEBOUNCE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+
+
+async def test_set_temperature_coalesced(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test that only the last of rapid temperature changes is sent."""
+    await _activate_normal_program(hass, mock_vicare_gas_boiler.entry_id)
+    for temperature in (20, 21, 22):
+        await hass.services.async_call(
+            CLIMATE_DOMAIN,
+            SERVICE_SET_TEMPERATURE,
+            {ATTR_ENTITY_ID: "climate.vicare_heating_0", ATTR_TEMPERATURE: temperature},
+            blocking=True,
+        )
+
+    commands = _sent_commands(hass, mock_vicare_gas_boiler.entry_id)
+    assert commands == []
+    # The pending value is shown until it was sent
+    state = hass.states.get("climate.vicare_heating_0")
+    assert state.attributes[ATTR_TEMPERATURE] == 22
+
+    await _send_pending(hass)
+
+    assert [command["data"] for command in commands] == [{"targetTemperature": 22}]
+    assert (
+        commands[0]["property_name"] == "heating.circuits.0.operating.programs.normal"
+    )
+
+
+async def test_targets_sent_separately(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test that writes to different circuits and settings are not merged."""
+    await _activate_normal_program(hass, mock_vicare_gas_boiler.entry_id)
+    for entity_id in ("climate.vicare_heating_0", "climate.vicare_heating_1"):
+        await hass.services.async_call(
+            CLIMATE_DOMAIN,
+            SERVICE_SET_TEMPERATURE,
+            {ATTR_ENTITY_ID: entity_id, ATTR_TEMPERATURE: 20},
+            blocking=True,
+        )
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: "climate.vicare_heating_0", "hvac_mode": HVACMode.AUTO},
+        blocking=True,
+    )
+    assert hass.states.get("climate.vicare_heating_0").state == HVACMode.AUTO
+
+    await _send_pending(hass)
+
+    assert sorted(
+        command["property_name"]
+        for command in _sent_commands(hass, mock_vicare_gas_boiler.entry_id)
+    ) == [
+        "heating.circuits.0.operating.modes.active",
+        "heating.circuits.0.operating.programs.normal",
+        "heating.circuits.1.operating.programs.normal",
+    ]
+
+
+async def test_water_heater_coalesced(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test that the water heaters of all circuits share the hot water setting."""
+    for entity_id, temperature in (
+        ("water_heater.vicare_water_0", 45),
+        ("water_heater.vicare_water_1", 50),
+    ):
+        await hass.services.async_call(
+            WATER_HEATER_DOMAIN,
+            SERVICE_SET_TEMPERATURE,
+            {ATTR_ENTITY_ID: entity_id, ATTR_TEMPERATURE: temperature},
+            blocking=True,
+        )
+
+    await _send_pending(hass)
+
+    assert [
+        command["data"]
+        for command in _sent_commands(hass, mock_vicare_gas_boiler.entry_id)
+    ] == [{"temperature": 50}]
+
+
+async def test_preset_shown_until_confirmed(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test that a preset survives stale payloads until the server updated it."""
+    entry_id = mock_vicare_gas_boiler.entry_id
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_PRESET_MODE,
+        {ATTR_ENTITY_ID: "climate.vicare_heating_0", ATTR_PRESET_MODE: PRESET_COMFORT},
+        blocking=True,
+    )
+
+    assert [
+        (command["property_name"], command["action"])
+        for command in _sent_commands(hass, entry_id)
+    ] == [("heating.circuits.0.operating.programs.comfort", "activate")]
+    state = hass.states.get("climate.vicare_heating_0")
+    assert state.attributes[ATTR_PRESET_MODE] == PRESET_COMFORT
+
+    await _refresh(hass, entry_id)
+    state = hass.states.get("climate.vicare_heating_0")
+    assert state.attributes[ATTR_PRESET_MODE] == PRESET_COMFORT
+
+    # The fixture keeps reporting standby once the program was updated
+    await _refresh(hass, entry_id, "heating.circuits.0.operating.programs.active")
+    state = hass.states.get("climate.vicare_heating_0")
+    assert state.attributes[ATTR_PRESET_MODE] is None
+    assert state.attributes["active_vicare_program"] == "standby"
+
+
+async def test_switch_shown_until_confirmed(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test that a toggled switch needs no extra poll to be confirmed."""
+    entry_id = mock_vicare_gas_boiler.entry_id
+    entity_id = "switch.activate_one_time_charge"
+    device = hass.data[DOMAIN][entry_id][VICARE_DEVICES][0]
+    fetches = device.config.service._service.fetchCount
+
+    await hass.services.async_call(
+        SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+    assert device.config.service._service.fetchCount == fetches
+    assert hass.states.get(entity_id).state == STATE_ON
+
+    await _refresh(hass, entry_id)
+    assert hass.states.get(entity_id).state == STATE_ON
+
+    await _refresh(hass, entry_id, "heating.dhw.oneTimeCharge")
+    assert hass.states.get(entity_id).state == STATE_OFF
+
+
+async def test_failed_write_dropped(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test that a rejected write shows the last fetched value again."""
+    device = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][0]
+    with patch.object(
+        device.config.service._service,
+        "setProperty",
+        side_effect=PyViCareCommandError("rejected"),
+    ), pytest.raises(PyViCareCommandError):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_heating_curve",
+            {ATTR_ENTITY_ID: "climate.vicare_heating_0", "shift": 5, "slope": 1.0},
+            blocking=True,
+        )
+
+    state = hass.states.get("climate.vicare_heating_0")
+    assert state.attributes["heating_curve_shift"] == 9
+    assert state.attributes["heating_curve_slope"] == 1.4
+    assert not device.coordinator.commands.is_pending(
+        "heating.circuits.0.heating.curve"
+    )
+
+
+async def test_apply_circuit_settings(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test that several settings are sent together with a single refresh."""
+    device = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][0]
+    fetches = device.config.service._service.fetchCount
+
+    await hass.services.async_call(
+        DOMAIN,
+        "apply_circuit_settings",
+        {
+            ATTR_ENTITY_ID: "climate.vicare_heating_0",
+            "vicare_mode": "dhwAndHeating",
+            "program_temperatures": {"normal": 21, "reduced": 17},
+            "shift": 5,
+            "slope": 1.0,
+            "dhw_temperature": 50,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert sorted(
+        (command["property_name"], command["data"])
+        for command in _sent_commands(hass, mock_vicare_gas_boiler.entry_id)
+    ) == [
+        ("heating.circuits.0.heating.curve", {"shift": 5, "slope": 1.0}),
+        ("heating.circuits.0.operating.modes.active", {"mode": "dhwAndHeating"}),
+        (
+            "heating.circuits.0.operating.programs.normal",
+            {"targetTemperature": 21.0},
+        ),
+        (
+            "heating.circuits.0.operating.programs.reduced",
+            {"targetTemperature": 17.0},
+        ),
+        ("heating.dhw.temperature.main", {"temperature": 50}),
+    ]
+    assert device.config.service._service.fetchCount == fetches + 1
+
+    state = hass.states.get("climate.vicare_heating_0")
+    assert state.state == HVACMode.AUTO
+    assert state.attributes["heating_curve_shift"] == 5
+    assert state.attributes["heating_curve_slope"] == 1.0
+    assert (
+        hass.states.get("water_heater.vicare_water_0").attributes[ATTR_TEMPERATURE]
+        == 50
+    )
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"vicare_mode": "heating"},
+        {"program_temperatures": {"reduced": 2}},
+        {"program_temperatures": {"eco": 20}},
+        {"shift": 41, "slope": 1.0},
+        {"dhw_temperature": 70},
+    ],
+)
+async def test_apply_circuit_settings_invalid(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock, settings: dict[str, Any]
+) -> None:
+    """Test that settings the device does not accept are rejected locally."""
+    with pytest.raises(ValueError):
+        await hass.services.async_call(
+            DOMAIN,
+            "apply_circuit_settings",
+            {
+                ATTR_ENTITY_ID: "climate.vicare_heating_0",
+                "dhw_temperature": 50,
+                **settings,
+            },
+            blocking=True,
+        )
+
+    assert _sent_commands(hass, mock_vicare_gas_boiler.entry_id) == []
+
+
+async def test_apply_circuit_settings_empty(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test that a call without settings spends no API call."""
+    coordinator = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+    with patch.object(coordinator, "async_request_refresh") as mock_refresh:
+        with pytest.raises(vol.Invalid):
+            await hass.services.async_call(
+                DOMAIN,
+                "apply_circuit_settings",
+                {ATTR_ENTITY_ID: "climate.vicare_heating_0"},
+                blocking=True,
+            )
+        await hass.services.async_call(
+            DOMAIN,
+            "apply_circuit_settings",
+            {ATTR_ENTITY_ID: "climate.vicare_heating_0", "program_temperatures": {}},
+            blocking=True,
+        )
+
+    mock_refresh.assert_not_called()
+    assert _sent_commands(hass, mock_vicare_gas_boiler.entry_id) == []
+
+
+@pytest.mark.parametrize(
+    ("domain", "service", "data"),
+    [
+        # Stepping of the normal program temperature is 1
+        (
+            CLIMATE_DOMAIN,
+            SERVICE_SET_TEMPERATURE,
+            {ATTR_ENTITY_ID: "climate.vicare_heating_0", ATTR_TEMPERATURE: 21.5},
+        ),
+        (
+            CLIMATE_DOMAIN,
+            SERVICE_SET_PRESET_MODE,
+            {ATTR_ENTITY_ID: "climate.vicare_heating_0", ATTR_PRESET_MODE: PRESET_ECO},
+        ),
+        (
+            DOMAIN,
+            "set_vicare_mode",
+            {ATTR_ENTITY_ID: "climate.vicare_heating_0", "vicare_mode": "heating"},
+        ),
+        (
+            WATER_HEATER_DOMAIN,
+            SERVICE_SET_TEMPERATURE,
+            {ATTR_ENTITY_ID: "water_heater.vicare_water_0", ATTR_TEMPERATURE: 65},
+        ),
+        # Deactivating is not executable while no charge is running
+        (
+            SWITCH_DOMAIN,
+            SERVICE_TURN_OFF,
+            {ATTR_ENTITY_ID: "switch.activate_one_time_charge"},
+        ),
+    ],
+)
+async def test_invalid_write_rejected_locally(
+    hass: HomeAssistant,
+    mock_vicare_gas_boiler: MagicMock,
+    domain: str,
+    service: str,
+    data: dict[str, Any],
+) -> None:
+    """Test that writes violating the command constraints are never sent."""
+    await _activate_normal_program(hass, mock_vicare_gas_boiler.entry_id)
+
+    with pytest.raises(ValueError):
+        await hass.services.async_call(domain, service, data, blocking=True)
+    await _send_pending(hass)
+
+    assert _sent_commands(hass, mock_vicare_gas_boiler.entry_id) == []
@@ -5,6 +5,11 @@ from PyViCare.PyViCareUtils import PyViCareInvalidCredentialsError
 import pytest
 from syrupy.assertion import SnapshotAssertion
 
+from custom_components.vicare.budget import (
+    CALL_INSTALLATIONS,
+    CALL_LOGIN,
+    DATA_PENDING_CALLS,
+)
 from homeassistant.components import dhcp
 from homeassistant.components.vicare.const import DOMAIN
 from homeassistant.config_entries import SOURCE_DHCP, SOURCE_USER
@@ -135,3 +140,28 @@ async def test_user_input_single_instance_allowed(hass: HomeAssistant) -> None:
     )
     assert result["type"] == FlowResultType.ABORT
     assert result["reason"] == "single_instance_allowed"
+
+
+async def test_user_login_calls_recorded(hass: HomeAssistant) -> None:
+    """Test that the requests of a login are kept for the budget of the entry."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+
+    def vicare_login(hass, entry_data, record_call):
+        record_call(CALL_LOGIN)
+        record_call(CALL_INSTALLATIONS)
+        raise PyViCareInvalidCredentialsError
+
+    with patch(f"{MODULE}.config_flow.vicare_login", side_effect=vicare_login):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            VALID_CONFIG,
+        )
+        await hass.async_block_till_done()
+
+    assert result["errors"] == {"base": "invalid_auth"}
+    assert [kind for _, kind in hass.data[DATA_PENDING_CALLS]] == [
+        CALL_LOGIN,
+        CALL_INSTALLATIONS,
+    ]
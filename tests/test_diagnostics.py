@@ -1,4 +1,24 @@
 """Test ViCare diagnostics."""
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.vicare.diagnostics import (
+    DIAGNOSTICS_FILENAME,
+    SERVICE_WRITE_DIAGNOSTICS,
+    async_get_config_entry_diagnostics,
+    redact_serials,
+)
+from homeassistant.components.vicare.const import DOMAIN
+from homeassistant.core import HomeAssistant
+
+from . import MODULE
+from .conftest import MockPyViCare
+
+from tests.common import MockConfigEntry, load_fixture
+
 #
 # TODO: enable once get_diagnostics_for_config_entry is available in
 # https://github.com/MatthewFlamm/pytest-homeassistant-custom-component
@@ -26,3 +46,89 @@
 #    )
 #
 #    assert diag == snapshot
+
+
+async def test_write_diagnostics(
+    hass: HomeAssistant, tmp_path: Path, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test writing the cached payloads to a file."""
+    hass.config.config_dir = str(tmp_path)
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_WRITE_DIAGNOSTICS,
+        {"include_timings": True, "include_cache_stats": True},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {"path": str(tmp_path / DIAGNOSTICS_FILENAME), "devices": 1}
+    dump = json.loads((tmp_path / DIAGNOSTICS_FILENAME).read_text())
+    fixture = json.loads(load_fixture("vicare/Vitodens300W.json"))
+    device = dump["installationId0-serial0-deviceId0"]
+    assert device["data"] == fixture["data"]
+    assert device["timings"]["last_fetch_duration"] >= 0
+    assert device["cache"]["features"] == len(fixture["data"])
+
+
+async def test_write_diagnostics_without_stats(
+    hass: HomeAssistant, tmp_path: Path, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test that timings and cache statistics are opt-in."""
+    hass.config.config_dir = str(tmp_path)
+    await hass.services.async_call(DOMAIN, SERVICE_WRITE_DIAGNOSTICS, blocking=True)
+
+    dump = json.loads((tmp_path / DIAGNOSTICS_FILENAME).read_text())
+    assert list(dump["installationId0-serial0-deviceId0"]) == ["data"]
+
+
+def test_redact_serials() -> None:
+    """Test that serial numbers and ids are masked."""
+    assert (
+        redact_serials('{"gatewayId": "7571381573112225", "uri": "/123456/x"}')
+        == '{"gatewayId": "################", "uri": "/######/x"}'
+    )
+
+
+async def test_diagnostics_served_from_cache(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that diagnostics return the cached payload without an API call."""
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    service = vicare_api.devices[0].service
+    with patch(f"{MODULE}.vicare_login", return_value=vicare_api):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    # Stay below the scan interval, a poll would replace the cached payload
+    freezer.tick(30)
+
+    diag = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert service.fetchCount == 1
+    device = diag["data"]["installationId0-serial0-deviceId0"]
+    fixture = json.loads(load_fixture("vicare/Vitodens300W.json"))
+    assert device["data"] == fixture["data"]
+    assert device["age"] == 30
+
+
+async def test_write_diagnostics_refresh(
+    hass: HomeAssistant, tmp_path: Path, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that the service only fetches the devices when asked to."""
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    service = vicare_api.devices[0].service
+    with patch(f"{MODULE}.vicare_login", return_value=vicare_api):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    hass.config.config_dir = str(tmp_path)
+
+    await hass.services.async_call(DOMAIN, SERVICE_WRITE_DIAGNOSTICS, blocking=True)
+    assert service.fetchCount == 1
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_WRITE_DIAGNOSTICS, {"refresh": True}, blocking=True
+    )
+    assert service.fetchCount == 2
@@ -0,0 +1,256 @@
+"""Test the ViCare integration against a local stand-in of the ViCare API."""
+from datetime import timedelta
+import time
+from unittest.mock import patch
+
+from PyViCare.PyViCareAbstractOAuthManager import AbstractViCareOAuthManager
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from custom_components.vicare.api import ViCareApiClient
+from custom_components.vicare.const import VICARE_API, VICARE_DEVICES
+from homeassistant.components.button import DOMAIN as BUTTON_DOMAIN, SERVICE_PRESS
+from homeassistant.components.climate import (
+    ATTR_PRESET_MODE,
+    DOMAIN as CLIMATE_DOMAIN,
+    PRESET_COMFORT,
+    SERVICE_SET_PRESET_MODE,
+)
+from homeassistant.components.vicare.const import DOMAIN
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from .fake_api import FakeViCareApi
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+
+TWO_DEVICES = {
+    "vicare/Vitodens300W.json": ["type:boiler"],
+    "vicare/zigbee_zk03839.json": ["type:climateSensor"],
+}
+
+
+async def _poll(
+    hass: HomeAssistant, entry: MockConfigEntry, freezer: FrozenDateTimeFactory
+) -> None:
+    """Advance the time until every device was polled once."""
+    coordinator = hass.data[DOMAIN][entry.entry_id][VICARE_DEVICES][0].coordinator
+    freezer.tick(coordinator.update_interval + timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize("fake_vicare_api", [TWO_DEVICES], indirect=True)
+async def test_calls_per_polling_cycle(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that every device costs one request per polling cycle."""
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert fake_vicare_api.requests == {"installations": 1, "features": 2}
+    assert hass.states.get("sensor.vicare_outside_temperature").state == "20.8"
+
+    for cycle in range(1, 4):
+        await _poll(hass, mock_config_entry, freezer)
+        assert fake_vicare_api.requests["features"] == 2 + 2 * cycle
+
+
+async def test_connection_reused(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+) -> None:
+    """Test that consecutive fetches share a connection of the aiohttp session."""
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+    await coordinator.async_refresh()
+    connections = len(fake_vicare_api.connections)
+
+    for _ in range(3):
+        await coordinator.async_refresh()
+
+    assert fake_vicare_api.requests["features"] == 5
+    assert len(fake_vicare_api.connections) == connections
+
+
+async def test_rate_limit_suspends_polling(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that no requests are sent until the rate limit resets."""
+    fake_vicare_api.fail_next(429)
+    await _poll(hass, mock_config_entry, freezer)
+    assert fake_vicare_api.requests["features"] == 2
+
+    for _ in range(5):
+        freezer.tick(timedelta(minutes=10))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    assert fake_vicare_api.requests["features"] == 2
+    # The last known state is served meanwhile
+    assert hass.states.get("sensor.vicare_outside_temperature").state == "20.8"
+
+    freezer.tick(timedelta(minutes=11))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert fake_vicare_api.requests["features"] == 3
+
+
+async def test_server_error_backs_off(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that server errors back off and keep the last known state."""
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+    fake_vicare_api.fail_next(500, 2)
+    await _poll(hass, mock_config_entry, freezer)
+
+    assert fake_vicare_api.requests["features"] == 2
+    assert coordinator.backoff.consecutive_failures == 1
+    assert coordinator.engine.resume_in == 0
+    assert hass.states.get("sensor.vicare_outside_temperature").state == "20.8"
+
+
+async def test_latency(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+) -> None:
+    """Test that slow responses are waited for."""
+    fake_vicare_api.latency = 0.2
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+
+    await coordinator.async_refresh()
+
+    assert fake_vicare_api.requests["features"] == 2
+    assert coordinator.last_update_success
+    assert coordinator.last_fetch_duration >= 0.2
+
+
+async def test_token_renewed(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that an expired token is renewed once and used by both transports."""
+    oauth_manager = hass.data[DOMAIN][mock_config_entry.entry_id][
+        VICARE_API
+    ].oauth_manager
+    oauth_manager.oauth_session.token["expires_at"] = int(time.time()) - 1
+
+    await _poll(hass, mock_config_entry, freezer)
+    await _poll(hass, mock_config_entry, freezer)
+
+    assert fake_vicare_api.requests["token"] == 1
+    assert fake_vicare_api.requests["features"] == 3
+    assert hass.states.get("sensor.vicare_outside_temperature").state == "20.8"
+
+
+async def test_command(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+) -> None:
+    """Test that a command costs a single request."""
+    await hass.services.async_call(
+        BUTTON_DOMAIN,
+        SERVICE_PRESS,
+        {ATTR_ENTITY_ID: "button.activate_one_time_charge"},
+        blocking=True,
+    )
+
+    assert fake_vicare_api.requests["commands"] == 1
+    assert fake_vicare_api.commands == [
+        {
+            "device": "deviceId0",
+            "feature": "heating.dhw.oneTimeCharge",
+            "command": "activate",
+            "data": {},
+        }
+    ]
+
+
+async def test_command_sent_from_event_loop(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+) -> None:
+    """Test that commands are posted by the aiohttp session, not by PyViCare."""
+    with patch.object(
+        AbstractViCareOAuthManager, "post", side_effect=AssertionError
+    ), patch.object(ViCareApiClient, "run_threadsafe", side_effect=AssertionError):
+        await hass.services.async_call(
+            CLIMATE_DOMAIN,
+            SERVICE_SET_PRESET_MODE,
+            {
+                ATTR_ENTITY_ID: "climate.vicare_heating_0",
+                ATTR_PRESET_MODE: PRESET_COMFORT,
+            },
+            blocking=True,
+        )
+
+    assert [command["command"] for command in fake_vicare_api.commands] == ["activate"]
+
+
+async def test_command_with_expired_token(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+) -> None:
+    """Test that PyViCare sends a command once the token expired."""
+    oauth_manager = hass.data[DOMAIN][mock_config_entry.entry_id][
+        VICARE_API
+    ].oauth_manager
+    oauth_manager.oauth_session.token["expires_at"] = int(time.time()) - 1
+
+    await hass.services.async_call(
+        BUTTON_DOMAIN,
+        SERVICE_PRESS,
+        {ATTR_ENTITY_ID: "button.activate_one_time_charge"},
+        blocking=True,
+    )
+
+    assert fake_vicare_api.requests["token"] == 1
+    assert fake_vicare_api.requests["commands"] == 1
+
+
+@pytest.mark.parametrize("fake_vicare_api", [TWO_DEVICES], indirect=True)
+async def test_every_request_recorded(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_vicare_api: FakeViCareApi,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that the budget counts every request sent to the API."""
+    budget = hass.data[DOMAIN][mock_config_entry.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator.engine.budget
+    assert budget.calls_in_window == 3
+
+    await _poll(hass, mock_config_entry, freezer)
+    await hass.services.async_call(
+        BUTTON_DOMAIN,
+        SERVICE_PRESS,
+        {ATTR_ENTITY_ID: "button.activate_one_time_charge"},
+        blocking=True,
+    )
+
+    assert fake_vicare_api.requests == {
+        "installations": 1,
+        "features": 4,
+        "commands": 1,
+    }
+    assert budget.calls_in_window == 6
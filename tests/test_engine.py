@@ -0,0 +1,219 @@
+"""Test the ViCare fetch engine."""
+from collections.abc import Callable
+from datetime import timedelta
+from functools import partial
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from PyViCare.PyViCareUtils import PyViCareInternalServerError, PyViCareRateLimitError
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from custom_components.vicare.budget import ViCareApiBudget
+from custom_components.vicare.const import (
+    API_CALLS_PER_DAY,
+    BACKOFF_INITIAL_DELAY,
+    BACKOFF_MAX_DELAY,
+    CONF_PARALLEL_FETCHES,
+)
+from custom_components.vicare.engine import (
+    ViCareFetchBackoff,
+    ViCareFetchEngine,
+    ViCareFetchSuspendedError,
+)
+from homeassistant.components.vicare.const import DOMAIN
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import ENTRY_CONFIG, MODULE
+from .conftest import MockPyViCare, rate_limit_error
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+
+
+async def test_rate_limit_suspends_polling(hass: HomeAssistant) -> None:
+    """Test that a rate limit error suspends polling until the limit resets."""
+    engine = ViCareFetchEngine(
+        hass, ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1)
+    )
+    service = MagicMock(client=None)
+    service.fetch_all_features.side_effect = rate_limit_error(timedelta(hours=2))
+    backoff = ViCareFetchBackoff()
+
+    with pytest.raises(PyViCareRateLimitError):
+        await engine.async_fetch(service, backoff)
+    with pytest.raises(ViCareFetchSuspendedError):
+        await engine.async_fetch(MagicMock(client=None), ViCareFetchBackoff())
+
+    assert service.fetch_all_features.call_count == 1
+    assert backoff.consecutive_failures == 1
+    assert engine.scan_interval() == pytest.approx(7200, abs=1)
+
+
+async def test_rate_limit_without_reset_counted_once(hass: HomeAssistant) -> None:
+    """Test that a rate limit error without reset time backs off once."""
+    engine = ViCareFetchEngine(
+        hass, ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1)
+    )
+    error = rate_limit_error(timedelta(hours=2))
+    del error.limitResetDate
+    service = MagicMock(client=None)
+    service.fetch_all_features.side_effect = error
+    backoff = ViCareFetchBackoff()
+
+    with pytest.raises(PyViCareRateLimitError):
+        await engine.async_fetch(service, backoff)
+
+    assert backoff.consecutive_failures == 1
+    assert BACKOFF_INITIAL_DELAY / 2 <= engine.resume_in <= BACKOFF_INITIAL_DELAY
+
+
+async def test_server_errors_back_off(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that repeated server errors back off exponentially with jitter."""
+    engine = ViCareFetchEngine(
+        hass, ViCareApiBudget(hass, "entry", API_CALLS_PER_DAY, 1)
+    )
+    service = MagicMock(client=None)
+    service.fetch_all_features.side_effect = PyViCareInternalServerError(
+        {"statusCode": 502, "message": "Bad Gateway", "viErrorId": "id"}
+    )
+
+    backoff = ViCareFetchBackoff()
+
+    for failures in range(1, 10):
+        with pytest.raises(PyViCareInternalServerError):
+            await engine.async_fetch(service, backoff)
+        delay = min(BACKOFF_INITIAL_DELAY * 2 ** (failures - 1), BACKOFF_MAX_DELAY)
+        assert backoff.consecutive_failures == failures
+        assert delay / 2 <= backoff.resume_in <= delay
+        assert engine.scan_interval(backoff) >= backoff.resume_in
+        # Other devices of the account keep polling
+        assert engine.resume_in == 0
+        freezer.tick(timedelta(seconds=backoff.resume_in))
+
+    service.fetch_all_features.side_effect = None
+    service.fetch_all_features.return_value = {"data": []}
+    assert await engine.async_fetch(service, backoff) == {"data": []}
+    assert backoff.consecutive_failures == 0
+
+
+async def test_cached_state_served_while_suspended(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that all devices keep their state while the account is suspended."""
+    vicare_api = MockPyViCare(
+        {
+            "vicare/Vitodens300W.json": ["type:boiler"],
+            "vicare/zigbee_zk03839.json": ["type:climateSensor"],
+        }
+    )
+    services = [device.service for device in vicare_api.devices]
+    with patch(f"{MODULE}.vicare_login", return_value=vicare_api):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    state = hass.states.get("sensor.vicare_outside_temperature").state
+
+    with patch.object(
+        services[0],
+        "fetch_all_features",
+        side_effect=rate_limit_error(timedelta(hours=1)),
+    ) as mock_fetch:
+        freezer.tick(timedelta(minutes=5))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        # a fetch of the other device may have been in flight already
+        fetch_count = services[1].fetchCount
+        for _ in range(6):
+            freezer.tick(timedelta(minutes=5))
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done()
+
+    assert mock_fetch.call_count == 1
+    assert services[1].fetchCount == fetch_count
+    assert (
+        hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"]["data"]["resume_at"]
+        == (dt_util.utcnow() + timedelta(minutes=25)).isoformat()
+    )
+    assert hass.states.get("sensor.vicare_outside_temperature").state == state
+
+    freezer.tick(timedelta(minutes=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert services[0].fetchCount == 2
+    assert services[1].fetchCount == fetch_count + 1
+
+
+async def test_suspension_restored(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that a retried setup stays suspended until the rate limit resets."""
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 2,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            "devices": {},
+            "resume_at": (dt_util.utcnow() + timedelta(hours=1)).isoformat(),
+        },
+    }
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    service = vicare_api.devices[0].service
+    with patch(f"{MODULE}.vicare_login", return_value=vicare_api):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+    assert service.fetchCount == 0
+
+
+@pytest.mark.parametrize(("parallel_fetches", "expected"), [(1, 1), (4, 2)])
+async def test_parallel_first_refresh(
+    hass: HomeAssistant, parallel_fetches: int, expected: int
+) -> None:
+    """Test that devices are fetched in parallel up to the configured limit."""
+    vicare_api = MockPyViCare(
+        {
+            "vicare/Vitodens300W.json": ["type:boiler"],
+            "vicare/zigbee_zk03839.json": ["type:climateSensor"],
+        }
+    )
+    lock = threading.Lock()
+    running = []
+    concurrency = []
+
+    def slow_fetch(fetch: Callable[[], dict]) -> dict:
+        with lock:
+            running.append(fetch)
+            concurrency.append(len(running))
+        time.sleep(0.1)
+        with lock:
+            running.remove(fetch)
+        return fetch()
+
+    for device in vicare_api.devices:
+        device.service.fetch_all_features = partial(
+            slow_fetch, device.service.fetch_all_features
+        )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={**ENTRY_CONFIG, CONF_PARALLEL_FETCHES: parallel_fetches},
+    )
+    with patch(f"{MODULE}.vicare_login", return_value=vicare_api):
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert len(concurrency) == 2
+    assert max(concurrency) == expected
@@ -0,0 +1,439 @@
+"""Test the ViCare integration setup."""
+from copy import deepcopy
+from datetime import timedelta
+import gc
+from pathlib import Path
+import pickle
+from typing import Any
+from unittest.mock import MagicMock, patch
+import weakref
+
+from PyViCare.PyViCareUtils import (
+    PyViCareInvalidCredentialsError,
+    PyViCareNotSupportedFeatureError,
+)
+import pytest
+import requests
+
+from custom_components.vicare import ViCareDeviceService, ViCareLoginOAuthManager
+from custom_components.vicare.budget import CALL_LOGIN
+from custom_components.vicare.const import VICARE_DEVICES
+from custom_components.vicare.helpers import (
+    get_required_features,
+    get_unique_device_id,
+)
+from custom_components.vicare.state import (
+    ViCareCircuitState,
+    ViCareDhwState,
+    ViCareSensorState,
+)
+from homeassistant.components.vicare.const import DOMAIN
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, StateMachine
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
+from homeassistant.util import dt as dt_util
+
+from . import MODULE
+from .conftest import MockPyViCare, async_setup_vicare, rate_limit_error
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+
+
+async def test_single_fetch_per_device_and_interval(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that all entities of a device share one fetch per scan interval."""
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    service = vicare_api.devices[0].service
+    await async_setup_vicare(hass, mock_config_entry, vicare_api)
+
+    assert len(hass.states.async_entity_ids()) > 10
+    assert service.fetchCount == 1
+
+    device = hass.data[DOMAIN][mock_config_entry.entry_id][VICARE_DEVICES][0]
+    async_fire_time_changed(
+        hass,
+        dt_util.utcnow() + device.coordinator.update_interval + timedelta(seconds=1),
+    )
+    await hass.async_block_till_done()
+
+    assert service.fetchCount == 2
+
+
+async def test_setup_logs_in_once(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that a multi device installation logs in and fetches once."""
+    vicare_api = MockPyViCare(
+        {
+            "vicare/Vitodens300W.json": ["type:boiler"],
+            "vicare/zigbee_zk03839.json": ["type:climateSensor"],
+        }
+    )
+    services = [device.service for device in vicare_api.devices]
+    with patch(f"{MODULE}.vicare_login", return_value=vicare_api) as mock_login:
+        mock_config_entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_login.call_count == 1
+    assert [service.fetchCount for service in services] == [1, 1]
+
+
+async def test_single_discovery_per_device(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that all platforms share the device type detected at setup."""
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    device_config = vicare_api.devices[0]
+    with patch.object(
+        device_config,
+        "asAutoDetectDevice",
+        wraps=device_config.asAutoDetectDevice,
+    ) as mock_detect:
+        await async_setup_vicare(hass, mock_config_entry, vicare_api)
+
+    assert mock_detect.call_count == 1
+    device = hass.data[DOMAIN][mock_config_entry.entry_id][VICARE_DEVICES][0]
+    assert [circuit.id for circuit in device.circuits] == ["0", "1"]
+    assert [burner.id for burner in device.burners] == ["0"]
+    assert "heating.burners.0" in device.features
+
+
+def test_feature_index_matches_feature_list() -> None:
+    """Test that indexed reads return the same features as a list scan."""
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    mock_service = vicare_api.devices[0].service
+    service = ViCareDeviceService(mock_service, MagicMock())
+    service.update_features(mock_service.fetch_all_features())
+
+    for feature in service.features["data"]:
+        assert service.getProperty(feature["feature"]) == mock_service.getProperty(
+            feature["feature"]
+        )
+    with pytest.raises(PyViCareNotSupportedFeatureError):
+        service.getProperty("heating.unknown")
+
+
+def test_required_features_prescan() -> None:
+    """Test that entity discovery checks enabled features of the payload."""
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    mock_service = vicare_api.devices[0].service
+    service = ViCareDeviceService(mock_service, MagicMock())
+    service.update_features(mock_service.fetch_all_features())
+    burner = MagicMock(id="0")
+
+    assert get_required_features(("heating.burners.{id}.statistics",), burner) == [
+        "heating.burners.0.statistics"
+    ]
+    assert service.has_features(
+        get_required_features(("heating.burners.{id}.statistics",), burner)
+    )
+    # present in the payload, but disabled
+    assert not service.has_features(["heating.solar.pumps.circuit"])
+    assert not service.has_features(["heating.unknown"])
+
+
+async def test_component_lists_memoized(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MockConfigEntry
+) -> None:
+    """Test that component lists are rebuilt only when components change."""
+    device = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][0]
+    service = device.coordinator.service
+    data = service.features
+
+    circuits = device.circuits
+    service.update_features(deepcopy(data))
+    assert device.circuits is circuits
+
+    changed = deepcopy(data)
+    for feature in changed["data"]:
+        if feature["feature"] == "heating.circuits.1":
+            feature["isEnabled"] = False
+    service.update_features(changed)
+    assert device.circuits is not circuits
+
+
+async def test_device_released_on_unload(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MockConfigEntry
+) -> None:
+    """Test that an unloaded device and its memoized components are collected."""
+    device = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][0]
+    assert device.circuits
+    api = weakref.ref(device.api)
+    del device
+
+    await hass.config_entries.async_unload(mock_vicare_gas_boiler.entry_id)
+    await hass.async_block_till_done()
+    gc.collect()
+
+    assert api() is None
+
+
+def test_changed_features() -> None:
+    """Test that features are compared with the previous payload by timestamp."""
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    data = vicare_api.devices[0].service.fetch_all_features()
+    service = ViCareDeviceService(vicare_api.devices[0].service, MagicMock())
+    service.update_features(data)
+    assert service.changed_features == {feature["feature"] for feature in data["data"]}
+
+    service.update_features(deepcopy(data))
+    assert service.changed_features == frozenset()
+
+    changed = deepcopy(data)
+    for feature in changed["data"]:
+        if feature["feature"] == "heating.sensors.temperature.outside":
+            feature["timestamp"] = "2021-08-25T15:00:00.000Z"
+        if feature["feature"] == "heating.circuits.1":
+            feature["isEnabled"] = False
+    changed["data"] = [
+        feature
+        for feature in changed["data"]
+        if feature["feature"] != "heating.burners.0"
+    ]
+    service.update_features(changed)
+    assert service.changed_features == {
+        "heating.sensors.temperature.outside",
+        "heating.circuits.1",
+        "heating.burners.0",
+    }
+
+
+async def test_unchanged_state_not_written(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MockConfigEntry
+) -> None:
+    """Test that a refresh only writes the states of changed entities."""
+    coordinator = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+    data = coordinator.data
+
+    with patch.object(
+        StateMachine, "async_set", autospec=True, side_effect=StateMachine.async_set
+    ) as mock_set:
+        coordinator.async_set_updated_data(data)
+        await hass.async_block_till_done()
+        assert [call.args[1] for call in mock_set.call_args_list] == []
+
+        changed = deepcopy(data)
+        for feature in changed["data"]:
+            if feature["feature"] == "heating.sensors.temperature.outside":
+                feature["properties"]["value"]["value"] = 21.5
+                feature["timestamp"] = "2021-08-25T15:00:00.000Z"
+        coordinator.service.update_features(changed)
+        coordinator.async_set_updated_data(changed)
+        await hass.async_block_till_done()
+
+    assert [call.args[1] for call in mock_set.call_args_list] == [
+        "sensor.vicare_outside_temperature"
+    ]
+    assert hass.states.get("sensor.vicare_outside_temperature").state == "21.5"
+
+
+async def test_only_changed_features_read(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MockConfigEntry
+) -> None:
+    """Test that a refresh only updates sensors whose features changed."""
+    coordinator = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+    data = coordinator.data
+
+    changed = deepcopy(data)
+    for feature in changed["data"]:
+        if feature["feature"] == "heating.sensors.temperature.outside":
+            feature["properties"]["value"]["value"] = 21.5
+            feature["timestamp"] = "2021-08-25T15:00:00.000Z"
+    sensor = next(
+        entity
+        for platform in hass.data[DATA_ENTITY_PLATFORM][DOMAIN]
+        for entity in platform.entities.values()
+        if entity.entity_id == "sensor.vicare_outside_temperature"
+    )
+    with patch.object(
+        ViCareSensorState,
+        "update",
+        autospec=True,
+        side_effect=ViCareSensorState.update,
+    ) as mock_update:
+        coordinator.service.update_features(changed)
+        coordinator.async_set_updated_data(changed)
+        await hass.async_block_till_done()
+
+    assert [call.args[0] for call in mock_update.call_args_list] == [sensor._view]
+    assert hass.states.get("sensor.vicare_outside_temperature").state == "21.5"
+
+
+async def test_device_state_read_once(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MockConfigEntry
+) -> None:
+    """Test that circuits and hot water are read once per payload for all entities."""
+    coordinator = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+    data = coordinator.data
+
+    changed = deepcopy(data)
+    for feature in changed["data"]:
+        if feature["feature"] == "heating.dhw.sensors.temperature.hotWaterStorage":
+            feature["properties"]["value"]["value"] = 56
+            feature["timestamp"] = "2021-08-25T15:00:00.000Z"
+    with patch.object(
+        ViCareCircuitState,
+        "update",
+        autospec=True,
+        side_effect=ViCareCircuitState.update,
+    ) as circuit_update, patch.object(
+        ViCareDhwState, "update", autospec=True, side_effect=ViCareDhwState.update
+    ) as dhw_update:
+        coordinator.service.update_features(changed)
+        coordinator.async_set_updated_data(changed)
+        # Updates without a new payload, e.g. after a write, read nothing
+        coordinator.async_update_listeners()
+        await hass.async_block_till_done()
+
+    assert circuit_update.call_count == len(coordinator.state.circuits) == 2
+    assert dhw_update.call_count == 1
+    # The water heaters of all circuits show the same hot water reading
+    assert [
+        hass.states.get(f"water_heater.vicare_water_{idx}").attributes[
+            "current_temperature"
+        ]
+        for idx in range(2)
+    ] == [56] * 2
+
+
+async def test_device_info_shared(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MockConfigEntry
+) -> None:
+    """Test that all entities of a device share the device info of its coordinator."""
+    coordinator = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+
+    entities = [
+        entity
+        for platform in hass.data[DATA_ENTITY_PLATFORM][DOMAIN]
+        for entity in platform.entities.values()
+        if entity.device_info is not None
+        and (DOMAIN, coordinator.device_id) in entity.device_info["identifiers"]
+    ]
+    assert len(entities) > 1
+    assert all(entity.device_info is coordinator.device_info for entity in entities)
+
+
+async def test_setup_from_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that a persisted payload is served when the API is unreachable."""
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    device = vicare_api.devices[0]
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            get_unique_device_id(device): {
+                "timestamp": dt_util.utcnow().isoformat(),
+                "data": device.service.fetch_all_features(),
+            }
+        },
+    }
+    with patch.object(
+        device.service,
+        "fetch_all_features",
+        side_effect=requests.exceptions.ConnectionError,
+    ):
+        await async_setup_vicare(hass, mock_config_entry, vicare_api)
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.vicare_outside_temperature") is not None
+
+
+async def test_setup_from_snapshot_without_login(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that stored devices are set up while the login is rate limited."""
+    vicare_api = MockPyViCare({"vicare/Vitodens300W.json": ["type:boiler"]})
+    device = vicare_api.devices[0]
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            get_unique_device_id(device): {
+                "timestamp": dt_util.utcnow().isoformat(),
+                "data": device.service.fetch_all_features(),
+                "device": {
+                    "installation_id": "installationId0",
+                    "serial": "serial0",
+                    "device_id": "deviceId0",
+                    "model": "model0",
+                    "status": "online0",
+                    "roles": ["type:boiler"],
+                },
+            }
+        },
+    }
+    with patch(
+        f"{MODULE}.vicare_login", side_effect=rate_limit_error(timedelta(hours=1))
+    ) as vicare_login:
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.vicare_outside_temperature").state != "unavailable"
+    # No login is tried again until the rate limit resets
+    assert vicare_login.call_count == 1
+    assert hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"]["data"]["resume_at"]
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+    coordinator.engine.resume_at = None
+    coordinator.backoff.succeeded()
+    with patch(f"{MODULE}.vicare_login", return_value=vicare_api):
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+    assert device.service.fetchCount == 3
+    assert coordinator.last_update_success
+
+
+async def test_snapshot_saved_after_refresh(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_vicare_gas_boiler: MockConfigEntry,
+) -> None:
+    """Test that fetched payloads are persisted for the next startup."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=301))
+    await hass.async_block_till_done()
+
+    snapshots = hass_storage[f"{DOMAIN}.{mock_vicare_gas_boiler.entry_id}"]["data"][
+        "devices"
+    ]
+    assert list(snapshots) == ["installationId0-serial0-deviceId0"]
+    assert "timestamp" in snapshots["installationId0-serial0-deviceId0"]
+
+
+def test_token_requests_recorded(tmp_path: Path) -> None:
+    """Test that the login records a token request only when it sends one."""
+    token_file = tmp_path / "vicare_token.save"
+    token_file.write_bytes(pickle.dumps({"access_token": "token"}))
+    calls: list[str] = []
+
+    oauth_manager = ViCareLoginOAuthManager(
+        calls.append, "foo@bar.com", "1234", "5678", str(token_file)
+    )
+    assert calls == []
+
+    with patch(
+        "PyViCare.PyViCareOAuthManager.requests.post",
+        return_value=MagicMock(status_code=302, headers={}),
+    ), pytest.raises(PyViCareInvalidCredentialsError):
+        oauth_manager.renewToken()
+    assert calls == [CALL_LOGIN]
@@ -1,11 +1,19 @@
 """Test ViCare sensors."""
 
+from datetime import timedelta
 from unittest.mock import MagicMock
 
 import pytest
 from syrupy.assertion import SnapshotAssertion
 
+from custom_components.vicare.const import VICARE_DEVICES
+from homeassistant.components.vicare.const import DOMAIN
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from tests.common import async_fire_time_changed
 
 
 @pytest.mark.freeze_time("2022-04-19 07:53:05")
@@ -61,3 +69,46 @@ async def test_room_sensor_sensors(
     """Test the ViCare Room Sensor sensors."""
     state = hass.states.get(entity_id)
     assert state == snapshot
+
+
+async def test_metric_sensors(
+    hass: HomeAssistant, mock_vicare_gas_boiler: MagicMock
+) -> None:
+    """Test the API metrics of the device and the account."""
+    entity_registry = er.async_get(hass)
+    for entity_id in (
+        "sensor.vicare_last_fetch_duration",
+        "sensor.vicare_payload_size",
+        "sensor.vicare_api_calls_in_the_last_24_hours",
+        "sensor.vicare_remaining_api_calls",
+        "sensor.vicare_device_api_calls_in_the_last_24_hours",
+        "sensor.vicare_consecutive_failures",
+    ):
+        entry = entity_registry.async_get(entity_id)
+        assert entry.entity_category == EntityCategory.DIAGNOSTIC
+
+    assert int(hass.states.get("sensor.vicare_payload_size").state) > 0
+    assert hass.states.get("sensor.vicare_consecutive_failures").state == "0"
+    # the mocked login sends no request, only the first fetch was spent
+    assert hass.states.get("sensor.vicare_api_calls_in_the_last_24_hours").state == "1"
+    assert hass.states.get("sensor.vicare_remaining_api_calls").state == "1449"
+    # only the first fetch was spent for the device
+    assert (
+        hass.states.get("sensor.vicare_device_api_calls_in_the_last_24_hours").state
+        == "1"
+    )
+
+    coordinator = hass.data[DOMAIN][mock_vicare_gas_boiler.entry_id][VICARE_DEVICES][
+        0
+    ].coordinator
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + coordinator.update_interval + timedelta(seconds=1)
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.vicare_api_calls_in_the_last_24_hours").state == "2"
+    assert hass.states.get("sensor.vicare_remaining_api_calls").state == "1448"
+    assert (
+        hass.states.get("sensor.vicare_device_api_calls_in_the_last_24_hours").state
+        == "2"
+    )